@@ -0,0 +1,22 @@
+"""Add scoring_settings to leagues
+
+Revision ID: 016
+Revises: 015
+Create Date: 2024-09-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('leagues', sa.Column('scoring_settings', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('leagues', 'scoring_settings')
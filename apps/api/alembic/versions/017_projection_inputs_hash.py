@@ -0,0 +1,22 @@
+"""Add inputs_hash to projections
+
+Revision ID: 017
+Revises: 016
+Create Date: 2024-09-08 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '017'
+down_revision = '016'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('projections', sa.Column('inputs_hash', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('projections', 'inputs_hash')
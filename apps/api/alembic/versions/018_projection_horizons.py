@@ -0,0 +1,50 @@
+"""Add projection_horizons table
+
+Revision ID: 018
+Revises: 017
+Create Date: 2024-09-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import func
+
+revision = '018'
+down_revision = '017'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('projection_horizons',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('player_id', sa.Integer(), nullable=False),
+        sa.Column('week', sa.SmallInteger(), nullable=False),
+        sa.Column('horizon', sa.SmallInteger(), nullable=False),
+        sa.Column('source', sa.Text(), nullable=False, server_default='internal'),
+        sa.Column('projected_points', sa.Float(), nullable=False),
+        sa.Column('variance', sa.Float(), nullable=True),
+        sa.Column('data', sa.JSON(), nullable=False, server_default='{}'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['player_id'], ['players.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('player_id', 'week', 'horizon', 'source', name='uq_projection_horizons_player_week_horizon_source')
+    )
+    op.create_index('ix_projection_horizons_player_id', 'projection_horizons', ['player_id'], unique=False)
+    op.create_index('idx_projection_horizons_week_horizon', 'projection_horizons', ['week', 'horizon'], unique=False)
+
+    op.execute("""
+    DROP TRIGGER IF EXISTS update_projection_horizons_updated_at ON projection_horizons;
+    CREATE TRIGGER update_projection_horizons_updated_at
+    BEFORE UPDATE ON projection_horizons
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS update_projection_horizons_updated_at ON projection_horizons;")
+    op.drop_index('idx_projection_horizons_week_horizon', table_name='projection_horizons')
+    op.drop_index('ix_projection_horizons_player_id', table_name='projection_horizons')
+    op.drop_table('projection_horizons')
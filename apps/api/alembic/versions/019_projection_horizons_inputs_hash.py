@@ -0,0 +1,22 @@
+"""Add inputs_hash to projection_horizons
+
+Revision ID: 019
+Revises: 018
+Create Date: 2024-09-22 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '019'
+down_revision = '018'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('projection_horizons', sa.Column('inputs_hash', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('projection_horizons', 'inputs_hash')
@@ -131,6 +131,9 @@ class League(Base):
     name: Mapped[str] = mapped_column(String, nullable=False)
     scoring_type: Mapped[str | None] = mapped_column(String)
     roster_positions: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    # Yahoo league ``settings`` (stat categories and modifiers) used to compile
+    # per-league scoring rules; ``None`` scores with the default rules.
+    scoring_settings: Mapped[dict | None] = mapped_column(JSON)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
@@ -210,6 +213,9 @@ class Player(Base):
     )
     roster_slots: Mapped[list[RosterSlot]] = relationship(back_populates="player")
     projections: Mapped[list[Projection]] = relationship(back_populates="player")
+    projection_horizons: Mapped[list[ProjectionHorizon]] = relationship(
+        back_populates="player"
+    )
     notes: Mapped[list[Note]] = relationship(back_populates="player")
     waiver_candidates: Mapped[list[WaiverCandidate]] = relationship(
         back_populates="player"
@@ -378,6 +384,9 @@ class Projection(Base):
     projected_points: Mapped[float] = mapped_column(Float, nullable=False)
     variance: Mapped[float | None] = mapped_column(Float)
     data: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    # Fingerprint of the inputs (baselines, weather, injury status, source)
+    # the row was projected from; unchanged inputs skip recomputation.
+    inputs_hash: Mapped[str | None] = mapped_column(String)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now()
     )
@@ -400,6 +409,51 @@ class Projection(Base):
         super().__init__(**kwargs)
 
 
+class ProjectionHorizon(Base):
+    """Projected points summed over the ``horizon`` weeks starting at ``week``.
+
+    ``data`` holds the weekly points and the number of games (bye weeks
+    excluded) behind the total.
+    """
+
+    __tablename__ = "projection_horizons"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    player_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("players.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    week: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    horizon: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    source: Mapped[str] = mapped_column(
+        String, nullable=False, default="internal", server_default="internal"
+    )
+    projected_points: Mapped[float] = mapped_column(Float, nullable=False)
+    variance: Mapped[float | None] = mapped_column(Float)
+    data: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    # Fingerprint of the player's inputs over the whole horizon; every
+    # horizon row of a player carries the same one.
+    inputs_hash: Mapped[str | None] = mapped_column(String)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+    player: Mapped[Player] = relationship(back_populates="projection_horizons")
+    __table_args__ = (
+        UniqueConstraint(
+            "player_id",
+            "week",
+            "horizon",
+            "source",
+            name="uq_projection_horizons_player_week_horizon_source",
+        ),
+        Index("idx_projection_horizons_week_horizon", "week", "horizon"),
+    )
+
+
 # ----------------------
 # Waivers, Streamers
 # ----------------------
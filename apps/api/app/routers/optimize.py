@@ -1,9 +1,214 @@
-from fastapi import APIRouter
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from redis import Redis
+from sqlalchemy.orm import Session
+
+from ..deps import get_db, get_current_user_session
+from ..models import Matchup, Player, Projection, RosterSlot, Team
+from .auth import get_redis
+
+# Make the optimizer package importable when running from apps/api
+sys.path.append(str(Path(__file__).resolve().parents[4] / "packages/optimizer"))
+sys.path.append(str(Path(__file__).resolve().parents[4] / "packages/scoring"))
+from optimizer import (  # type: ignore  # noqa: E402
+    compile_roster,
+    optimize_win_probability,
+    player_positions,
+    top_lineups,
+)
+from scoring import league_rules, scoring_kind  # type: ignore  # noqa: E402
 
 router = APIRouter()
 
+CACHE_TTL_SECONDS = 3600
+BENCH_SLOTS = {"BN", "IR", "IR+", "NA"}
+# Lineups are built from our own projections; other sources (e.g. Yahoo) are
+# stored alongside them for comparison only.
+PROJECTION_SOURCE = "internal"
+
+
+def _roster_rows(db: Session, team_ids: List[int], week: int, source: str = PROJECTION_SOURCE):
+    """Roster slots with player and projection for the given teams in one query."""
+    return (
+        db.query(RosterSlot, Player, Projection)
+        .join(Player, Player.id == RosterSlot.player_id)
+        .outerjoin(
+            Projection,
+            (Projection.player_id == RosterSlot.player_id)
+            & (Projection.week == week)
+            & (Projection.source == source),
+        )
+        .filter(RosterSlot.team_id.in_(team_ids), RosterSlot.week == week)
+        .order_by(RosterSlot.id)
+        .all()
+    )
+
+
+def _league_points(rows, rules) -> List[float]:
+    """Projected points under the league's scoring rules.
+
+    Projections with a stored statline are rescored in one batch; the rest
+    keep their stored ``projected_points``.
+    """
+    points = [proj.projected_points if proj else 0.0 for _, _, proj in rows]
+    if rules is None:
+        return points
+    scored = [i for i, (_, _, proj) in enumerate(rows) if proj and proj.data]
+    if scored:
+        totals = rules.score_records(
+            [scoring_kind(rows[i][1].position_primary) for i in scored],
+            [rows[i][2].data for i in scored],
+        )
+        for i, total in zip(scored, totals.tolist()):
+            points[i] = total
+    return points
+
+
+def _pool(rows, rules=None) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": player.id,
+            "name": player.full_name,
+            "positions": player_positions(player.position_primary, player.meta),
+            "team": player.nfl_team,
+            "points": points,
+            "variance": proj.variance if proj else 0.0,
+        }
+        for (_, player, proj), points in zip(rows, _league_points(rows, rules))
+    ]
+
+
+def _digest(items) -> str:
+    return hashlib.sha1(json.dumps(items, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _cache_key(team_id: int, week: int, rows, extra: Dict[str, Any]) -> str:
+    """Key on the roster and projections actually read, so any change misses.
+
+    That includes each player's name and NFL team (response and correlation)
+    and the stored statline, which league scoring rescores.
+    """
+    roster_hash = _digest(
+        [
+            [
+                rs.slot,
+                player.id,
+                player_positions(player.position_primary, player.meta),
+                player.full_name,
+                player.nfl_team,
+            ]
+            for rs, player, _ in rows
+        ]
+        + [extra]
+    )
+    projection_version = _digest(
+        [
+            [player.id, proj.projected_points, proj.variance, proj.data] if proj else [player.id]
+            for _, player, proj in rows
+        ]
+    )
+    return f"optimize:{team_id}:w{week}:{projection_version}:{roster_hash}"
+
+
+def _lineup(slots, ids, pool) -> List[Dict[str, Any]]:
+    by_id = {str(p["id"]): p for p in pool}
+    return [
+        {
+            "slot": slot,
+            "player_id": by_id[pid]["id"],
+            "name": by_id[pid]["name"],
+            "projected_points": by_id[pid]["points"],
+        }
+        for slot, pid in zip(slots, ids)
+    ]
+
 
 @router.get("/{team_id}/optimize")
-def optimize(team_id: int, week: int):
-    # Stub: will call OR-Tools later
-    return {"team_id": team_id, "week": week, "lineup": [], "alts": []}
+def optimize(
+    team_id: int,
+    week: int,
+    alts: int = Query(3, ge=0, le=10, description="Number of alternative lineups"),
+    objective: str = Query("points", description="'points' or 'win_prob'"),
+    db: Session = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    current_user=Depends(get_current_user_session),
+):
+    """Return the optimal lineup for a team and week plus near-optimal alternatives.
+
+    Results are cached in Redis keyed by team, week, projection version and
+    roster hash, so repeated loads skip the solve until either changes.
+    """
+    if objective not in ["points", "win_prob"]:
+        raise HTTPException(status_code=400, detail="Invalid objective")
+    team = db.query(Team).filter(Team.id == team_id).first()
+    if not team:
+        raise HTTPException(status_code=404, detail="Team not found")
+
+    opponent_id: Optional[int] = None
+    if objective == "win_prob":
+        opponent_id = (
+            db.query(Matchup.opponent_team_id)
+            .filter(Matchup.team_id == team_id, Matchup.week == week)
+            .scalar()
+        )
+    team_ids = [team_id] + ([opponent_id] if opponent_id else [])
+    all_rows = _roster_rows(db, team_ids, week)
+    rows = [r for r in all_rows if r[0].team_id == team_id]
+
+    league = team.league
+    rules = (
+        league_rules(league.id, league.scoring_settings, redis) if league.scoring_settings else None
+    )
+    key = _cache_key(
+        team_id,
+        week,
+        all_rows,
+        {
+            "alts": alts,
+            "objective": objective,
+            "slots": league.roster_positions,
+            "scoring": rules.digest if rules else None,
+        },
+    )
+    cached = redis.get(key)
+    if cached:
+        return json.loads(cached)
+
+    positions = league.roster_positions or [
+        rs.slot for rs, _, _ in rows if rs.is_starter and rs.slot and rs.slot not in BENCH_SLOTS
+    ]
+    try:
+        slots = list(compile_roster(positions).slots)
+        pool = _pool(rows, rules)
+        candidates = top_lineups(pool, slots, alts + 1)
+        if not candidates:
+            raise ValueError("no valid lineup")
+        win_prob = None
+        if objective == "win_prob" and opponent_id:
+            opponent = _pool([r for r in all_rows if r[0].team_id == opponent_id], rules)
+            ids, win_prob = optimize_win_probability(pool, slots, opponent, seed=week)
+            chosen = set(ids)
+            best = (ids, sum(p["points"] for p in pool if str(p["id"]) in chosen))
+            candidates = [best] + [c for c in candidates if c[0] != ids][:alts]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="No valid lineup for roster")
+
+    (ids, total), rest = candidates[0], candidates[1:]
+    body = {
+        "team_id": team_id,
+        "week": week,
+        "lineup": _lineup(slots, ids, pool),
+        "projected_points": total,
+        "win_probability": win_prob,
+        "alts": [
+            {"lineup": _lineup(slots, alt_ids, pool), "projected_points": alt_total}
+            for alt_ids, alt_total in rest
+        ],
+    }
+    redis.set(key, json.dumps(body), ex=CACHE_TTL_SECONDS)
+    return body
@@ -1,23 +1,44 @@
+import sys
+from pathlib import Path
+
 from fastapi import APIRouter, Depends, HTTPException, Query
+from redis import Redis
 from sqlalchemy.orm import Session
 from typing import Optional
 
 from ..deps import get_db, get_current_user_session
-from ..models import Projection, Player
+from ..models import League, Projection, Player
+from .auth import get_redis
+
+sys.path.append(str(Path(__file__).resolve().parents[4] / "packages/scoring"))
+from scoring import league_rules, scoring_kind  # type: ignore  # noqa: E402
+from scoring.compiled import POSITION_KINDS  # type: ignore  # noqa: E402
 
 router = APIRouter()
 
+# Streamers rank our own projections; other stored sources are ignored.
+PROJECTION_SOURCE = "internal"
+
+# Positions ranked by each streamer kind, e.g. every IDP position for "idp"
+STREAMER_POSITIONS = {
+    kind: [pos for pos, scoring in POSITION_KINDS.items() if scoring == target]
+    for kind, target in (("def", "defense"), ("idp", "idp"))
+}
+
 
 @router.get("/{kind}")
 def get_streamers(
     kind: str,  # "def" or "idp"
     week: Optional[int] = Query(None, description="Week number"),
+    league_id: Optional[int] = Query(None, description="Score with this league's rules"),
     db: Session = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     current_user=Depends(get_current_user_session),
 ):
     """Get streamer signals for a specific kind and week.
 
-    Returns player_id, name, projected_points, and a 1-based rank.
+    Returns player_id, name, projected_points, and a 1-based rank. With
+    ``league_id`` stored statlines are rescored under that league's scoring.
     """
     if kind not in ["def", "idp"]:
         raise HTTPException(status_code=400, detail="Invalid kind. Must be 'def' or 'idp'")
@@ -25,20 +46,30 @@ def get_streamers(
     q = (
         db.query(Projection, Player)
         .join(Player, Player.id == Projection.player_id)
-        .filter(Projection.week == week)
-        .filter(Player.position_primary.in_(["DEF", "IDP"]))
+        .filter(Projection.week == week, Projection.source == PROJECTION_SOURCE)
+        .filter(Player.position_primary.in_(STREAMER_POSITIONS[kind]))
         .filter(Projection.player_id.isnot(None))
     )
-    pos = {"def": "DEF", "idp": "IDP"}[kind]
-    q = q.filter(Player.position_primary == pos)
-    rows = q.order_by(Projection.projected_points.desc(), Player.id.asc()).all()
+    rows = q.all()
+    points = {proj.player_id: proj.projected_points for proj, _ in rows}
+    league = db.get(League, league_id) if league_id is not None else None
+    if league and league.scoring_settings:
+        rules = league_rules(league.id, league.scoring_settings, redis)
+        scored = [(proj, player) for proj, player in rows if proj.data]
+        if scored:
+            totals = rules.score_records(
+                [scoring_kind(player.position_primary) for _, player in scored],
+                [proj.data for proj, _ in scored],
+            )
+            points.update(zip([proj.player_id for proj, _ in scored], totals.tolist()))
+    rows.sort(key=lambda row: (-points[row[0].player_id], row[1].id))
     results = []
     for idx, (proj, player) in enumerate(rows, start=1):
         results.append(
             {
                 "player_id": player.id,
                 "name": player.full_name,
-                "projected_points": proj.projected_points,
+                "projected_points": points[proj.player_id],
                 "rank": idx,
             }
         )
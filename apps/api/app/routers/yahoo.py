@@ -1,28 +1,55 @@
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
 from fastapi import APIRouter, Depends
+from redis import Redis
 from sqlalchemy.orm import Session
 
 from ..deps import get_db, get_current_user_session, get_yahoo_client
-from ..models import User
+from ..models import League, User
 from ..yahoo_client import YahooFantasyClient
+from .auth import get_redis
+
+# Make the scoring package importable when running from apps/api
+sys.path.append(str(Path(__file__).resolve().parents[4] / "packages/scoring"))
+from scoring import league_rules  # type: ignore  # noqa: E402
+from scoring.compiled import _as_dict  # type: ignore  # noqa: E402
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Shapes a Yahoo payload can break on: a missing object (None), a list where
+# an object was expected, or a list too short to index.
+_PAYLOAD_ERRORS = (AttributeError, IndexError, KeyError, TypeError)
 
-def _scoring_map(data):
-    scoring = {}
+
+def _league_settings(data) -> Dict[str, Any]:
+    """The league ``settings`` object, including stat categories and modifiers."""
     try:
         league = data.get("fantasy_content", {}).get("league")
         if isinstance(league, list):
             league = league[1]
-        stats = league.get("settings", {}).get("stat_categories", {}).get("stats", [])
+        return _as_dict(league.get("settings", {}))
+    except _PAYLOAD_ERRORS as exc:
+        logger.warning("Unexpected Yahoo league payload, no settings: %r", exc)
+        return {}
+
+
+def _scoring_map(data):
+    scoring = {}
+    try:
+        stats = _as_dict(_league_settings(data).get("stat_categories")).get("stats", [])
         for stat in stats:
-            st = stat.get("stat", {})
+            st = _as_dict(_as_dict(stat).get("stat"))
             sid = st.get("stat_id")
             name = st.get("display_name") or st.get("name")
             if sid is not None and name:
                 scoring[str(sid)] = name
-    except Exception:
-        pass
+    except _PAYLOAD_ERRORS as exc:
+        logger.warning("Unexpected Yahoo stat categories: %r", exc)
     return scoring
 
 
@@ -41,8 +68,25 @@ def league_meta(
     current_user: User = Depends(get_current_user_session),
     db: Session = Depends(get_db),
     client: YahooFantasyClient = Depends(get_yahoo_client),
+    redis: Redis = Depends(get_redis),
 ):
     data = client.get(db, current_user, f"/league/{league_key}")
+    settings = _league_settings(data)
+    if settings.get("stat_modifiers"):
+        # Keep the modifiers on a synced league and compile its scoring rules
+        league = (
+            db.query(League)
+            .filter(League.yahoo_league_id.in_([league_key, league_key.split(".l.")[-1]]))
+            .first()
+        )
+        if league:
+            league.scoring_settings = settings
+            db.commit()
+            try:
+                league_rules(league.id, settings, redis)
+            except (ValueError, TypeError) as exc:
+                # Malformed modifiers: keep the raw settings, don't fail the request.
+                logger.warning("Could not compile scoring for league %s: %r", league.id, exc)
     return {"raw": data, "scoring": _scoring_map(data)}
 
 
@@ -1,14 +1,63 @@
-from typing import Any, Dict, List
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from .models import Player, Projection, RosterSlot
+from .models import League, Player, Projection, ProjectionHorizon, RosterSlot, Team
+
+sys.path.append(str(Path(__file__).resolve().parents[3] / "packages/scoring"))
+from scoring import league_rules, scoring_kind  # type: ignore  # noqa: E402
+
+# Shortlists rank our own projections; other stored sources are ignored.
+PROJECTION_SOURCE = "internal"
+
+# Stored week points above which league scoring rescales a row by ratio.
+MIN_SCALED_POINTS = 1.0
+
+
+def _league_points(league: Optional[League], rows: List[Any], weeks: int = 1) -> Dict[int, float]:
+    """Points by player id under ``league``'s scoring rules.
+
+    ``rows`` are ``(player, points, week points, week data)`` covering
+    ``weeks`` weeks. A stored week statline is rescored and the row's points
+    scaled by the ratio to its stored week points, so multi-week horizons,
+    which keep weekly points rather than statlines, follow the league's
+    scoring too. Where the stored week is at most ``MIN_SCALED_POINTS`` (a
+    defense, kicker or IDP can project negative or near zero) a ratio would
+    flip or blow up the total, so it is shifted by the weekly difference
+    instead. Rows without a statline keep their points.
+    """
+
+    points = {player.id: pts for player, pts, _, _ in rows}
+    if not (league and league.scoring_settings):
+        return points
+    rules = league_rules(league.id, league.scoring_settings)
+    scored = [row for row in rows if row[2] is not None and row[3]]
+    if scored:
+        totals = rules.score_records(
+            [scoring_kind(player.position_primary) for player, _, _, _ in scored],
+            [data for _, _, _, data in scored],
+        )
+        for (player, pts, week_pts, _), total in zip(scored, totals.tolist()):
+            if week_pts > MIN_SCALED_POINTS:
+                points[player.id] = pts * total / week_pts
+            else:
+                points[player.id] = pts + (total - week_pts) * weeks
+    return points
 
 
 def compute_waiver_shortlist(
     session: Session, team_id: int, week: int, horizon: int = 1
 ) -> List[Dict[str, Any]]:
-    """Rank free agents by projected improvement over the worst starter."""
+    """Rank free agents by projected improvement over the worst starter.
+
+    Points cover ``horizon`` weeks from ``week`` when horizon projections have
+    been stored for that week (a horizon past the season is cut to rest of
+    season); otherwise the single week's projections are used. Points follow
+    the team's league scoring when it has stored settings.
+    """
 
     roster_ids = [
         rs.player_id
@@ -17,26 +66,54 @@ def compute_waiver_shortlist(
     if not roster_ids:
         return []
 
-    worst_proj = (
-        session.query(Projection.projected_points)
-        .filter(Projection.player_id.in_(roster_ids), Projection.week == week)
-        .order_by(Projection.projected_points.asc())
-        .limit(1)
-        .scalar()
-    )
-    if worst_proj is None:
-        return []
+    weeks = 1
+    week_filter = (Projection.week == week) & (Projection.source == PROJECTION_SOURCE)
+    query = session.query(
+        Player, Projection.projected_points, Projection.projected_points, Projection.data
+    ).join(Projection, (Player.id == Projection.player_id) & week_filter)
+    if horizon > 1:
+        longest = (
+            session.query(func.max(ProjectionHorizon.horizon))
+            .filter(
+                ProjectionHorizon.week == week,
+                ProjectionHorizon.source == PROJECTION_SOURCE,
+            )
+            .scalar()
+        )
+        if longest:
+            weeks = min(horizon, longest)
+            query = (
+                session.query(
+                    Player,
+                    ProjectionHorizon.projected_points,
+                    Projection.projected_points,
+                    Projection.data,
+                )
+                .join(
+                    ProjectionHorizon,
+                    (Player.id == ProjectionHorizon.player_id)
+                    & (ProjectionHorizon.week == week)
+                    & (ProjectionHorizon.horizon == weeks)
+                    & (ProjectionHorizon.source == PROJECTION_SOURCE),
+                )
+                .outerjoin(Projection, (Player.id == Projection.player_id) & week_filter)
+            )
 
-    candidates = (
-        session.query(Player, Projection.projected_points)
-        .join(Projection, (Player.id == Projection.player_id) & (Projection.week == week))
-        .filter(~Player.id.in_(roster_ids))
-        .all()
-    )
+    rows = query.all()
+    team = session.get(Team, team_id)
+    points = _league_points(team.league if team else None, rows, weeks)
+    roster = set(roster_ids)
+    rostered = [points[player.id] for player, _, _, _ in rows if player.id in roster]
+    if not rostered:
+        return []
+    worst_proj = min(rostered)
 
     results: List[Dict[str, Any]] = []
     acquisition_prob = max(0.0, 1.0 - 0.1 * (horizon - 1))
-    for player, proj in candidates:
+    for player, _, _, _ in rows:
+        if player.id in roster:
+            continue
+        proj = points[player.id]
         results.append(
             {
                 "player_id": player.id,
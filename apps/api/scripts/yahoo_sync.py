@@ -6,11 +6,12 @@ Yahoo Data Synchronization Script
 This script pulls data from Yahoo Fantasy API and updates the database.
 Usage: python yahoo_sync.py <user_id>
 """
+
 import os
 import sys
 import logging
 from datetime import datetime, UTC
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Optional
 
 import httpx
 from sqlalchemy.orm import Session
@@ -98,6 +99,7 @@ def sync_leagues(user_id: int) -> List[League]:
                 name=league_data["name"],
                 scoring_type=league_data["scoring_type"],
                 roster_positions=league_data.get("roster_positions", []),
+                scoring_settings=league_data.get("settings"),
             )
             db.add(league)
             db.commit()
@@ -108,6 +110,7 @@ def sync_leagues(user_id: int) -> List[League]:
             league.name = league_data["name"]
             league.scoring_type = league_data["scoring_type"]
             league.roster_positions = league_data.get("roster_positions", [])
+            league.scoring_settings = league_data.get("settings")
             db.commit()
             logger.info(f"Updated league: {league.name} ({league.yahoo_league_id})")
 
@@ -159,6 +162,14 @@ def sync_teams(league_id: int, user_id: int, teams_data: List[Dict[str, Any]]):
         sync_roster(team.id, team_data.get("roster", []))
 
 
+def _player_meta(meta: Optional[Dict[str, Any]], slot_data: Dict[str, Any]) -> Dict[str, Any]:
+    """``meta`` with Yahoo's eligible positions, which lineup optimizers read."""
+    meta = dict(meta or {})
+    if slot_data.get("eligible_positions"):
+        meta["eligible_positions"] = list(slot_data["eligible_positions"])
+    return meta
+
+
 def sync_roster(team_id: int, roster_data: List[Dict[str, Any]]):
     """Sync roster for a team"""
     global db, current_week
@@ -179,6 +190,7 @@ def sync_roster(team_id: int, roster_data: List[Dict[str, Any]]):
                 nfl_team=slot_data.get("team"),
                 bye_week=slot_data.get("bye_week"),
                 status=slot_data.get("status"),
+                meta=_player_meta({}, slot_data),
             )
             db.add(player)
             db.commit()
@@ -191,6 +203,7 @@ def sync_roster(team_id: int, roster_data: List[Dict[str, Any]]):
             player.nfl_team = slot_data.get("team")
             player.bye_week = slot_data.get("bye_week")
             player.status = slot_data.get("status")
+            player.meta = _player_meta(player.meta, slot_data)
             db.commit()
             logger.info(f"Updated player: {player.full_name} ({player.yahoo_player_id})")
 
@@ -0,0 +1,138 @@
+from app.models import League, Matchup, Player, Projection, RosterSlot, Team, User
+from app.routers import optimize as optimize_router
+from app.settings import settings
+
+
+def _auth_client(client, db_session):
+    user = User(email=None)
+    db_session.add(user)
+    db_session.commit()
+    original = settings.allow_debug_user
+    settings.allow_debug_user = True
+    client.get("/auth/session/debug", headers={"X-Debug-User": str(user.id)})
+    settings.allow_debug_user = original
+    return user
+
+
+def _seed(db_session):
+    db_session.query(Matchup).delete()
+    db_session.query(Projection).delete()
+    db_session.query(RosterSlot).delete()
+    db_session.query(Player).delete()
+    db_session.query(Team).delete()
+    db_session.query(League).delete()
+    league = League(
+        id=50,
+        yahoo_id=50,
+        name="L",
+        roster_positions=[{"position": "QB", "count": 1}, {"position": "W/R/T", "count": 1}],
+    )
+    team = Team(id=50, league=league, name="T")
+    opp = Team(id=51, league=league, name="O")
+    db_session.add_all([league, team, opp])
+    roster = [
+        (200, "QB", "QB", 20.0, 50),
+        (201, "RB", "W/R/T", 12.0, 50),
+        (202, "WR", "BN", 10.0, 50),
+        (203, "QB", "BN2", 15.0, 50),
+        (210, "QB", "QB", 18.0, 51),
+        (211, "WR", "W/R/T", 11.0, 51),
+    ]
+    for pid, pos, slot, pts, team_id in roster:
+        db_session.add(Player(id=pid, name=f"P{pid}", position=pos))
+        db_session.add(RosterSlot(team_id=team_id, week=1, slot=slot, player_id=pid))
+        db_session.add(
+            Projection(player_id=pid, week=1, projected_points=pts, variance=4.0, data={})
+        )
+    db_session.add(Matchup(league_id=50, week=1, team_id=50, opponent_team_id=51))
+    db_session.commit()
+
+
+def test_optimize_returns_lineup_and_alts(client, db_session):
+    _auth_client(client, db_session)
+    _seed(db_session)
+    resp = client.get("/team/50/optimize", params={"week": 1, "alts": 2})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [s["player_id"] for s in body["lineup"]] == [200, 201]
+    assert [s["slot"] for s in body["lineup"]] == ["QB", "W/R/T"]
+    assert body["projected_points"] == 32.0
+    assert [a["projected_points"] for a in body["alts"]] == [30.0, 27.0]
+
+
+def test_optimize_ignores_other_projection_sources(client, db_session):
+    _auth_client(client, db_session)
+    _seed(db_session)
+    for pid, pts in [(201, 40.0), (202, 35.0)]:
+        db_session.add(
+            Projection(
+                player_id=pid, week=1, source="yahoo", projected_points=pts, variance=4.0, data={}
+            )
+        )
+    db_session.commit()
+    body = client.get("/team/50/optimize", params={"week": 1, "alts": 2}).json()
+    assert [s["player_id"] for s in body["lineup"]] == [200, 201]
+    assert body["projected_points"] == 32.0
+    assert [a["projected_points"] for a in body["alts"]] == [30.0, 27.0]
+    for lineup in [body["lineup"]] + [a["lineup"] for a in body["alts"]]:
+        ids = [s["player_id"] for s in lineup]
+        assert len(ids) == len(set(ids))
+
+
+def test_optimize_served_from_cache_until_projection_changes(client, db_session, monkeypatch):
+    _auth_client(client, db_session)
+    _seed(db_session)
+    first = client.get("/team/50/optimize", params={"week": 1, "alts": 1}).json()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("should be served from cache")
+
+    monkeypatch.setattr(optimize_router, "top_lineups", fail)
+    assert client.get("/team/50/optimize", params={"week": 1, "alts": 1}).json() == first
+
+    monkeypatch.undo()
+    proj = db_session.query(Projection).filter_by(player_id=202, week=1).one()
+    proj.projected_points = 30.0
+    db_session.commit()
+    body = client.get("/team/50/optimize", params={"week": 1, "alts": 1}).json()
+    assert [s["player_id"] for s in body["lineup"]] == [200, 202]
+
+
+def test_optimize_cache_misses_on_statline_team_or_name_change(client, db_session, monkeypatch):
+    _auth_client(client, db_session)
+    _seed(db_session)
+    solves = []
+    solve = optimize_router.top_lineups
+    monkeypatch.setattr(
+        optimize_router, "top_lineups", lambda *a, **k: solves.append(1) or solve(*a, **k)
+    )
+    client.get("/team/50/optimize", params={"week": 1})
+    proj = db_session.query(Projection).filter_by(player_id=200, week=1).one()
+    proj.data = {"PassYds": 250}
+    db_session.commit()
+    client.get("/team/50/optimize", params={"week": 1})
+    player = db_session.get(Player, 201)
+    player.nfl_team = "KC"
+    db_session.commit()
+    client.get("/team/50/optimize", params={"week": 1})
+    player.name = "Renamed"
+    db_session.commit()
+    body = client.get("/team/50/optimize", params={"week": 1}).json()
+    assert len(solves) == 4
+    assert body["lineup"][1]["name"] == "Renamed"
+
+
+def test_optimize_win_probability_objective(client, db_session):
+    _auth_client(client, db_session)
+    _seed(db_session)
+    resp = client.get("/team/50/optimize", params={"week": 1, "objective": "win_prob"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert 0.5 < body["win_probability"] <= 1.0
+    assert len(body["lineup"]) == 2
+
+
+def test_optimize_unknown_team(client, db_session):
+    _auth_client(client, db_session)
+    resp = client.get("/team/999/optimize", params={"week": 1})
+    assert resp.status_code == 404
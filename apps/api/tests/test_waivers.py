@@ -1,4 +1,6 @@
-from app.models import League, Team, Player, RosterSlot, Projection, User
+import pytest
+
+from app.models import League, Team, Player, RosterSlot, Projection, ProjectionHorizon, User
 from app.settings import settings
 
 
@@ -46,6 +48,51 @@ def test_team_waivers_sorted_and_tied(client, db_session):
     assert [w["order"] for w in waivers] == [1, 2]
 
 
+def test_team_waivers_use_stored_horizons(client, db_session):
+    _auth_client(client, db_session)
+    db_session.query(ProjectionHorizon).delete()
+    db_session.query(Projection).delete()
+    db_session.query(RosterSlot).delete()
+    db_session.query(Player).delete()
+    db_session.query(Team).delete()
+    db_session.query(League).delete()
+    league = League(id=98, yahoo_id=98, name="L")
+    team = Team(id=98, league=league, name="T")
+    db_session.add_all([league, team])
+    db_session.add_all(
+        [Player(id=110, name="Starter"), Player(id=111, name="Hot"), Player(id=112, name="Steady")]
+    )
+    db_session.add(RosterSlot(team_id=98, player_id=110, week=3))
+    for pid, pts in [(110, 5), (111, 9), (112, 8)]:
+        db_session.add(Projection(player_id=pid, week=3, projected_points=pts, data={}))
+    # Two-week horizons: the hot pickup has a bye next week.
+    for pid, one, two in [(110, 5, 10), (111, 9, 9), (112, 8, 16)]:
+        db_session.add_all(
+            [
+                ProjectionHorizon(player_id=pid, week=3, horizon=1, projected_points=one, data={}),
+                ProjectionHorizon(player_id=pid, week=3, horizon=2, projected_points=two, data={}),
+                ProjectionHorizon(
+                    player_id=pid,
+                    week=3,
+                    horizon=2,
+                    source="yahoo",
+                    projected_points=100,
+                    data={},
+                ),
+            ]
+        )
+    db_session.commit()
+
+    one = client.get("/team/98/waivers", params={"week": 3, "horizon": 1}).json()["waivers"]
+    assert [w["player_id"] for w in one] == [111, 112]
+    two = client.get("/team/98/waivers", params={"week": 3, "horizon": 2}).json()["waivers"]
+    assert [w["player_id"] for w in two] == [112, 111]
+    assert [w["delta_xfp"] for w in two] == [6, -1]
+    # Horizons past the longest stored one read rest of season.
+    ros = client.get("/team/98/waivers", params={"week": 3, "horizon": 5}).json()["waivers"]
+    assert [w["projected_points"] for w in ros] == [16, 9]
+
+
 def test_streamers_endpoints(client, db_session):
     _auth_client(client, db_session)
     players = [
@@ -72,3 +119,125 @@ def test_streamers_endpoints(client, db_session):
     assert resp.status_code == 200
     body = resp.json()
     assert [r["player_id"] for r in body] == [7, 6]
+
+
+def test_team_waivers_use_league_scoring(client, db_session):
+    _auth_client(client, db_session)
+    db_session.query(ProjectionHorizon).delete()
+    db_session.query(Projection).delete()
+    db_session.query(RosterSlot).delete()
+    db_session.query(Player).delete()
+    db_session.query(Team).delete()
+    db_session.query(League).delete()
+    # Full PPR with a point per ten receiving yards.
+    scoring = {
+        "stat_modifiers": {
+            "stats": [
+                {"stat": {"stat_id": 11, "value": "1"}},
+                {"stat": {"stat_id": 12, "value": "0.1"}},
+            ]
+        }
+    }
+    league = League(id=97, yahoo_id=97, name="L", scoring_settings=scoring)
+    db_session.add_all([league, Team(id=97, league=league, name="T")])
+    db_session.add_all(
+        [
+            Player(id=120, name="Starter", position="WR"),
+            Player(id=121, name="Slot", position="WR"),
+            Player(id=122, name="Unscored", position="WR"),
+        ]
+    )
+    db_session.add(RosterSlot(team_id=97, player_id=120, week=4))
+    for pid, pts, data, two in [
+        (120, 5, {"Rec": 2, "RecYds": 50}, 10),
+        (121, 4, {"Rec": 8, "RecYds": 40}, 8),
+        (122, 9, {}, 18),
+    ]:
+        db_session.add(Projection(player_id=pid, week=4, projected_points=pts, data=data))
+        db_session.add(
+            ProjectionHorizon(player_id=pid, week=4, horizon=2, projected_points=two, data={})
+        )
+    db_session.commit()
+
+    # Under PPR the slot receiver outscores the starter (12 to 7); a player
+    # without a stored statline keeps their points.
+    one = client.get("/team/97/waivers", params={"week": 4}).json()["waivers"]
+    assert [(w["player_id"], w["delta_xfp"]) for w in one] == [(121, 5), (122, 2)]
+    # Horizons are scaled by each player's league-to-stored week ratio.
+    two = client.get("/team/97/waivers", params={"week": 4, "horizon": 2}).json()["waivers"]
+    assert [w["player_id"] for w in two] == [121, 122]
+    assert two[0]["projected_points"] == pytest.approx(24)
+    assert two[0]["delta_xfp"] == pytest.approx(10)
+
+
+def test_team_waivers_shift_low_stored_weeks(client, db_session):
+    _auth_client(client, db_session)
+    db_session.query(ProjectionHorizon).delete()
+    db_session.query(Projection).delete()
+    db_session.query(RosterSlot).delete()
+    db_session.query(Player).delete()
+    db_session.query(Team).delete()
+    db_session.query(League).delete()
+    scoring = {
+        "stat_modifiers": {
+            "stats": [
+                {"stat": {"stat_id": 11, "value": "1"}},
+                {"stat": {"stat_id": 12, "value": "0.1"}},
+            ]
+        }
+    }
+    league = League(id=96, yahoo_id=96, name="L", scoring_settings=scoring)
+    db_session.add_all([league, Team(id=96, league=league, name="T")])
+    db_session.add_all(
+        [
+            Player(id=130, name="Starter", position="WR"),
+            Player(id=131, name="Negative", position="WR"),
+            Player(id=132, name="NearZero", position="WR"),
+        ]
+    )
+    db_session.add(RosterSlot(team_id=96, player_id=130, week=4))
+    # Every statline is worth 5 league points a week.
+    for pid, week_pts, two in [(130, 5, 10), (131, -1, 4), (132, 0.1, 6)]:
+        db_session.add(
+            Projection(
+                player_id=pid,
+                week=4,
+                projected_points=week_pts,
+                data={"Rec": 3, "RecYds": 20},
+            )
+        )
+        db_session.add(
+            ProjectionHorizon(player_id=pid, week=4, horizon=2, projected_points=two, data={})
+        )
+    db_session.commit()
+
+    # A ratio would give -20 and 300; both weeks shift by the weekly difference.
+    two = client.get("/team/96/waivers", params={"week": 4, "horizon": 2}).json()["waivers"]
+    assert [w["player_id"] for w in two] == [131, 132]
+    assert [w["projected_points"] for w in two] == pytest.approx([16, 15.8])
+    one = client.get("/team/96/waivers", params={"week": 4}).json()["waivers"]
+    assert [w["projected_points"] for w in one] == pytest.approx([5, 5])
+
+
+def test_streamers_rank_by_league_scoring(client, db_session):
+    _auth_client(client, db_session)
+    db_session.query(Projection).delete()
+    db_session.query(Player).delete()
+    db_session.query(League).delete()
+    scoring = {"stat_modifiers": {"stats": [{"stat": {"stat_id": 32, "value": "2"}}]}}
+    db_session.add(League(id=96, yahoo_id=96, name="L", scoring_settings=scoring))
+    db_session.add_all(
+        [
+            Player(id=130, name="Pass rush", position="DEF"),
+            Player(id=131, name="Stingy", position="DEF"),
+            Projection(player_id=130, week=2, projected_points=5, data={"Sack": 4}),
+            Projection(player_id=131, week=2, projected_points=8, data={"Sack": 1}),
+            Projection(player_id=130, week=2, source="yahoo", projected_points=30, data={}),
+        ]
+    )
+    db_session.commit()
+
+    default = client.get("/streamers/def", params={"week": 2}).json()
+    assert [(r["player_id"], r["projected_points"]) for r in default] == [(131, 8), (130, 5)]
+    league = client.get("/streamers/def", params={"week": 2, "league_id": 96}).json()
+    assert [(r["player_id"], r["projected_points"]) for r in league] == [(130, 8), (131, 2)]
@@ -2,7 +2,9 @@ from datetime import datetime, timedelta, UTC
 
 import respx
 
-from app.models import User, OAuthToken
+from app.models import League, User, OAuthToken
+from app.routers import yahoo as yahoo_router
+from app.routers.yahoo import _league_settings, _scoring_map
 from app.security import TokenEncryptionService
 from app.settings import settings
 
@@ -122,3 +124,36 @@ def test_refresh_path(client, db_session):
     assert resp.status_code == 200
     db_session.refresh(token)
     assert enc.decrypt(token.access_token) == "new"
+
+
+def test_league_meta_stores_scoring_settings(client, db_session):
+    user, token, enc = _setup_user(db_session)
+    _auth_client(client, user)
+    league = League(yahoo_id="123", name="L")
+    db_session.add(league)
+    db_session.commit()
+    settings = {
+        "stat_categories": {"stats": [{"stat": {"stat_id": 5, "name": "Passing TD"}}]},
+        "stat_modifiers": {"stats": [{"stat": {"stat_id": 5, "value": "4"}}]},
+    }
+    league_json = {
+        "fantasy_content": {"league": [{"league_key": "449.l.123"}, {"settings": [settings]}]}
+    }
+    with respx.mock() as mock:
+        mock.get(
+            "https://fantasysports.yahooapis.com/fantasy/v2/league/449.l.123",
+            params={"format": "json"},
+        ).respond(200, json=league_json)
+        resp = client.get("/yahoo/league/449.l.123")
+    assert resp.status_code == 200
+    assert resp.json()["scoring"] == {"5": "Passing TD"}
+    db_session.refresh(league)
+    assert league.scoring_settings == settings
+
+
+def test_league_settings_logs_malformed_payloads(caplog, monkeypatch):
+    # Alembic's fileConfig in other tests disables loggers created before it.
+    monkeypatch.setattr(yahoo_router.logger, "disabled", False)
+    assert _league_settings({"fantasy_content": {"league": [{"league_key": "1"}]}}) == {}
+    assert _scoring_map({"fantasy_content": {"league": None}}) == {}
+    assert "Unexpected Yahoo league payload" in caplog.text
@@ -1,3 +1,39 @@
-from .lineup import optimize_lineup
+from .assignment import AssignmentSolver
+from .eligibility import (
+    RosterTemplate,
+    compile_roster,
+    player_positions,
+    position_mask,
+    slot_mask,
+)
+from .incremental import LineupState, SlotChange
+from .lateswap import game_locks, optimize_late_swap
+from .league import optimize_league
+from .lineup import optimize_lineup, optimize_lineup_exhaustive, top_lineups
+from .winprob import (
+    optimize_win_probability,
+    simulate_points,
+    team_correlation,
+    win_probability,
+)
 
-__all__ = ["optimize_lineup"]
+__all__ = [
+    "AssignmentSolver",
+    "LineupState",
+    "RosterTemplate",
+    "SlotChange",
+    "compile_roster",
+    "game_locks",
+    "optimize_late_swap",
+    "optimize_league",
+    "optimize_lineup",
+    "optimize_lineup_exhaustive",
+    "optimize_win_probability",
+    "player_positions",
+    "position_mask",
+    "simulate_points",
+    "slot_mask",
+    "team_correlation",
+    "top_lineups",
+    "win_probability",
+]
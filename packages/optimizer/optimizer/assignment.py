@@ -0,0 +1,155 @@
+"""Incremental solver for the rectangular assignment problem."""
+
+from __future__ import annotations
+
+import math
+from typing import List, Optional, Sequence
+
+INF = math.inf
+
+
+class AssignmentSolver:
+    """Assign every row to a distinct column maximizing the total weight.
+
+    Uses shortest augmenting paths with row/column potentials (the Hungarian
+    method), so a full solve is ``O(rows^2 * cols)``. Potentials and the
+    matching are kept on the instance: after edges are removed or weights
+    change only the rows that lost their column are re-augmented.
+
+    Parameters
+    ----------
+    weights: Sequence[Sequence[Optional[float]]]
+        ``rows x cols`` matrix of weights; ``None`` marks a forbidden pair.
+    """
+
+    def __init__(self, weights: Sequence[Sequence[Optional[float]]]) -> None:
+        self.n_rows = len(weights)
+        self.n_cols = len(weights[0]) if weights else 0
+        self._cost: List[List[float]] = [
+            [INF if w is None else -float(w) for w in row] for row in weights
+        ]
+        self._u = [0.0] * self.n_rows
+        self._v = [0.0] * self.n_cols
+        self._row_to_col = [-1] * self.n_rows
+        self._col_to_row = [-1] * self.n_cols
+
+    def copy(self) -> "AssignmentSolver":
+        """Return an independent copy including potentials and matching."""
+
+        clone = AssignmentSolver.__new__(AssignmentSolver)
+        clone.n_rows = self.n_rows
+        clone.n_cols = self.n_cols
+        clone._cost = [row.copy() for row in self._cost]
+        clone._u = self._u.copy()
+        clone._v = self._v.copy()
+        clone._row_to_col = self._row_to_col.copy()
+        clone._col_to_row = self._col_to_row.copy()
+        return clone
+
+    @property
+    def assignment(self) -> List[int]:
+        """Column assigned to each row (``-1`` while unassigned)."""
+
+        return self._row_to_col.copy()
+
+    @property
+    def total(self) -> float:
+        """Total weight of the current (possibly partial) matching."""
+
+        return -sum(self._cost[i][j] for i, j in enumerate(self._row_to_col) if j >= 0)
+
+    def weight(self, row: int, col: int) -> Optional[float]:
+        cost = self._cost[row][col]
+        return None if cost == INF else -cost
+
+    def solve(self) -> List[int]:
+        """Augment every unassigned row and return the row->column mapping.
+
+        Raises ``ValueError`` when some row cannot be matched.
+        """
+
+        for row in range(self.n_rows):
+            if self._row_to_col[row] < 0:
+                self._augment(row)
+        return self.assignment
+
+    def set_weight(self, row: int, col: int, weight: Optional[float]) -> None:
+        """Change a single weight, releasing rows whose optimality it breaks."""
+
+        self._cost[row][col] = INF if weight is None else -float(weight)
+        if self._row_to_col[row] == col:
+            self.release(row)
+        elif (
+            self._row_to_col[row] >= 0
+            and self._cost[row][col] - self._u[row] - self._v[col] < 0
+        ):
+            self.release(row)
+
+    def forbid(self, row: int, col: int) -> None:
+        self.set_weight(row, col, None)
+
+    def release(self, row: int) -> None:
+        """Unassign ``row`` so the next :meth:`solve` re-augments it."""
+
+        col = self._row_to_col[row]
+        if col < 0:
+            return
+        self._row_to_col[row] = -1
+        self._col_to_row[col] = -1
+        self._reset_column(col)
+
+    def _reset_column(self, col: int) -> None:
+        # A free column must carry a zero potential; raising it may make the
+        # reduced cost of other matched rows negative, so those are released.
+        if self._v[col] == 0:
+            return
+        self._v[col] = 0.0
+        for i in range(self.n_rows):
+            if self._row_to_col[i] >= 0 and self._cost[i][col] - self._u[i] < 0:
+                self.release(i)
+
+    def _augment(self, root: int) -> None:
+        cost, u, v = self._cost, self._u, self._v
+        col_to_row = self._col_to_row
+        m = self.n_cols
+        minv = [INF] * m
+        way = [-1] * m
+        used = [False] * m
+        tree_cols: List[int] = []
+        row, prev_col = root, -1
+        while True:
+            crow = cost[row]
+            ui = u[row]
+            delta, nxt = INF, -1
+            for j in range(m):
+                if used[j]:
+                    continue
+                cur = crow[j] - ui - v[j]
+                if cur < minv[j]:
+                    minv[j] = cur
+                    way[j] = prev_col
+                if minv[j] < delta:
+                    delta = minv[j]
+                    nxt = j
+            if nxt < 0 or delta == INF:
+                raise ValueError("no feasible assignment")
+            u[root] += delta
+            for j in tree_cols:
+                u[col_to_row[j]] += delta
+                v[j] -= delta
+            for j in range(m):
+                if not used[j]:
+                    minv[j] -= delta
+            used[nxt] = True
+            if col_to_row[nxt] < 0:
+                break
+            tree_cols.append(nxt)
+            row, prev_col = col_to_row[nxt], nxt
+
+        j = nxt
+        while j >= 0:
+            pj = way[j]
+            r = root if pj < 0 else col_to_row[pj]
+            col_to_row[j] = r
+            self._row_to_col[r] = j
+            j = pj
@@ -0,0 +1,120 @@
+"""Roster slot eligibility compiled to position bitmasks."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+POSITION_BITS: Dict[str, int] = {
+    "QB": 1 << 0,
+    "RB": 1 << 1,
+    "WR": 1 << 2,
+    "TE": 1 << 3,
+    "K": 1 << 4,
+    "DEF": 1 << 5,
+    "DL": 1 << 6,
+    "LB": 1 << 7,
+    "DB": 1 << 8,
+}
+
+# Alternative spellings of player positions used by Yahoo and nflverse.
+POSITION_ALIASES: Dict[str, str] = {
+    "DST": "DEF",
+    "D/ST": "DEF",
+    "DE": "DL",
+    "DT": "DL",
+    "CB": "DB",
+    "S": "DB",
+}
+
+# Letters used in Yahoo combined slot codes such as ``W/R/T`` or ``Q/W/R/T``.
+SLOT_LETTERS: Dict[str, str] = {"Q": "QB", "W": "WR", "R": "RB", "T": "TE", "K": "K"}
+
+SLOT_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "FLEX": ("RB", "WR", "TE"),
+    "SUPERFLEX": ("QB", "RB", "WR", "TE"),
+    "OP": ("QB", "RB", "WR", "TE"),
+    "D": ("DL", "LB", "DB"),
+    "IDP": ("DL", "LB", "DB"),
+}
+
+BENCH_SLOTS = {"BN", "IR", "IR+", "NA"}
+
+
+def position_mask(positions: Iterable[str]) -> int:
+    """Return the bitmask of a player's eligible positions.
+
+    Unknown positions contribute no bits, leaving the player ineligible for
+    any slot that requires them.
+    """
+
+    mask = 0
+    for pos in positions:
+        pos = POSITION_ALIASES.get(pos, pos)
+        mask |= POSITION_BITS.get(pos, 0)
+    return mask
+
+
+def player_positions(
+    position: Optional[str], meta: Optional[Mapping[str, Any]] = None
+) -> List[str]:
+    """A player's eligible positions, as every optimizer entry point reads them.
+
+    Yahoo's ``eligible_positions`` (stored in ``meta``) win when present;
+    their slot-only codes such as ``W/R/T`` or ``BN`` add no bits in
+    :func:`position_mask`. Otherwise a multi-position display string like
+    ``"WR,RB"`` or ``"RB/WR"`` is split, while ``"D/ST"`` stays one position.
+    """
+
+    eligible = (meta or {}).get("eligible_positions")
+    if eligible:
+        return [str(p) for p in eligible]
+    if not position:
+        return []
+    if position in POSITION_BITS or position in POSITION_ALIASES:
+        return [position]
+    return [p.strip() for p in position.replace("/", ",").split(",") if p.strip()]
+
+
+def slot_mask(slot: str) -> int:
+    """Return the bitmask of positions allowed in a roster slot code."""
+
+    if slot in SLOT_ALIASES:
+        return position_mask(SLOT_ALIASES[slot])
+    if "/" in slot and slot not in POSITION_ALIASES:
+        parts = slot.split("/")
+        if all(part in SLOT_LETTERS for part in parts):
+            return position_mask(SLOT_LETTERS[part] for part in parts)
+    mask = position_mask([slot])
+    if not mask:
+        raise ValueError(f"unknown roster slot {slot!r}")
+    return mask
+
+
+@dataclass(frozen=True)
+class RosterTemplate:
+    """Starting slots of a league with the position mask of each slot."""
+
+    slots: Tuple[str, ...]
+    masks: Tuple[int, ...]
+
+
+def compile_roster(roster_positions: Iterable[Any]) -> RosterTemplate:
+    """Compile a league's ``roster_positions`` JSON into a :class:`RosterTemplate`.
+
+    Entries may be plain slot strings or Yahoo style mappings with
+    ``position`` and ``count`` (optionally wrapped in ``roster_position``).
+    Bench and injured-reserve slots are skipped.
+    """
+
+    slots: List[str] = []
+    for entry in roster_positions:
+        if isinstance(entry, Mapping):
+            entry = entry.get("roster_position", entry)
+            position = str(entry.get("position", ""))
+            count = int(entry.get("count", 1))
+        else:
+            position, count = str(entry), 1
+        if position and position not in BENCH_SLOTS:
+            slots.extend([position] * count)
+    return RosterTemplate(tuple(slots), tuple(slot_mask(s) for s in slots))
@@ -0,0 +1,152 @@
+"""Warm-started lineup re-optimization as projections change."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .lineup import Player, _canonical, _points, _solve
+
+
+@dataclass(frozen=True)
+class SlotChange:
+    """A roster slot whose starter changed after an update."""
+
+    index: int
+    slot: str
+    before: Optional[str]
+    after: str
+
+
+def _stable(
+    roster_slots: Sequence[str],
+    previous: Sequence[int],
+    cols: Sequence[int],
+    fixed: Iterable[int] = (),
+) -> List[int]:
+    # Keep players in the slot they already held when their label group still
+    # starts them, so a single swap reports a single changed slot. Rows in
+    # ``fixed`` are locked to the exact slot the solver assigned them.
+    by_slot: Dict[str, List[int]] = {}
+    for slot, col in zip(roster_slots, cols):
+        by_slot.setdefault(slot, []).append(col)
+    result = [-1] * len(roster_slots)
+    for idx in fixed:
+        by_slot[roster_slots[idx]].remove(cols[idx])
+        result[idx] = cols[idx]
+    for idx, (slot, col) in enumerate(zip(roster_slots, previous)):
+        group = by_slot[slot]
+        if result[idx] < 0 and col in group:
+            group.remove(col)
+            result[idx] = col
+    for idx, slot in enumerate(roster_slots):
+        if result[idx] < 0:
+            result[idx] = by_slot[slot].pop(0)
+    return result
+
+
+class LineupState:
+    """Solved lineup for one team and week that can be repaired in place.
+
+    The underlying :class:`AssignmentSolver` keeps its potentials, so
+    :meth:`update` only re-augments the slots whose optimality a changed
+    projection breaks instead of solving the whole roster again.
+    """
+
+    def __init__(self, players: Sequence[Player], roster_slots: Sequence[str]) -> None:
+        self.players = list(players)
+        self.roster_slots = list(roster_slots)
+        self._index = {str(p.get("id")): j for j, p in enumerate(self.players)}
+        self._solver = _solve(self.players, self.roster_slots)
+        self._cols = _canonical(self.roster_slots, self._solver.assignment)
+        self._locked: Dict[int, int] = {}
+        self._started: Set[int] = set()
+
+    @property
+    def lineup(self) -> Tuple[List[str], float]:
+        """Player ids in ``roster_slots`` order and the total projected points."""
+
+        return [str(self.players[j].get("id")) for j in self._cols], self._solver.total
+
+    def update(self, points: Mapping[str, float]) -> List[SlotChange]:
+        """Apply new projected points keyed by player id and re-optimize.
+
+        Returns the slots whose starter changed. Unknown player ids are
+        ignored. Raises ``ValueError`` if the lineup becomes infeasible.
+        """
+
+        solver = self._solver
+        for pid, pts in points.items():
+            col = self._index.get(str(pid))
+            if col is None:
+                continue
+            self.players[col] = {**self.players[col], "points": pts}
+            for row in range(solver.n_rows):
+                weight = solver.weight(row, col)
+                if weight is not None and weight != pts:
+                    solver.set_weight(row, col, pts)
+        return self._resolve()
+
+    def lock(
+        self, locked: Mapping[int, str], started: Iterable[str] = ()
+    ) -> List[SlotChange]:
+        """Freeze players whose games have kicked off and re-optimize the rest.
+
+        Parameters
+        ----------
+        locked: Mapping[int, str]
+            Slot index to the id of the player who started there when their
+            game kicked off.
+        started: Iterable[str]
+            Ids of benched players whose games have kicked off; they can no
+            longer enter the lineup.
+
+        Locks accumulate across calls, so each kickoff window only removes
+        its newly locked slots and players from the warm solver.
+        """
+
+        solver = self._solver
+        for row, pid in locked.items():
+            col = self._index[str(pid)]
+            if self._locked.get(row) == col:
+                continue
+            self._locked[row] = col
+            if solver.weight(row, col) is None:
+                solver.set_weight(row, col, _points(self.players[col]))
+            for j in range(solver.n_cols):
+                if j != col and solver.weight(row, j) is not None:
+                    solver.forbid(row, j)
+            for i in range(solver.n_rows):
+                if i != row and solver.weight(i, col) is not None:
+                    solver.forbid(i, col)
+        for pid in started:
+            col = self._index.get(str(pid))
+            if col is None or col in self._started or col in self._locked.values():
+                continue
+            self._started.add(col)
+            for i in range(solver.n_rows):
+                if solver.weight(i, col) is not None:
+                    solver.forbid(i, col)
+        return self._resolve()
+
+    def _resolve(self) -> List[SlotChange]:
+        solver = self._solver
+        try:
+            solver.solve()
+        except ValueError:
+            raise ValueError("no valid lineup") from None
+
+        previous = self._cols
+        self._cols = _stable(
+            self.roster_slots, previous, solver.assignment, self._locked
+        )
+        return [
+            SlotChange(
+                idx,
+                self.roster_slots[idx],
+                str(self.players[old].get("id")),
+                str(self.players[new].get("id")),
+            )
+            for idx, (old, new) in enumerate(zip(previous, self._cols))
+            if old != new
+        ]
@@ -0,0 +1,75 @@
+"""Late-swap lineup optimization around game kickoffs."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .incremental import LineupState
+from .lineup import Player
+
+
+def game_locks(
+    lineup: Sequence[Optional[str]],
+    kickoffs: Mapping[str, datetime],
+    now: datetime,
+    roster: Iterable[str] = (),
+) -> Tuple[Dict[int, str], Set[str]]:
+    """Split players whose games have kicked off into locked starters and bench.
+
+    Parameters
+    ----------
+    lineup: Sequence[Optional[str]]
+        Player id currently in each slot (``None`` for an empty slot).
+    kickoffs: Mapping[str, datetime]
+        Kickoff time of each player's game keyed by player id.
+    now: datetime
+        Current time; games kicking off at or before it are locked.
+    roster: Iterable[str]
+        Every player id on the roster, used to find started bench players.
+
+    Returns
+    -------
+    Tuple[Dict[int, str], Set[str]]
+        Locked slot index to player id, and ids of started bench players.
+    """
+
+    def started(pid: str) -> bool:
+        kickoff = kickoffs.get(pid)
+        return kickoff is not None and kickoff <= now
+
+    locked = {
+        idx: pid for idx, pid in enumerate(lineup) if pid is not None and started(pid)
+    }
+    starting = set(pid for pid in lineup if pid is not None)
+    bench = {pid for pid in roster if pid not in starting and started(pid)}
+    return locked, bench
+
+
+def optimize_late_swap(
+    players: Sequence[Player],
+    roster_slots: Sequence[str],
+    lineup: Sequence[Optional[str]],
+    kickoffs: Mapping[str, datetime],
+    now: datetime,
+    state: Optional[LineupState] = None,
+) -> Tuple[LineupState, List[str], float]:
+    """Re-optimize only the slots and players whose games have not started.
+
+    Pass the :class:`LineupState` returned by the previous kickoff window to
+    reuse its solve; a fresh state is built otherwise.
+
+    Returns
+    -------
+    Tuple[LineupState, List[str], float]
+        The state to pass to the next window, player ids in ``roster_slots``
+        order and the total projected points.
+    """
+
+    if state is None:
+        state = LineupState(players, roster_slots)
+    roster = [str(p.get("id")) for p in players]
+    locked, bench = game_locks(lineup, kickoffs, now, roster)
+    state.lock(locked, bench)
+    ids, total = state.lineup
+    return state, ids, total
@@ -0,0 +1,110 @@
+"""League-wide lineup optimization."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .eligibility import compile_roster, player_positions, position_mask
+from .lineup import Player, optimize_lineup
+
+# Player pool shared by every task of a worker process; populated once by
+# ``_init_pool`` instead of being pickled with each team.
+_POOL: Dict[int, Player] = {}
+
+
+def _init_pool(pool: Dict[int, Player]) -> None:
+    global _POOL
+    _POOL = pool
+
+
+def _optimize_team(
+    team_id: int, player_ids: Sequence[int], roster_slots: Sequence[str]
+) -> Tuple[int, Optional[Tuple[List[str], float]]]:
+    players = [_POOL[pid] for pid in player_ids if pid in _POOL]
+    try:
+        return team_id, optimize_lineup(players, roster_slots)
+    except ValueError:
+        return team_id, None
+
+
+def optimize_league(
+    league: Any,
+    week: int,
+    points: Mapping[int, float],
+    roster_slots: Optional[Sequence[str]] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[int, Tuple[List[str], float]]:
+    """Optimize the lineup of every team in ``league`` for ``week``.
+
+    Parameters
+    ----------
+    league:
+        A ``League`` whose ``teams`` carry ``roster_slots`` with loaded
+        ``player`` relationships. Eligibility comes from
+        :func:`player_positions`.
+    week: int
+        Week whose roster slots are optimized.
+    points: Mapping[int, float]
+        Projected points keyed by player id, loaded once for the league.
+    roster_slots: Optional[Sequence[str]]
+        Slots to fill; defaults to the league's ``roster_positions`` or, when
+        it has none, each team's starting (non-bench) slots for ``week``.
+    max_workers: Optional[int]
+        Size of the process pool. ``0`` or ``1`` optimizes in-process.
+
+    Returns
+    -------
+    Dict[int, Tuple[List[str], float]]
+        ``optimize_lineup`` results keyed by team id. Teams without a valid
+        lineup are omitted.
+    """
+
+    if roster_slots is not None:
+        league_slots: Optional[List[str]] = list(roster_slots)
+    elif league.roster_positions:
+        league_slots = list(compile_roster(league.roster_positions).slots)
+    else:
+        league_slots = None
+    pool: Dict[int, Player] = {}
+    rosters: List[Tuple[int, List[int], List[str]]] = []
+    for team in league.teams:
+        ids: List[int] = []
+        starters: List[str] = []
+        for rs in team.roster_slots:
+            if rs.week != week:
+                continue
+            if league_slots is None and rs.is_starter and rs.slot:
+                starters.append(rs.slot)
+            if rs.player is None:
+                continue
+            player = rs.player
+            if player.id not in pool:
+                positions = player_positions(
+                    player.position_primary, getattr(player, "meta", None)
+                )
+                pool[player.id] = {
+                    "id": player.id,
+                    "mask": position_mask(positions),
+                    "points": points.get(player.id, 0.0),
+                }
+            ids.append(player.id)
+        slots = league_slots
+        if slots is None:
+            slots = list(compile_roster(starters).slots)
+        rosters.append((team.id, ids, slots))
+
+    results: Dict[int, Tuple[List[str], float]] = {}
+    if max_workers is not None and max_workers <= 1:
+        _init_pool(pool)
+        outcomes = [_optimize_team(*roster) for roster in rosters]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_pool, initargs=(pool,)
+        ) as executor:
+            futures = [executor.submit(_optimize_team, *roster) for roster in rosters]
+            outcomes = [f.result() for f in futures]
+    for team_id, result in outcomes:
+        if result is not None:
+            results[team_id] = result
+    return results
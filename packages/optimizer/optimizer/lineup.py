@@ -2,22 +2,83 @@
 
 from __future__ import annotations
 
-from typing import Any, Iterable, List, Mapping, Sequence, Tuple, Set, cast
+import heapq
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    cast,
+)
+
+from .assignment import AssignmentSolver
+from .eligibility import position_mask, slot_mask
 
 Player = Mapping[str, object]
 
 
+def player_mask(p: Player) -> int:
+    """Return a player's position bitmask, using a precomputed ``mask`` if set."""
+
+    mask = p.get("mask")
+    if mask is None:
+        return position_mask(cast(Iterable[str], p.get("positions", [])))
+    return cast(int, mask)
+
+
+def _points(p: Player) -> float:
+    return float(cast(Any, p.get("points", 0)))
+
+
+def lineup_weights(
+    players: Sequence[Player], roster_slots: Sequence[str]
+) -> List[List[Optional[float]]]:
+    """Build the ``slots x players`` weight matrix; ``None`` marks ineligible."""
+
+    masks = [player_mask(p) for p in players]
+    points = [_points(p) for p in players]
+    weights: List[List[Optional[float]]] = []
+    for slot in roster_slots:
+        allowed = slot_mask(slot)
+        weights.append(
+            [pts if allowed & mask else None for pts, mask in zip(points, masks)]
+        )
+    return weights
+
+
+def _canonical(roster_slots: Sequence[str], cols: Sequence[int]) -> List[int]:
+    # Slots sharing a label are interchangeable; list their players in input
+    # order so equivalent solutions always render the same lineup.
+    by_slot: Dict[str, List[int]] = {}
+    for slot, col in zip(roster_slots, cols):
+        by_slot.setdefault(slot, []).append(col)
+    for group in by_slot.values():
+        group.sort(reverse=True)
+    return [by_slot[slot].pop() for slot in roster_slots]
+
+
 def optimize_lineup(
     players: Sequence[Player], roster_slots: Sequence[str]
 ) -> Tuple[List[str], float]:
     """Return the optimal lineup and total projected points.
 
+    The lineup is solved as a slot/player assignment problem in polynomial
+    time; see :func:`optimize_lineup_exhaustive` for the reference search.
+
     Parameters
     ----------
     players: Sequence[Player]
         Players with ``id``, ``positions`` (iterable of str), and ``points``.
+        A precomputed ``mask`` from :func:`position_mask` may replace
+        ``positions``.
     roster_slots: Sequence[str]
         Slots to fill, e.g., ["QB", "RB", "RB", "WR", "WR", "TE", "FLEX", "DST", "K"].
+        Yahoo slot codes such as ``W/R/T``, ``Q/W/R/T`` or ``D`` are accepted.
 
     Returns
     -------
@@ -26,10 +87,93 @@ def optimize_lineup(
         total projected points.
     """
 
+    solver = _solve(players, roster_slots)
+    cols = _canonical(roster_slots, solver.assignment)
+    return [str(players[j].get("id")) for j in cols], solver.total
+
+
+def _solve(players: Sequence[Player], roster_slots: Sequence[str]) -> AssignmentSolver:
+    if len(roster_slots) > len(players):
+        raise ValueError("no valid lineup")
+    solver = AssignmentSolver(lineup_weights(players, roster_slots))
+    try:
+        solver.solve()
+    except ValueError:
+        raise ValueError("no valid lineup") from None
+    return solver
+
+
+def top_lineups(
+    players: Sequence[Player], roster_slots: Sequence[str], k: int = 5
+) -> List[Tuple[List[str], float]]:
+    """Return up to ``k`` distinct lineups ordered by total projected points.
+
+    Uses Murty's partitioning over (player, slot label) pairs, so lineups that
+    only swap players between identical slots are not repeated. Each subproblem
+    starts from a copy of its parent's solved :class:`AssignmentSolver` and
+    only re-augments the row that lost its player, instead of solving from
+    scratch.
+    """
+
+    if k <= 0:
+        return []
+    groups: Dict[str, List[int]] = {}
+    for row, slot in enumerate(roster_slots):
+        groups.setdefault(slot, []).append(row)
+
+    root = _solve(players, roster_slots)
+    counter = 0
+    heap: List[Tuple[float, int, AssignmentSolver, Tuple[int, ...]]] = [
+        (-root.total, counter, root, ())
+    ]
+    results: List[Tuple[List[str], float]] = []
+    while heap and len(results) < k:
+        _, _, node, pinned = heapq.heappop(heap)
+        cols = node.assignment
+        lineup = _canonical(roster_slots, cols)
+        results.append(([str(players[j].get("id")) for j in lineup], node.total))
+
+        # Child i keeps the first i (player, slot label) pairs of this lineup
+        # and excludes pair i; together the children partition the rest of
+        # the node's solution space.
+        fixed = set(pinned)
+        for row in range(len(roster_slots)):
+            if row in fixed:
+                continue
+            col = cols[row]
+            child = node.copy()
+            for other in groups[roster_slots[row]]:
+                child.forbid(other, col)
+            try:
+                child.solve()
+            except ValueError:
+                pass
+            else:
+                counter += 1
+                heapq.heappush(heap, (-child.total, counter, child, tuple(fixed)))
+            for j in range(node.n_cols):
+                if j != col:
+                    node.forbid(row, j)
+            for i in range(node.n_rows):
+                if i != row:
+                    node.forbid(i, col)
+            fixed.add(row)
+    return results
+
+
+def optimize_lineup_exhaustive(
+    players: Sequence[Player], roster_slots: Sequence[str]
+) -> Tuple[List[str], float]:
+    """Exhaustive backtracking search over every slot/player permutation.
+
+    Exponential in the roster size; kept as a reference oracle for testing
+    :func:`optimize_lineup`.
+    """
+
     best_lineup: List[str] = []
     best_score = float("-inf")
-
-    eligibility = {"FLEX": {"RB", "WR", "TE"}}
+    slot_masks = [slot_mask(slot) for slot in roster_slots]
+    masks = [player_mask(p) for p in players]
 
     def backtrack(idx: int, used: Set[int], current: List[str], score: float) -> None:
         nonlocal best_lineup, best_score
@@ -38,19 +182,13 @@ def optimize_lineup(
                 best_score = score
                 best_lineup = current.copy()
             return
-        slot = roster_slots[idx]
-        allowed = eligibility.get(slot, {slot})
+        allowed = slot_masks[idx]
         for i, p in enumerate(players):
-            if i in used:
-                continue
-            positions = cast(Iterable[str], p.get("positions", []))
-            p_positions = set(positions)
-            if not allowed.intersection(p_positions):
+            if i in used or not allowed & masks[i]:
                 continue
             used.add(i)
             current.append(str(p.get("id")))
-            points = cast(Any, p.get("points", 0))
-            backtrack(idx + 1, used, current, score + float(points))
+            backtrack(idx + 1, used, current, score + _points(p))
             current.pop()
             used.remove(i)
 
@@ -0,0 +1,232 @@
+"""Lineup solver benchmarks on seeded synthetic rosters.
+
+Run ``python lineup_benchmark.py --write`` from this directory to refresh
+``benchmark_baseline.json`` after an intentional performance change;
+``test_benchmark.py`` (with ``RUN_BENCHMARKS=1``) fails when a solver
+regresses past the tolerances stored there.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+sys.path.append(str(Path(__file__).resolve().parents[3] / "perfbench"))
+
+import perfbench  # noqa: E402
+from optimizer import (  # noqa: E402
+    LineupState,
+    optimize_lineup,
+    optimize_lineup_exhaustive,
+    slot_mask,
+    top_lineups,
+)
+from optimizer.eligibility import POSITION_BITS  # noqa: E402
+from optimizer.lineup import player_mask  # noqa: E402
+
+BASELINE_PATH = Path(__file__).with_name("benchmark_baseline.json")
+
+TEMPLATES: Dict[str, Dict[str, Any]] = {
+    "standard": {
+        "slots": ["QB", "RB", "RB", "WR", "WR", "TE", "W/R/T", "K", "DEF"],
+        "ppr": 1.0,
+    },
+    "superflex_half_ppr": {
+        "slots": [
+            "QB",
+            "RB",
+            "RB",
+            "WR",
+            "WR",
+            "WR",
+            "TE",
+            "W/R/T",
+            "Q/W/R/T",
+            "K",
+            "DEF",
+        ],
+        "ppr": 0.5,
+    },
+    "idp": {
+        "slots": [
+            "QB",
+            "RB",
+            "RB",
+            "WR",
+            "WR",
+            "TE",
+            "W/R/T",
+            "K",
+            "DEF",
+            "DL",
+            "DL",
+            "LB",
+            "LB",
+            "DB",
+            "DB",
+            "D",
+        ],
+        "ppr": 1.0,
+    },
+}
+
+ROSTER_SIZES = [16, 28, 40]
+
+# Mean and spread of synthetic projected points by position; receivers also
+# gain ``ppr`` times their reception share.
+POSITION_POINTS = {
+    "QB": (18.0, 5.0),
+    "RB": (10.0, 5.0),
+    "WR": (9.0, 5.0),
+    "TE": (6.0, 3.0),
+    "K": (8.0, 2.0),
+    "DEF": (7.0, 3.0),
+    "DL": (6.0, 2.5),
+    "LB": (8.0, 3.0),
+    "DB": (7.0, 3.0),
+}
+RECEPTIONS = {"RB": 2.5, "WR": 5.0, "TE": 4.0}
+
+
+def synthetic_roster(template: str, size: int, seed: int) -> List[Dict[str, Any]]:
+    """Seeded roster that can fill every slot of ``template`` at least once."""
+
+    rng = random.Random(seed)
+    spec = TEMPLATES[template]
+    needed: List[str] = []
+    for slot in spec["slots"]:
+        mask = slot_mask(slot)
+        needed.append(next(pos for pos, bit in POSITION_BITS.items() if bit & mask))
+    pool = sorted(
+        {
+            pos
+            for slot in spec["slots"]
+            for pos, bit in POSITION_BITS.items()
+            if bit & slot_mask(slot)
+        }
+    )
+    positions = needed + [rng.choice(pool) for _ in range(size - len(needed))]
+    players = []
+    for i, pos in enumerate(positions):
+        mean, spread = POSITION_POINTS[pos]
+        points = rng.gauss(mean, spread) + spec["ppr"] * RECEPTIONS.get(pos, 0.0)
+        players.append(
+            {"id": f"{template}-{i}", "positions": [pos], "points": round(points, 2)}
+        )
+    return players
+
+
+def _measure(fn: Callable[[], float], repeat: int) -> Tuple[float, float, float]:
+    seconds, total = perfbench.best_of(fn, repeat)
+    return seconds, perfbench.peak_kib(fn), total
+
+
+def optimum(players: Sequence[Dict[str, Any]], slots: Sequence[str]) -> float:
+    """Best lineup total by dynamic programming over filled-slot counts.
+
+    Slots sharing a code are interchangeable, so a state only counts how many
+    of each code are filled. Exact like the exhaustive search but tractable
+    on full rosters, and independent of the assignment solver.
+    """
+
+    codes = sorted(set(slots))
+    caps = [slots.count(code) for code in codes]
+    code_masks = [slot_mask(code) for code in codes]
+    states: Dict[Tuple[int, ...], float] = {tuple(0 for _ in codes): 0.0}
+    for p in players:
+        mask, points = player_mask(p), float(p["points"])
+        eligible = [j for j, m in enumerate(code_masks) if m & mask]
+        nxt = dict(states)
+        for state, total in states.items():
+            for j in eligible:
+                if state[j] < caps[j]:
+                    key = state[:j] + (state[j] + 1,) + state[j + 1 :]
+                    if nxt.get(key, float("-inf")) < total + points:
+                        nxt[key] = total + points
+        states = nxt
+    full = tuple(caps)
+    if full not in states:
+        raise ValueError("no valid lineup")
+    return states[full]
+
+
+def _record(seconds: float, peak_kib: float, gap: float) -> Dict[str, float]:
+    return {
+        "seconds": round(seconds, 6),
+        "peak_kib": round(peak_kib, 1),
+        "gap": round(gap, 9),
+    }
+
+
+def _solvers(
+    players: Sequence[Dict[str, Any]], slots: Sequence[str]
+) -> Dict[str, Callable[[], float]]:
+    def update() -> float:
+        state = LineupState(players, slots)
+        state.update({players[0]["id"]: 0.0})
+        state.update({players[0]["id"]: players[0]["points"]})
+        return state.lineup[1]
+
+    solvers: Dict[str, Callable[[], float]] = {
+        "optimize_lineup": lambda: optimize_lineup(players, slots)[1],
+        "top_lineups_k5": lambda: top_lineups(players, slots, 5)[0][1],
+        "lineup_state_update": update,
+    }
+    return solvers
+
+
+def run(repeat: int = 3) -> perfbench.Results:
+    """Time every solver on every template and roster size.
+
+    Returns seconds, peak KiB and the optimality gap against :func:`optimum`
+    (and the exhaustive search on the small reference case).
+    """
+
+    results: perfbench.Results = {}
+    cases = [(t, n) for t in TEMPLATES for n in ROSTER_SIZES]
+    for template, size in cases:
+        players = synthetic_roster(template, size, seed=size)
+        slots = TEMPLATES[template]["slots"]
+        best = optimum(players, slots)
+        measured = {
+            name: _measure(fn, repeat) for name, fn in _solvers(players, slots).items()
+        }
+        results[f"{template}-{size}"] = {
+            name: _record(secs, peak, best - total)
+            for name, (secs, peak, total) in measured.items()
+        }
+
+    # The exhaustive backtracker is only tractable on a tiny roster; it
+    # anchors the oracle and the polynomial solver against the true optimum.
+    small = synthetic_roster("standard", 10, seed=0)[:10]
+    slots = ["QB", "RB", "WR", "TE", "W/R/T"]
+    secs, peak, exact = _measure(lambda: optimize_lineup_exhaustive(small, slots)[1], 1)
+    _, _, total = _measure(lambda: optimize_lineup(small, slots)[1], 1)
+    results["reference-10"] = {
+        "optimize_lineup_exhaustive": _record(secs, peak, 0.0),
+        "optimize_lineup": _record(0.0, 0.0, exact - total),
+        "optimum": _record(0.0, 0.0, abs(exact - optimum(small, slots))),
+    }
+    return results
+
+
+def compare(results: perfbench.Results, baseline: Dict[str, Any]) -> List[str]:
+    """Describe every measurement that regressed past the baseline tolerances."""
+
+    return perfbench.compare(results, baseline, gap_message="optimality gap")
+
+
+TOLERANCE = {
+    "time_factor": 5.0,
+    "time_floor_s": 0.05,
+    "memory_factor": 2.0,
+    "memory_floor_kib": 256.0,
+    "gap": 1e-6,
+}
+
+
+if __name__ == "__main__":
+    perfbench.main(__doc__, run, BASELINE_PATH, TOLERANCE, repeat=5)
@@ -0,0 +1,57 @@
+import itertools
+import random
+
+import pytest
+
+from optimizer import AssignmentSolver
+
+
+def _brute_force(weights):
+    rows, cols = len(weights), len(weights[0])
+    best = None
+    for perm in itertools.permutations(range(cols), rows):
+        if any(weights[i][j] is None for i, j in enumerate(perm)):
+            continue
+        total = sum(weights[i][j] for i, j in enumerate(perm))
+        if best is None or total > best:
+            best = total
+    return best
+
+
+def _random_weights(rng, rows, cols):
+    return [
+        [None if rng.random() < 0.3 else rng.randint(-5, 20) for _ in range(cols)]
+        for _ in range(rows)
+    ]
+
+
+def test_solve_matches_brute_force():
+    rng = random.Random(1)
+    for _ in range(100):
+        weights = _random_weights(rng, rng.randint(1, 4), rng.randint(4, 6))
+        expected = _brute_force(weights)
+        solver = AssignmentSolver(weights)
+        if expected is None:
+            with pytest.raises(ValueError):
+                solver.solve()
+            continue
+        cols = solver.solve()
+        assert len(set(cols)) == len(cols)
+        assert solver.total == expected
+
+
+def test_incremental_updates_stay_optimal():
+    rng = random.Random(2)
+    for _ in range(100):
+        weights = [[rng.randint(0, 20) for _ in range(6)] for _ in range(4)]
+        solver = AssignmentSolver(weights)
+        solver.solve()
+        for _ in range(5):
+            i, j = rng.randrange(4), rng.randrange(6)
+            weights[i][j] = None if rng.random() < 0.3 else rng.randint(0, 30)
+            solver.set_weight(i, j, weights[i][j])
+            expected = _brute_force(weights)
+            if expected is None:
+                break
+            solver.solve()
+            assert solver.total == expected
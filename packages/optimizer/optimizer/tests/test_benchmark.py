@@ -0,0 +1,57 @@
+import json
+
+import perfbench
+import pytest
+
+from lineup_benchmark import (
+    BASELINE_PATH,
+    ROSTER_SIZES,
+    TEMPLATES,
+    compare,
+    optimum,
+    run,
+    synthetic_roster,
+)
+from optimizer import optimize_lineup, optimize_lineup_exhaustive
+
+
+@pytest.mark.skipif(not perfbench.enabled(), reason="set RUN_BENCHMARKS=1")
+def test_solvers_within_baseline():
+    baseline = json.loads(BASELINE_PATH.read_text())
+    failures = compare(run(repeat=3), baseline)
+    assert not failures, "\n".join(failures)
+
+
+def test_optimum_matches_exhaustive_search():
+    slots = ["QB", "RB", "WR", "TE", "W/R/T", "W/R/T"]
+    for seed in range(5):
+        players = synthetic_roster("standard", 12, seed=seed)
+        exact = optimize_lineup_exhaustive(players, slots)[1]
+        assert optimum(players, slots) == pytest.approx(exact)
+
+
+@pytest.mark.parametrize("template", sorted(TEMPLATES))
+def test_solver_reaches_optimum(template):
+    slots = TEMPLATES[template]["slots"]
+    for size in ROSTER_SIZES:
+        players = synthetic_roster(template, size, seed=size)
+        total = optimize_lineup(players, slots)[1]
+        assert total == pytest.approx(optimum(players, slots))
+
+
+def test_compare_flags_blowups():
+    baseline = json.loads(BASELINE_PATH.read_text())
+    slow = {
+        case: {
+            name: {**got, "seconds": got["seconds"] * 100 + 1.0}
+            for name, got in solvers.items()
+        }
+        for case, solvers in baseline["cases"].items()
+    }
+    assert len(compare(slow, baseline)) == sum(len(s) for s in slow.values())
+    gap = {
+        "standard-16": {
+            "optimize_lineup": {"seconds": 0.0, "peak_kib": 0.0, "gap": 1.0}
+        }
+    }
+    assert compare(gap, baseline) == ["standard-16/optimize_lineup: optimality gap 1.0"]
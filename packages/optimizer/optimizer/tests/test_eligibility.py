@@ -0,0 +1,71 @@
+import pytest
+
+from optimizer import (
+    compile_roster,
+    optimize_lineup,
+    player_positions,
+    position_mask,
+    slot_mask,
+)
+
+
+def test_compile_roster_yahoo_positions():
+    template = compile_roster(
+        [
+            {"roster_position": {"position": "QB", "count": 1}},
+            {"position": "W/R/T", "count": 1},
+            {"position": "Q/W/R/T", "count": 1},
+            {"position": "D", "count": 2},
+            "DEF",
+            {"position": "BN", "count": 6},
+            {"position": "IR", "count": 1},
+        ]
+    )
+    assert template.slots == ("QB", "W/R/T", "Q/W/R/T", "D", "D", "DEF")
+    assert template.masks[1] == position_mask(["WR", "RB", "TE"])
+    assert template.masks[2] == position_mask(["QB", "WR", "RB", "TE"])
+    assert template.masks[3] == position_mask(["DL", "LB", "DB"])
+
+
+def test_position_aliases():
+    assert position_mask(["DST"]) == slot_mask("DEF")
+    assert position_mask(["CB"]) & slot_mask("DB")
+    assert position_mask(["DE"]) & slot_mask("DL")
+    assert not position_mask(["DE"]) & slot_mask("LB")
+    assert position_mask(["XX"]) == 0
+
+
+def test_player_positions_sources():
+    assert player_positions("RB", {"eligible_positions": ["RB", "WR", "W/R/T", "BN"]})[
+        :2
+    ] == ["RB", "WR"]
+    assert player_positions("WR,RB") == ["WR", "RB"]
+    assert player_positions("RB/WR", {}) == ["RB", "WR"]
+    assert player_positions("D/ST") == ["D/ST"]
+    assert player_positions(None) == []
+    # Yahoo slot codes in eligible positions add no bits.
+    mask = position_mask(
+        player_positions("RB", {"eligible_positions": ["RB", "W/R/T"]})
+    )
+    assert mask == position_mask(["RB"])
+
+
+def test_unknown_slot_raises():
+    with pytest.raises(ValueError):
+        slot_mask("ZZ")
+
+
+def test_superflex_and_idp_lineup():
+    players = [
+        {"id": "qb1", "positions": ["QB"], "points": 22},
+        {"id": "qb2", "positions": ["QB"], "points": 19},
+        {"id": "rb1", "positions": ["RB"], "points": 14},
+        {"id": "wr1", "positions": ["WR"], "points": 12},
+        {"id": "lb1", "positions": ["LB"], "points": 9},
+        {"id": "cb1", "positions": ["CB"], "points": 7},
+        {"id": "de1", "positions": ["DE"], "points": 8},
+    ]
+    slots = ["QB", "W/R/T", "Q/W/R/T", "DB", "D"]
+    lineup, total = optimize_lineup(players, slots)
+    assert lineup == ["qb1", "rb1", "qb2", "cb1", "lb1"]
+    assert total == 22 + 14 + 19 + 7 + 9
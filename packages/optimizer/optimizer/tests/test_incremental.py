@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+from optimizer import LineupState, SlotChange, optimize_lineup
+
+
+def _players():
+    return [
+        {"id": "qb", "positions": ["QB"], "points": 20},
+        {"id": "rb1", "positions": ["RB"], "points": 15},
+        {"id": "rb2", "positions": ["RB"], "points": 12},
+        {"id": "rb3", "positions": ["RB"], "points": 9},
+        {"id": "wr1", "positions": ["WR"], "points": 14},
+        {"id": "wr2", "positions": ["WR"], "points": 11},
+        {"id": "te", "positions": ["TE"], "points": 8},
+    ]
+
+
+SLOTS = ["QB", "RB", "RB", "WR", "TE", "FLEX"]
+
+
+def test_injury_swaps_single_slot():
+    state = LineupState(_players(), SLOTS)
+    assert state.lineup == optimize_lineup(_players(), SLOTS)
+    changes = state.update({"rb1": 0.0})
+    assert changes == [SlotChange(1, "RB", "rb1", "rb3")]
+    ids, total = state.lineup
+    assert "rb1" not in ids
+    assert total == pytest.approx(optimize_lineup(state.players, SLOTS)[1])
+
+
+def test_unchanged_points_report_nothing():
+    state = LineupState(_players(), SLOTS)
+    assert state.update({"rb3": 9, "unknown": 50}) == []
+
+
+def test_random_updates_match_full_solve():
+    rng = random.Random(5)
+    players = _players() + [
+        {
+            "id": f"x{i}",
+            "positions": [rng.choice(["RB", "WR", "TE"])],
+            "points": rng.randint(0, 20),
+        }
+        for i in range(8)
+    ]
+    state = LineupState(players, SLOTS)
+    for _ in range(50):
+        pid = rng.choice(players)["id"]
+        before, _ = state.lineup
+        changes = state.update({pid: rng.randint(0, 30)})
+        ids, total = state.lineup
+        assert total == pytest.approx(optimize_lineup(state.players, SLOTS)[1])
+        assert [c.index for c in changes] == [
+            i for i, (a, b) in enumerate(zip(before, ids)) if a != b
+        ]
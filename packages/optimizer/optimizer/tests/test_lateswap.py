@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from optimizer import game_locks, optimize_late_swap, optimize_lineup
+
+EARLY = datetime(2026, 10, 18, 17, 0)
+LATE = datetime(2026, 10, 18, 20, 25)
+SNF = datetime(2026, 10, 19, 0, 20)
+
+PLAYERS = [
+    {"id": "qb", "positions": ["QB"], "points": 20},
+    {"id": "rb1", "positions": ["RB"], "points": 15},
+    {"id": "rb2", "positions": ["RB"], "points": 12},
+    {"id": "rb3", "positions": ["RB"], "points": 11},
+    {"id": "wr1", "positions": ["WR"], "points": 14},
+    {"id": "wr2", "positions": ["WR"], "points": 10},
+]
+SLOTS = ["QB", "RB", "RB", "WR", "FLEX"]
+KICKOFFS = {
+    "qb": LATE,
+    "rb1": EARLY,
+    "rb2": LATE,
+    "rb3": EARLY,
+    "wr1": SNF,
+    "wr2": LATE,
+}
+
+
+def test_game_locks_splits_starters_and_bench():
+    lineup = ["qb", "rb1", "rb2", "wr1", "rb3"]
+    locked, bench = game_locks(
+        lineup, KICKOFFS, EARLY, [p["id"] for p in PLAYERS] + ["x"]
+    )
+    assert locked == {1: "rb1", 4: "rb3"}
+    assert bench == set()
+    locked, bench = game_locks(
+        ["qb", "rb1", "rb2", "wr1", "wr2"], KICKOFFS, EARLY, ["rb3"]
+    )
+    assert locked == {1: "rb1"}
+    assert bench == {"rb3"}
+
+
+def test_windows_reuse_state_and_respect_locks():
+    # The user started wr2 at FLEX; rb3 kicks off early on the bench.
+    lineup = ["qb", "rb1", "rb2", "wr1", "wr2"]
+    state, ids, total = optimize_late_swap(PLAYERS, SLOTS, lineup, KICKOFFS, EARLY)
+    assert ids[1] == "rb1"
+    assert "rb3" not in ids
+    assert total == 20 + 15 + 12 + 14 + 10
+
+    # Injury news on a late player before the 4pm window.
+    state.update({"rb2": 2.0})
+    state, ids, total = optimize_late_swap(PLAYERS, SLOTS, ids, KICKOFFS, EARLY, state)
+    assert ids == ["qb", "rb1", "rb2", "wr1", "wr2"]
+
+    state, ids, total = optimize_late_swap(PLAYERS, SLOTS, ids, KICKOFFS, LATE, state)
+    assert ids == ["qb", "rb1", "rb2", "wr1", "wr2"]
+    free = [
+        p for p in state.players if p["id"] not in {"qb", "rb1", "rb2", "wr2", "rb3"}
+    ]
+    assert ids[3] == optimize_lineup(free, ["WR"])[0][0]
+
+
+def test_locked_player_stays_in_actual_slot():
+    lineup = ["qb", "rb3", "rb2", "wr1", "rb1"]
+    _, ids, total = optimize_late_swap(PLAYERS, SLOTS, lineup, KICKOFFS, EARLY)
+    assert ids[1] == "rb3" and ids[4] == "rb1"
+    assert total == 20 + 11 + 12 + 14 + 15
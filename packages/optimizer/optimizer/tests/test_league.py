@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+
+from optimizer import optimize_league, optimize_lineup
+
+
+def _league():
+    positions = ["QB", "RB", "RB", "WR", "TE", "RB", "WR"]
+    teams = []
+    pid = 0
+    for team_id in (1, 2, 3):
+        slots = []
+        for pos in positions:
+            pid += 1
+            player = SimpleNamespace(id=pid, position_primary=pos)
+            slots.append(SimpleNamespace(week=1, player=player))
+        slots.append(
+            SimpleNamespace(
+                week=2, player=SimpleNamespace(id=999, position_primary="QB")
+            )
+        )
+        teams.append(SimpleNamespace(id=team_id, roster_slots=slots))
+    roster_positions = [
+        {"roster_position": {"position": "QB", "count": 1}},
+        {"position": "RB", "count": 2},
+        "WR",
+        "FLEX",
+        {"position": "BN", "count": 5},
+    ]
+    return SimpleNamespace(teams=teams, roster_positions=roster_positions)
+
+
+def test_optimize_league_matches_per_team():
+    league = _league()
+    points = {pid: float(pid % 7 + 1) for pid in range(1, 30)}
+    points[999] = 100.0
+    serial = optimize_league(league, 1, points, max_workers=1)
+    pooled = optimize_league(league, 1, points, max_workers=2)
+    assert serial == pooled
+    assert set(serial) == {1, 2, 3}
+    team = league.teams[0]
+    players = [
+        {
+            "id": rs.player.id,
+            "positions": [rs.player.position_primary],
+            "points": points[rs.player.id],
+        }
+        for rs in team.roster_slots
+        if rs.week == 1
+    ]
+    assert serial[1] == optimize_lineup(players, ["QB", "RB", "RB", "WR", "FLEX"])
+
+
+def test_optimize_league_omits_infeasible_teams():
+    league = _league()
+    results = optimize_league(league, 1, {}, roster_slots=["QB", "QB"], max_workers=1)
+    assert results == {}
+
+
+def test_optimize_league_uses_multi_position_eligibility():
+    hybrid = SimpleNamespace(
+        id=1, position_primary="RB", meta={"eligible_positions": ["RB", "WR"]}
+    )
+    split = SimpleNamespace(id=2, position_primary="WR,TE")
+    team = SimpleNamespace(
+        id=1,
+        roster_slots=[SimpleNamespace(week=1, player=p) for p in (hybrid, split)],
+    )
+    league = SimpleNamespace(teams=[team], roster_positions=["WR", "TE"])
+    results = optimize_league(league, 1, {1: 9.0, 2: 6.0}, max_workers=1)
+    assert results == {1: (["1", "2"], 15.0)}
+
+
+def test_optimize_league_explicit_and_fallback_slots():
+    league = _league()
+    points = {pid: float(pid) for pid in range(1, 30)}
+    assert optimize_league(league, 1, points, roster_slots=[], max_workers=1) == {
+        1: ([], 0),
+        2: ([], 0),
+        3: ([], 0),
+    }
+    # Without league roster positions each team fills its own starting slots.
+    league.roster_positions = []
+    for team in league.teams:
+        for rs, slot in zip(team.roster_slots, ["QB", "RB", "BN", "WR", "TE"]):
+            rs.slot, rs.is_starter = slot, slot != "BN"
+        for rs in team.roster_slots[5:]:
+            rs.slot, rs.is_starter = "BN", False
+    results = optimize_league(league, 1, points, max_workers=1)
+    assert results[1] == (["1", "6", "7", "5"], 19.0)
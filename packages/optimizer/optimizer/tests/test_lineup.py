@@ -1,4 +1,10 @@
-from optimizer import optimize_lineup
+import itertools
+import random
+import time
+
+import pytest
+
+from optimizer import optimize_lineup, optimize_lineup_exhaustive, top_lineups
 
 
 def test_optimize_lineup_basic():
@@ -20,6 +26,7 @@ def test_optimize_lineup_basic():
     assert lineup == ["p1", "p2", "p7", "p4", "p5", "p6", "p8", "p10", "p11"]
     assert total == 112
 
+
 def test_optimize_lineup_invalid():
     players = [{"id": "p1", "positions": ["QB"], "points": 20}]
     slots = ["QB", "RB"]
@@ -29,3 +36,91 @@ def test_optimize_lineup_invalid():
         assert True
     else:
         assert False, "expected ValueError"
+
+
+def _random_roster(rng, n_players):
+    positions = ["QB", "RB", "WR", "TE", "DST", "K"]
+    seeded = ["QB", "RB", "RB", "WR", "TE", "DST", "K"]
+    players = []
+    for i in range(n_players):
+        pos = [seeded[i] if i < len(seeded) else rng.choice(positions)]
+        if pos[0] in {"RB", "WR"} and rng.random() < 0.2:
+            pos.append("WR" if pos[0] == "RB" else "RB")
+        players.append(
+            {"id": f"p{i}", "positions": pos, "points": round(rng.uniform(0, 30), 2)}
+        )
+    return players
+
+
+def test_matches_exhaustive_on_random_rosters():
+    rng = random.Random(7)
+    slots = ["QB", "RB", "RB", "WR", "TE", "FLEX"]
+    checked = 0
+    for _ in range(200):
+        players = _random_roster(rng, rng.randint(6, 10))
+        try:
+            expected_ids, expected = optimize_lineup_exhaustive(players, slots)
+        except ValueError:
+            with pytest.raises(ValueError):
+                optimize_lineup(players, slots)
+            continue
+        ids, total = optimize_lineup(players, slots)
+        assert total == pytest.approx(expected)
+        assert len(set(ids)) == len(slots)
+        by_id = {p["id"]: p for p in players}
+        assert sum(by_id[i]["points"] for i in ids) == pytest.approx(total)
+        checked += 1
+    assert checked > 50
+
+
+def test_large_roster_is_fast():
+    rng = random.Random(3)
+    players = _random_roster(rng, 40)
+    slots = ["QB", "RB", "RB", "WR", "WR", "TE", "FLEX", "FLEX", "DST", "K"]
+    start = time.perf_counter()
+    ids, _ = optimize_lineup(players, slots)
+    assert time.perf_counter() - start < 1.0
+    assert len(ids) == len(slots)
+
+
+def _all_lineup_totals(players, slots):
+    seen = {}
+    for perm in itertools.permutations(range(len(players)), len(slots)):
+        lineup = [players[i] for i in perm]
+        if not all(
+            (
+                {"RB", "WR", "TE"} & set(p["positions"])
+                if s == "FLEX"
+                else s in p["positions"]
+            )
+            for s, p in zip(slots, lineup)
+        ):
+            continue
+        key = frozenset((s, p["id"]) for s, p in zip(slots, lineup))
+        seen[key] = sum(p["points"] for p in lineup)
+    return sorted(seen.values(), reverse=True)
+
+
+def test_top_lineups_matches_enumeration():
+    rng = random.Random(11)
+    slots = ["QB", "RB", "RB", "WR", "FLEX"]
+    for _ in range(30):
+        players = _random_roster(rng, 8)
+        expected = _all_lineup_totals(players, slots)[:5]
+        alts = top_lineups(players, slots, k=5)
+        assert [t for _, t in alts] == pytest.approx(expected)
+        assert len({tuple(ids) for ids, _ in alts}) == len(alts)
+
+
+def test_top_lineups_first_is_optimal():
+    players = [
+        {"id": "p1", "positions": ["QB"], "points": 20},
+        {"id": "p2", "positions": ["QB"], "points": 18},
+        {"id": "p3", "positions": ["RB"], "points": 12},
+        {"id": "p4", "positions": ["RB"], "points": 10},
+        {"id": "p5", "positions": ["RB"], "points": 4},
+    ]
+    slots = ["QB", "RB", "RB"]
+    alts = top_lineups(players, slots, k=10)
+    assert alts[0] == optimize_lineup(players, slots)
+    assert [t for _, t in alts] == [42, 40, 36, 34, 34, 32]
@@ -0,0 +1,92 @@
+import numpy as np
+import perfbench
+import pytest
+
+from lineup_benchmark import TEMPLATES, synthetic_roster
+from optimizer import (
+    optimize_win_probability,
+    simulate_points,
+    team_correlation,
+    win_probability,
+)
+
+
+def test_underdog_prefers_variance():
+    players = [
+        {"id": "safe", "positions": ["WR"], "points": 20, "variance": 0.0},
+        {"id": "boom", "positions": ["WR"], "points": 18, "variance": 100.0},
+    ]
+    opponent = [{"id": "opp", "positions": ["WR"], "points": 30, "variance": 0.0}]
+    lineup, prob = optimize_win_probability(players, ["WR"], opponent, seed=1)
+    assert lineup == ["boom"]
+    assert 0.05 < prob < 0.2
+
+
+def test_favorite_prefers_floor():
+    players = [
+        {"id": "safe", "positions": ["WR"], "points": 20, "variance": 0.0},
+        {"id": "boom", "positions": ["WR"], "points": 21, "variance": 100.0},
+    ]
+    opponent = [{"id": "opp", "positions": ["WR"], "points": 15, "variance": 0.0}]
+    lineup, prob = optimize_win_probability(players, ["WR"], opponent, seed=1)
+    assert lineup == ["safe"]
+    assert prob == 1.0
+
+
+def test_team_correlation_links_teammates():
+    corr = team_correlation(["KC", "KC", None, "BUF"], rho=0.3)
+    assert corr[0, 1] == corr[1, 0] == 0.3
+    assert corr[0, 2] == corr[2, 3] == 0.0
+    assert np.all(np.diag(corr) == 1.0)
+    samples = simulate_points([10, 10, 10, 10], [25, 25, 25, 25], 50000, corr, seed=0)
+    observed = np.corrcoef(samples.T)
+    assert observed[0, 1] == pytest.approx(0.3, abs=0.03)
+    assert abs(observed[0, 3]) < 0.03
+
+
+def test_win_probability_reuses_draws_across_candidates():
+    samples = np.array([[1.0, 5.0], [3.0, 2.0], [4.0, 0.0], [2.0, 2.0]])
+    selection = np.array([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+    opponent = np.array([2.0, 2.0, 2.0, 2.0])
+    probs = win_probability(samples, selection, opponent)
+    assert probs.tolist() == [0.625, 0.5, 1.0]
+
+
+def _longshot_roster():
+    # Nineteen steady receivers can never catch the opponent; only lineups
+    # with the boom-or-bust one can, and they rank below all 969 steady ones.
+    steady = [
+        {"id": f"s{i}", "positions": ["WR"], "points": 10 + 0.01 * i, "variance": 0.0}
+        for i in range(19)
+    ]
+    boom = {"id": "boom", "positions": ["WR"], "points": 0.0, "variance": 10000.0}
+    opponent = [
+        {"id": f"o{i}", "positions": ["WR"], "points": 20, "variance": 0.0}
+        for i in range(3)
+    ]
+    return steady + [boom], opponent
+
+
+def test_default_candidates_reach_low_ranked_lineups():
+    players, opponent = _longshot_roster()
+    slots = ["WR", "WR", "WR"]
+    _, shallow = optimize_win_probability(
+        players, slots, opponent, n_candidates=200, seed=1
+    )
+    lineup, prob = optimize_win_probability(players, slots, opponent, seed=1)
+    assert shallow == 0.0
+    assert "boom" in lineup and prob > 0.2
+
+
+@pytest.mark.skipif(not perfbench.enabled(), reason="set RUN_BENCHMARKS=1")
+def test_default_candidates_stay_fast():
+    for template, size in (("standard", 16), ("idp", 28)):
+        slots = TEMPLATES[template]["slots"]
+        players = synthetic_roster(template, size, seed=1)
+        opponent = synthetic_roster(template, size, seed=2)
+        for p in players + opponent:
+            p["variance"] = 0.4 * p["points"]
+        seconds, _ = perfbench.best_of(
+            lambda: optimize_win_probability(players, slots, opponent, seed=1), 3
+        )
+        assert seconds < 2.0, f"{template}-{size}: {seconds:.2f}s"
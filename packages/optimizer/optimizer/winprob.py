@@ -0,0 +1,129 @@
+"""Lineup selection by simulated probability of beating an opponent."""
+
+from __future__ import annotations
+
+from typing import Any, List, Optional, Sequence, Tuple, cast
+
+import numpy as np
+
+from .lineup import Player, optimize_lineup, top_lineups
+
+# Upper bound on the samples x candidates block scored at once.
+_BLOCK_ELEMENTS = 1 << 22
+
+
+def team_correlation(teams: Sequence[Optional[str]], rho: float = 0.2) -> np.ndarray:
+    """Correlation matrix linking players from the same NFL team by ``rho``."""
+
+    labels = np.array([t or "" for t in teams], dtype=object)
+    same = (labels[:, None] == labels[None, :]) & (labels[:, None] != "")
+    corr = np.where(same, rho, 0.0)
+    np.fill_diagonal(corr, 1.0)
+    return corr
+
+
+def _cholesky(corr: np.ndarray) -> np.ndarray:
+    try:
+        return np.linalg.cholesky(corr)
+    except np.linalg.LinAlgError:
+        # Clip to the nearest positive definite matrix with a unit diagonal.
+        vals, vecs = np.linalg.eigh(corr)
+        fixed = (vecs * np.clip(vals, 1e-9, None)) @ vecs.T
+        d = np.sqrt(np.diag(fixed))
+        return np.linalg.cholesky(fixed / np.outer(d, d))
+
+
+def simulate_points(
+    means: Sequence[float],
+    variances: Sequence[float],
+    n_samples: int,
+    correlation: Optional[np.ndarray] = None,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """Draw ``n_samples x players`` normal fantasy point outcomes."""
+
+    mu = np.asarray(means, dtype=float)
+    std = np.sqrt(np.clip(np.asarray(variances, dtype=float), 0.0, None))
+    rng = np.random.default_rng(seed)
+    z = rng.standard_normal((n_samples, mu.size))
+    if correlation is not None:
+        z = z @ _cholesky(np.asarray(correlation, dtype=float)).T
+    return mu + z * std
+
+
+def win_probability(
+    samples: np.ndarray, selection: np.ndarray, opponent_totals: np.ndarray
+) -> np.ndarray:
+    """Probability that each candidate beats the opponent, ties counting half.
+
+    Parameters
+    ----------
+    samples: np.ndarray
+        ``n_samples x players`` simulated points, shared by every candidate.
+    selection: np.ndarray
+        ``candidates x players`` 0/1 matrix of the players each lineup starts.
+    opponent_totals: np.ndarray
+        Opponent lineup total for each sample.
+    """
+
+    # Scored in float32 blocks: halves memory traffic of the samples x
+    # candidates totals, which dominate the cost.
+    n_samples = samples.shape[0]
+    block = max(1, _BLOCK_ELEMENTS // max(n_samples, 1))
+    draws = np.ascontiguousarray(samples, dtype=np.float32)
+    chosen = selection.astype(np.float32)
+    opp = np.asarray(opponent_totals, dtype=np.float32)[:, None]
+    out = np.empty(selection.shape[0])
+    for start in range(0, selection.shape[0], block):
+        totals = draws @ chosen[start : start + block].T
+        out[start : start + block] = (
+            np.count_nonzero(totals > opp, axis=0)
+            + 0.5 * np.count_nonzero(totals == opp, axis=0)
+        ) / n_samples
+    return out
+
+
+def optimize_win_probability(
+    players: Sequence[Player],
+    roster_slots: Sequence[str],
+    opponent: Sequence[Player],
+    n_candidates: int = 2000,
+    n_samples: int = 20000,
+    rho: float = 0.2,
+    seed: Optional[int] = None,
+) -> Tuple[List[str], float]:
+    """Return the lineup most likely to outscore the opponent's projected lineup.
+
+    Candidates are the ``n_candidates`` best lineups by projected points from
+    :func:`top_lineups`; the default reaches an underdog's high-variance
+    lineups ranked well below the mean-optimal ones, at well under a second
+    for an IDP roster. Every player's points are drawn once from a normal
+    with the player's ``variance``, correlated by ``rho`` between players
+    sharing a ``team``, and the same draws score all candidates and the
+    opponent's mean-optimal lineup.
+
+    Returns
+    -------
+    Tuple[List[str], float]
+        Player ids in ``roster_slots`` order and the estimated win probability.
+    """
+
+    opp_ids, _ = optimize_lineup(opponent, roster_slots)
+    candidates = top_lineups(players, roster_slots, n_candidates)
+
+    starters = set(opp_ids)
+    pool = list(players) + [p for p in opponent if str(p.get("id")) in starters]
+    means = [float(cast(Any, p.get("points", 0))) for p in pool]
+    variances = [float(cast(Any, p.get("variance") or 0)) for p in pool]
+    corr = team_correlation([cast(Optional[str], p.get("team")) for p in pool], rho)
+    samples = simulate_points(means, variances, n_samples, corr, seed)
+
+    n_own = len(players)
+    index = {str(p.get("id")): i for i, p in enumerate(players)}
+    selection = np.zeros((len(candidates), n_own))
+    for row, (ids, _) in enumerate(candidates):
+        selection[row, [index[i] for i in ids]] = 1.0
+    opponent_totals = samples[:, n_own:].sum(axis=1)
+    probs = win_probability(samples[:, :n_own], selection, opponent_totals)
+    best = int(np.argmax(probs))
+    return candidates[best][0], float(probs[best])
@@ -0,0 +1,126 @@
+"""Shared harness for the packages' timing benchmarks.
+
+A benchmark script times its cases with :func:`best_of` (and
+:func:`peak_kib`), returning ``{case: {name: measurement}}`` where every
+measurement has ``seconds`` and optionally ``peak_kib`` and ``gap``. Accepted
+numbers live with their tolerances in a ``benchmark_baseline.json`` next to
+the script, refreshed by running it with ``--write`` (see :func:`main`).
+
+Wall-clock checks against a baseline depend on the machine, so tests that
+run them are opt-in: they skip unless ``RUN_BENCHMARKS`` is set.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Results = Dict[str, Dict[str, Dict[str, float]]]
+
+ENV_FLAG = "RUN_BENCHMARKS"
+
+
+def enabled() -> bool:
+    """Whether timing benchmarks were asked for via ``RUN_BENCHMARKS``."""
+
+    return os.getenv(ENV_FLAG, "") not in ("", "0")
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    """Fastest of ``repeat`` calls in seconds, and the last call's result."""
+
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def peak_kib(fn: Callable[[], Any]) -> float:
+    """Peak Python heap allocated during one call, in KiB."""
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def compare(
+    results: Results,
+    baseline: Dict[str, Any],
+    gap_allowed: Optional[Callable[[str], float]] = None,
+    gap_message: str = "gap",
+) -> List[str]:
+    """Describe every measurement that regressed past the baseline tolerances.
+
+    Time is allowed ``time_factor`` times the baseline or ``time_floor_s``
+    on top of it, whichever is larger. Memory is checked where both the
+    baseline and tolerances have it. A ``gap`` may not exceed
+    ``gap_allowed(name)``, by default ``tolerance.gap``.
+    """
+
+    tol = baseline["tolerance"]
+    failures = []
+    for case, measured in results.items():
+        for name, got in measured.items():
+            ref = baseline["cases"].get(case, {}).get(name)
+            if ref is None:
+                failures.append(f"{case}/{name}: missing from baseline")
+                continue
+            limit = max(
+                ref["seconds"] * tol["time_factor"],
+                ref["seconds"] + tol["time_floor_s"],
+            )
+            if got["seconds"] > limit:
+                failures.append(f"{case}/{name}: {got['seconds']:.4f}s > {limit:.4f}s")
+            if "peak_kib" in ref and "memory_factor" in tol:
+                mem_limit = (
+                    ref["peak_kib"] * tol["memory_factor"] + tol["memory_floor_kib"]
+                )
+                if got["peak_kib"] > mem_limit:
+                    failures.append(
+                        f"{case}/{name}: {got['peak_kib']:.0f}KiB > {mem_limit:.0f}KiB"
+                    )
+            if "gap" in got:
+                allowed = gap_allowed(name) if gap_allowed else tol["gap"]
+                if got["gap"] > allowed:
+                    failures.append(f"{case}/{name}: {gap_message} {got['gap']}")
+    return failures
+
+
+def main(
+    doc: Optional[str],
+    run: Callable[[int], Results],
+    baseline_path: Path,
+    tolerance: Dict[str, float],
+    extra: Optional[Callable[[], Dict[str, Any]]] = None,
+    repeat: int = 3,
+) -> None:
+    """Command line entry point of a benchmark script.
+
+    Prints ``run(--repeat)`` as JSON; ``--write`` stores it as the new
+    baseline together with ``extra()``. Tolerances already in the baseline
+    are kept, ``tolerance`` only seeds a new one.
+    """
+
+    parser = argparse.ArgumentParser(description=doc)
+    parser.add_argument("--write", action="store_true", help="overwrite the baseline")
+    parser.add_argument("--repeat", type=int, default=repeat)
+    args = parser.parse_args()
+    results = run(args.repeat)
+    if args.write:
+        baseline = {"tolerance": tolerance, **(extra() if extra else {})}
+        baseline["cases"] = results
+        if baseline_path.exists():
+            baseline["tolerance"] = json.loads(baseline_path.read_text())["tolerance"]
+        baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+    print(json.dumps(results, indent=2, sort_keys=True))
@@ -1,3 +1,69 @@
-from .estimators import project_offense
+from .baselines import (
+    COUNTERS,
+    WeeklyCounts,
+    aggregate_player_stats,
+    aggregate_plays,
+    compute_baselines,
+)
+from .estimators import (
+    DEFENSE_METRICS,
+    ESTIMATORS,
+    IDP_METRICS,
+    KICKER_METRICS,
+    OFFENSE_METRICS,
+    PoolProjection,
+    baseline_matrix,
+    project_defense_batch,
+    project_idp_batch,
+    project_kicker_batch,
+    project_offense,
+    project_offense_batch,
+    project_pool,
+)
+from .horizons import (
+    LAST_WEEK,
+    HorizonProjection,
+    bye_mask,
+    project_horizons,
+    project_offense_horizons,
+)
+from .sharding import (
+    SHARD_PLAYERS,
+    project_horizons_sharded,
+    project_pool_sharded,
+    shard_indices,
+)
+from .simulation import SKETCH_LEVELS, SimulationResult, simulate_offense
 
-__all__ = ["project_offense"]
+__all__ = [
+    "COUNTERS",
+    "WeeklyCounts",
+    "aggregate_player_stats",
+    "aggregate_plays",
+    "compute_baselines",
+    "DEFENSE_METRICS",
+    "ESTIMATORS",
+    "IDP_METRICS",
+    "KICKER_METRICS",
+    "OFFENSE_METRICS",
+    "PoolProjection",
+    "baseline_matrix",
+    "project_defense_batch",
+    "project_idp_batch",
+    "project_kicker_batch",
+    "project_offense",
+    "project_offense_batch",
+    "project_pool",
+    "LAST_WEEK",
+    "HorizonProjection",
+    "bye_mask",
+    "project_horizons",
+    "project_offense_horizons",
+    "SHARD_PLAYERS",
+    "project_horizons_sharded",
+    "project_pool_sharded",
+    "shard_indices",
+    "SKETCH_LEVELS",
+    "SimulationResult",
+    "simulate_offense",
+]
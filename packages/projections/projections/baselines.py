@@ -0,0 +1,292 @@
+"""Baseline metrics from nflverse play-by-play and weekly player stats.
+
+Plays (or weekly stat rows) are reduced to per-player, per-week counters
+with vectorized group-bys. Counters are additive, so a season is built up
+one week at a time and the rate metrics :func:`project_offense` reads are
+derived from recency-weighted sums of them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .estimators import OFFENSE_METRICS
+
+# Per player-week counters. ``proe_sum``/``proe_plays`` accumulate the pass
+# rate over expectation of the player's team on the plays of that week.
+COUNTERS = (
+    "games",
+    "pass_att",
+    "comp",
+    "pass_yds",
+    "pass_td",
+    "int",
+    "rush_att",
+    "rush_yds",
+    "rush_td",
+    "targets",
+    "rec",
+    "rec_yds",
+    "rec_td",
+    "proe_sum",
+    "proe_plays",
+)
+_C = {name: i for i, name in enumerate(COUNTERS)}
+
+# metric: (numerator counter, denominator counter)
+RATES: Dict[str, Tuple[str, str]] = {
+    "pass_attempts": ("pass_att", "games"),
+    "comp_rate": ("comp", "pass_att"),
+    "yards_per_attempt": ("pass_yds", "pass_att"),
+    "td_rate": ("pass_td", "pass_att"),
+    "int_rate": ("int", "pass_att"),
+    "rush_attempts": ("rush_att", "games"),
+    "yards_per_rush": ("rush_yds", "rush_att"),
+    "rush_td_rate": ("rush_td", "rush_att"),
+    "targets": ("targets", "games"),
+    "catch_rate": ("rec", "targets"),
+    "yards_per_rec": ("rec_yds", "rec"),
+    "rec_td_rate": ("rec_td", "rec"),
+    "proe": ("proe_sum", "proe_plays"),
+}
+
+# Efficiency rates are shrunk toward the estimator defaults as if this many
+# weighted attempts at the default rate had been seen; volume metrics are
+# taken as observed.
+PRIOR_WEIGHT = 10.0
+_VOLUME = {"pass_attempts", "rush_attempts", "targets", "proe"}
+
+# Weight of a week halves every ``HALF_LIFE_WEEKS`` weeks before the latest.
+HALF_LIFE_WEEKS = 4.0
+
+# Weekly player-stat columns feeding each counter.
+PLAYER_STAT_COLUMNS = {
+    "pass_att": "attempts",
+    "comp": "completions",
+    "pass_yds": "passing_yards",
+    "pass_td": "passing_tds",
+    "int": "interceptions",
+    "rush_att": "carries",
+    "rush_yds": "rushing_yards",
+    "rush_td": "rushing_tds",
+    "targets": "targets",
+    "rec": "receptions",
+    "rec_yds": "receiving_yards",
+    "rec_td": "receiving_tds",
+}
+
+
+@dataclass(frozen=True, eq=False)
+class WeeklyCounts:
+    """Counters for every (player, week) pair, one row per pair."""
+
+    ids: np.ndarray
+    weeks: np.ndarray
+    counts: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "WeeklyCounts":
+        return cls(
+            np.zeros(0, dtype=str), np.zeros(0, dtype=int), np.zeros((0, len(COUNTERS)))
+        )
+
+    def __len__(self) -> int:
+        return self.ids.shape[0]
+
+    @property
+    def last_week(self) -> int:
+        return int(self.weeks.max()) if len(self) else 0
+
+    def before(self, week: int) -> "WeeklyCounts":
+        """Rows for weeks before ``week``."""
+
+        keep = self.weeks < week
+        return WeeklyCounts(self.ids[keep], self.weeks[keep], self.counts[keep])
+
+    def merge(self, other: "WeeklyCounts") -> "WeeklyCounts":
+        """Sum two sets of counters, e.g. the stored season and a new week."""
+
+        return _group(
+            np.concatenate([self.ids.astype(str), other.ids.astype(str)]),
+            np.concatenate([self.weeks, other.weeks]),
+            np.concatenate([self.counts, other.counts]),
+        )
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            np.savez(f, ids=self.ids.astype(str), weeks=self.weeks, counts=self.counts)
+
+    @classmethod
+    def load(cls, path: Path) -> "WeeklyCounts":
+        if not path.exists():
+            return cls.empty()
+        with np.load(path) as data:
+            return cls(data["ids"], data["weeks"], data["counts"])
+
+
+def _group(ids: np.ndarray, weeks: np.ndarray, values: np.ndarray) -> WeeklyCounts:
+    # Sum rows sharing a (player, week) key with one bincount per counter.
+    if ids.size == 0:
+        return WeeklyCounts.empty()
+    players, codes = np.unique(ids, return_inverse=True)
+    span = int(weeks.max()) + 1
+    keys, rows = np.unique(codes * span + weeks, return_inverse=True)
+    counts = np.column_stack(
+        [
+            np.bincount(rows, weights=values[:, j], minlength=keys.size)
+            for j in range(values.shape[1])
+        ]
+    )
+    # Each row is one player-week, i.e. one game played.
+    counts[:, _C["games"]] = 1
+    return WeeklyCounts(players[keys // span], (keys % span).astype(int), counts)
+
+
+def _num(values: Sequence[str]) -> np.ndarray:
+    # nflverse writes missing numbers as "NA" or leaves them empty.
+    raw = np.asarray(values, dtype=str)
+    raw = np.where(np.isin(raw, ["", "NA", "None"]), "nan", raw)
+    return np.nan_to_num(raw.astype(float))
+
+
+def aggregate_plays(columns: Mapping[str, Sequence[str]]) -> WeeklyCounts:
+    """Reduce play-by-play columns to per player-week counters.
+
+    ``columns`` maps nflverse pbp column names (``week``, ``posteam``,
+    ``passer_player_id``, ``pass_attempt``, ``sack``, ``complete_pass``, ...)
+    to raw string values, one per play. Passers, rushers and receivers are
+    credited from the same play.
+    """
+
+    week = _num(columns["week"]).astype(int)
+    if week.size == 0:
+        return WeeklyCounts.empty()
+    team = np.asarray(columns["posteam"], dtype=str)
+    passer = np.asarray(columns["passer_player_id"], dtype=str)
+    rusher = np.asarray(columns["rusher_player_id"], dtype=str)
+    receiver = np.asarray(columns["receiver_player_id"], dtype=str)
+    # Sacks count as pass plays in nflverse but not as attempts.
+    attempt = (_num(columns["pass_attempt"]) > 0) & (_num(columns["sack"]) == 0)
+    complete = _num(columns["complete_pass"])
+    pass_td = _num(columns["pass_touchdown"])
+    rush = _num(columns["rush_attempt"]) > 0
+
+    # Team pass rate over expectation per week, credited to everyone who
+    # touched the ball for that team that week.
+    pass_oe_raw = np.asarray(columns["pass_oe"], dtype=str)
+    has_oe = ~np.isin(pass_oe_raw, ["", "NA"])
+    team_keys, team_rows = np.unique(
+        np.char.add(np.char.add(team, "|"), week.astype(str)), return_inverse=True
+    )
+    oe_sum = np.bincount(
+        team_rows, weights=_num(pass_oe_raw) / 100, minlength=team_keys.size
+    )
+    oe_plays = np.bincount(team_rows, weights=has_oe, minlength=team_keys.size)
+
+    parts = []
+    for ids, mask, fill in (
+        (
+            passer,
+            attempt & ~np.isin(passer, ["", "NA"]),
+            {
+                "pass_att": 1,
+                "comp": complete,
+                "pass_yds": _num(columns["passing_yards"]),
+                "pass_td": pass_td,
+                "int": _num(columns["interception"]),
+            },
+        ),
+        (
+            rusher,
+            rush & ~np.isin(rusher, ["", "NA"]),
+            {
+                "rush_att": 1,
+                "rush_yds": _num(columns["rushing_yards"]),
+                "rush_td": _num(columns["rush_touchdown"]),
+            },
+        ),
+        (
+            receiver,
+            attempt & ~np.isin(receiver, ["", "NA"]),
+            {
+                "targets": 1,
+                "rec": complete,
+                "rec_yds": _num(columns["receiving_yards"]),
+                "rec_td": pass_td,
+            },
+        ),
+    ):
+        rows = np.flatnonzero(mask)
+        values = np.zeros((rows.size, len(COUNTERS)))
+        for name, value in fill.items():
+            values[:, _C[name]] = value if np.isscalar(value) else value[rows]
+        parts.append((ids[rows], week[rows], team_rows[rows], values))
+
+    ids = np.concatenate([p[0] for p in parts])
+    weeks = np.concatenate([p[1] for p in parts])
+    team_of = np.concatenate([p[2] for p in parts])
+    values = np.concatenate([p[3] for p in parts])
+    grouped = _group(ids, weeks, values)
+    # A player's team that week is the team of any of their plays; the keys
+    # sort exactly like the grouped rows, so take each key's first play.
+    _, codes = np.unique(ids, return_inverse=True)
+    span = int(weeks.max()) + 1 if weeks.size else 1
+    _, first = np.unique(codes * span + weeks, return_index=True)
+    grouped.counts[:, _C["proe_sum"]] = oe_sum[team_of[first]]
+    grouped.counts[:, _C["proe_plays"]] = oe_plays[team_of[first]]
+    return grouped
+
+
+def aggregate_player_stats(columns: Mapping[str, Sequence[str]]) -> WeeklyCounts:
+    """Per player-week counters from nflverse weekly ``player_stats`` rows."""
+
+    ids = np.asarray(columns["player_id"], dtype=str)
+    week = _num(columns["week"]).astype(int)
+    values = np.zeros((ids.size, len(COUNTERS)))
+    for counter, column in PLAYER_STAT_COLUMNS.items():
+        if column in columns:
+            values[:, _C[counter]] = _num(columns[column])
+    keep = ~np.isin(ids, ["", "NA"])
+    return _group(ids[keep], week[keep], values[keep])
+
+
+def compute_baselines(
+    counts: WeeklyCounts,
+    half_life: float = HALF_LIFE_WEEKS,
+    defaults: Mapping[str, float] = OFFENSE_METRICS,
+) -> Dict[str, Dict[str, float]]:
+    """Recency-weighted baseline metrics per player id.
+
+    A metric is only produced for players with a non-zero denominator, so
+    e.g. a wide receiver gets no passing rates.
+    """
+
+    if not len(counts):
+        return {}
+    weight = 0.5 ** ((counts.last_week - counts.weeks) / half_life)
+    players, rows = np.unique(counts.ids.astype(str), return_inverse=True)
+    sums = np.column_stack(
+        [
+            np.bincount(
+                rows, weights=counts.counts[:, j] * weight, minlength=players.size
+            )
+            for j in range(len(COUNTERS))
+        ]
+    )
+    out: Dict[str, Dict[str, float]] = {pid: {} for pid in players.tolist()}
+    for metric, (num, den) in RATES.items():
+        n, d = sums[:, _C[num]], sums[:, _C[den]]
+        present = d > 0
+        if metric in _VOLUME:
+            value = np.divide(n, d, out=np.zeros_like(n), where=present)
+        else:
+            prior = defaults.get(metric, 0.0)
+            value = (n + PRIOR_WEIGHT * prior) / (d + PRIOR_WEIGHT)
+        for i in np.flatnonzero(present).tolist():
+            out[players[i]][metric] = round(float(value[i]), 4)
+    return out
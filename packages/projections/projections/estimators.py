@@ -2,20 +2,104 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict
-from typing import Dict, Tuple
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Tuple
 
-from scoring import OffenseStatline, offense_points
+import numpy as np
+
+from scoring import (
+    DEFENSE_COLUMNS,
+    IDP_COLUMNS,
+    KICKER_COLUMNS,
+    DefenseStatline,
+    IDPStatline,
+    KickerStatline,
+    OFFENSE_COLUMNS,
+    OffenseStatline,
+    StatlineBatch,
+    defense_points_batch,
+    idp_points_batch,
+    kicker_points_batch,
+    offense_points,
+    offense_points_batch,
+    scoring_kind,
+)
+
+# Baseline metrics read by the offense estimator, in baseline-matrix column
+# order, with the value used when a player has no baseline for it.
+OFFENSE_METRICS: Dict[str, float] = {
+    "pass_attempts": 0,
+    "comp_rate": 0.65,
+    "yards_per_attempt": 7,
+    "td_rate": 0.05,
+    "int_rate": 0.02,
+    "rush_attempts": 0,
+    "yards_per_rush": 4,
+    "rush_td_rate": 0.02,
+    "targets": 0,
+    "catch_rate": 0.6,
+    "yards_per_rec": 10,
+    "rec_td_rate": 0.05,
+}
+
+# Kickers and team defenses play every week, so their defaults are league
+# averages; an IDP player without baselines projects to nothing, like an
+# offensive player.
+KICKER_METRICS: Dict[str, float] = {
+    "fg_attempts": 1.8,
+    "fg_share_0_39": 0.55,
+    "fg_share_40_49": 0.28,
+    "fg_share_50_59": 0.16,
+    "fg_share_60": 0.01,
+    "fg_pct_0_39": 0.95,
+    "fg_pct_40_49": 0.85,
+    "fg_pct_50_59": 0.7,
+    "fg_pct_60": 0.4,
+    "pat_attempts": 2.3,
+    "pat_pct": 0.95,
+}
+
+DEFENSE_METRICS: Dict[str, float] = {
+    "sacks": 2.3,
+    "interceptions": 0.8,
+    "fumble_recoveries": 0.6,
+    "safeties": 0.05,
+    "def_tds": 0.15,
+    "blocked_kicks": 0.1,
+    "points_allowed": 22,
+    "return_yards": 0,
+    "return_tds": 0.05,
+}
+
+IDP_METRICS: Dict[str, float] = {
+    "solo_tackles": 0,
+    "assisted_tackles": 0,
+    "sacks": 0,
+    "interceptions": 0,
+    "forced_fumbles": 0,
+    "fumble_recoveries": 0,
+    "safeties": 0,
+    "def_tds": 0,
+    "passes_defended": 0,
+    "return_yards": 0,
+    "return_tds": 0,
+}
 
 
 def project_offense(
-    baselines: Dict[str, float], proe: float, waf: float
-) -> Tuple[Dict[str, float], float, float]:
+    baselines: Dict[str, float],
+    proe: float,
+    waf: float,
+    n_samples: int = 0,
+    seed: int = 0,
+) -> Tuple[Dict[str, Any], float, float]:
     """Project an offensive statline.
 
     Returns a tuple of (category breakdown, projected points, variance).
-    The variance is a naive estimate set to 10% of the projected points to
-    provide downstream consumers with a measure of uncertainty.
+    Without ``n_samples`` the variance is a naive estimate set to 10% of the
+    projected points. With ``n_samples`` the statline is simulated (see
+    :func:`simulate_offense`): the variance is that of the simulated points
+    and the breakdown gains their ``p10``/``p50``/``p90`` and ``sketch``.
     """
     pass_att = baselines.get("pass_attempts", 0) * (1 + proe) * waf
     comp_rate = baselines.get("comp_rate", 0.65)
@@ -47,5 +131,226 @@ def project_offense(
         RecTD=rec_td,
     )
     points = offense_points(stat)
+    categories: Dict[str, Any] = stat.to_dict()
+    if not n_samples:
+        return categories, points, points * 0.1
+
+    from .simulation import simulate_offense
+
+    sim = simulate_offense(
+        baseline_matrix([baselines]), proe, waf, n_samples=n_samples, seed=seed
+    )
+    categories.update(sim.summary(0))
+    return categories, points, float(sim.variance[0])
+
+
+def baseline_matrix(
+    baselines: Iterable[Mapping[str, float]],
+    metrics: Mapping[str, float] = OFFENSE_METRICS,
+) -> np.ndarray:
+    """Stack per-player baseline dicts into a ``players x metrics`` array.
+
+    Missing metrics take their default from ``metrics``.
+    """
+    defaults = list(metrics.items())
+    rows = [[b.get(name, default) for name, default in defaults] for b in baselines]
+    return np.array(rows, dtype=float).reshape(len(rows), len(defaults))
+
+
+def _pool(
+    baselines: np.ndarray, proe: Any, waf: Any, metrics: Mapping[str, float]
+) -> Tuple[Dict[str, np.ndarray], int, np.ndarray, np.ndarray]:
+    # Validate a players x metrics matrix; returns its columns by metric name
+    # and per-player proe and waf.
+    b = np.asarray(baselines, dtype=float)
+    if b.ndim != 2 or b.shape[1] != len(metrics):
+        raise ValueError(
+            f"expected a players x {len(metrics)} baseline matrix, got {b.shape}"
+        )
+    n = b.shape[0]
+    return (
+        dict(zip(metrics, b.T)),
+        n,
+        np.broadcast_to(np.asarray(proe, dtype=float), (n,)),
+        np.broadcast_to(np.asarray(waf, dtype=float), (n,)),
+    )
+
+
+def project_offense_batch(
+    baselines: np.ndarray, proe: np.ndarray, waf: np.ndarray
+) -> Tuple[StatlineBatch, np.ndarray, np.ndarray]:
+    """Vectorized :func:`project_offense` for a whole player pool.
+
+    ``baselines`` is a ``players x OFFENSE_METRICS`` matrix (see
+    :func:`baseline_matrix`); ``proe`` and ``waf`` hold one value per player.
+    Returns the projected statlines, points and variance, matching
+    :func:`project_offense` player for player.
+    """
+    metric, n, proe, waf = _pool(baselines, proe, waf, OFFENSE_METRICS)
+
+    pass_att = metric["pass_attempts"] * (1 + proe) * waf
+    completions = pass_att * metric["comp_rate"]
+    rush_att = metric["rush_attempts"] * waf
+    targets = metric["targets"] * (1 + proe) * waf
+    receptions = targets * metric["catch_rate"]
+
+    stats = StatlineBatch(OffenseStatline, np.zeros((n, len(OFFENSE_COLUMNS))))
+    stats.Comp[:] = completions
+    stats.Incomp[:] = np.maximum(pass_att - completions, 0)
+    stats.PassYds[:] = pass_att * metric["yards_per_attempt"] * waf
+    stats.PassTD[:] = pass_att * metric["td_rate"]
+    stats.INT[:] = pass_att * metric["int_rate"]
+    stats.RushYds[:] = rush_att * metric["yards_per_rush"]
+    stats.RushTD[:] = rush_att * metric["rush_td_rate"]
+    stats.Rec[:] = receptions
+    stats.RecYds[:] = receptions * metric["yards_per_rec"] * waf
+    stats.RecTD[:] = receptions * metric["rec_td_rate"]
+
+    points = offense_points_batch(stats.values)
     variance = points * 0.1
-    return asdict(stat), points, variance
+    return stats, points, variance
+
+
+def project_kicker_batch(
+    baselines: np.ndarray, proe: Any, waf: Any
+) -> Tuple[StatlineBatch, np.ndarray, np.ndarray]:
+    """Project kickers from a ``players x KICKER_METRICS`` matrix.
+
+    A low weather factor trims extra-point chances and the accuracy of
+    kicks from 40 yards out. ``proe`` is accepted for a uniform signature.
+    """
+    metric, n, _, waf = _pool(baselines, proe, waf, KICKER_METRICS)
+    stats = StatlineBatch(KickerStatline, np.zeros((n, len(KICKER_COLUMNS))))
+    for made, missed, band, long in (
+        (stats.FG0_39, stats.FGMiss0_39, "0_39", False),
+        (stats.FG40_49, stats.FGMiss40_49, "40_49", True),
+        (stats.FG50_59, stats.FGMiss50_59, "50_59", True),
+        (stats.FG60, stats.FGMiss60, "60", True),
+    ):
+        attempts = metric["fg_attempts"] * metric[f"fg_share_{band}"]
+        pct = metric[f"fg_pct_{band}"] * (waf if long else 1)
+        made[:] = attempts * np.clip(pct, 0, 1)
+        missed[:] = attempts - made
+    pat_att = metric["pat_attempts"] * waf
+    stats.PAT[:] = pat_att * metric["pat_pct"]
+    stats.PATMiss[:] = pat_att - stats.PAT
+
+    points = kicker_points_batch(stats.values)
+    return stats, points, np.abs(points) * 0.1
+
+
+def project_defense_batch(
+    baselines: np.ndarray, proe: Any, waf: Any
+) -> Tuple[StatlineBatch, np.ndarray, np.ndarray]:
+    """Project team defenses from a ``players x DEFENSE_METRICS`` matrix.
+
+    ``proe`` is the opponent's: more dropbacks mean more sacks and
+    interceptions. Bad weather (low ``waf``) lowers points allowed.
+    """
+    metric, n, proe, waf = _pool(baselines, proe, waf, DEFENSE_METRICS)
+    stats = StatlineBatch(DefenseStatline, np.zeros((n, len(DEFENSE_COLUMNS))))
+    stats.Sack[:] = metric["sacks"] * (1 + proe)
+    stats.INT[:] = metric["interceptions"] * (1 + proe)
+    stats.FumRec[:] = metric["fumble_recoveries"]
+    stats.Safety[:] = metric["safeties"]
+    stats.TD[:] = metric["def_tds"]
+    stats.BlkKick[:] = metric["blocked_kicks"]
+    stats.PtsAllow[:] = metric["points_allowed"] * waf
+    stats.RetYds[:] = metric["return_yards"]
+    stats.RetTD[:] = metric["return_tds"]
+
+    points = defense_points_batch(stats.values)
+    return stats, points, np.abs(points) * 0.1
+
+
+def project_idp_batch(
+    baselines: np.ndarray, proe: Any, waf: Any
+) -> Tuple[StatlineBatch, np.ndarray, np.ndarray]:
+    """Project individual defenders from a ``players x IDP_METRICS`` matrix.
+
+    ``proe`` is the opponent's and scales pass-rush and coverage stats;
+    ``waf`` is accepted for a uniform signature.
+    """
+    metric, n, proe, _ = _pool(baselines, proe, waf, IDP_METRICS)
+    stats = StatlineBatch(IDPStatline, np.zeros((n, len(IDP_COLUMNS))))
+    stats.TackleSolo[:] = metric["solo_tackles"]
+    stats.TackleAst[:] = metric["assisted_tackles"]
+    stats.Sack[:] = metric["sacks"] * (1 + proe)
+    stats.INT[:] = metric["interceptions"] * (1 + proe)
+    stats.FumForce[:] = metric["forced_fumbles"]
+    stats.FumRec[:] = metric["fumble_recoveries"]
+    stats.Safety[:] = metric["safeties"]
+    stats.TD[:] = metric["def_tds"]
+    stats.PassDef[:] = metric["passes_defended"] * (1 + proe)
+    stats.RetYds[:] = metric["return_yards"]
+    stats.RetTD[:] = metric["return_tds"]
+
+    points = idp_points_batch(stats.values)
+    return stats, points, np.abs(points) * 0.1
+
+
+BatchEstimator = Callable[[np.ndarray, Any, Any], Tuple[StatlineBatch, Any, Any]]
+
+# Scoring kind -> (baseline metrics, batch estimator)
+ESTIMATORS: Dict[str, Tuple[Mapping[str, float], BatchEstimator]] = {
+    "offense": (OFFENSE_METRICS, project_offense_batch),
+    "kicker": (KICKER_METRICS, project_kicker_batch),
+    "defense": (DEFENSE_METRICS, project_defense_batch),
+    "idp": (IDP_METRICS, project_idp_batch),
+}
+
+
+@dataclass(frozen=True, eq=False)
+class PoolProjection:
+    """Projections for a mixed-position pool, in the pool's order.
+
+    ``groups`` maps each scoring kind present to the pool indices of its
+    players and their projected statlines.
+    """
+
+    kinds: List[str]
+    points: np.ndarray
+    variance: np.ndarray
+    groups: Dict[str, Tuple[np.ndarray, StatlineBatch]]
+
+    def records(self) -> List[Dict[str, float]]:
+        """Every player's statline as a JSON-ready dict."""
+
+        out: List[Dict[str, float]] = [{} for _ in self.kinds]
+        for rows, stats in self.groups.values():
+            for i, record in zip(rows.tolist(), stats.records()):
+                out[i] = record
+        return out
+
+
+def project_pool(
+    positions: Sequence[Any],
+    baselines: Sequence[Mapping[str, float]],
+    proe: Any,
+    waf: Any,
+) -> PoolProjection:
+    """Project a whole pool, one vectorized pass per position group.
+
+    ``positions`` are ``Player.position_primary`` values, mapped to an
+    estimator with :func:`scoring_kind`; ``proe`` and ``waf`` broadcast to
+    one value per player.
+    """
+    n = len(baselines)
+    proe_v = np.broadcast_to(np.asarray(proe, dtype=float), (n,))
+    waf_v = np.broadcast_to(np.asarray(waf, dtype=float), (n,))
+    kinds = [scoring_kind(p) for p in positions]
+    by_kind: Dict[str, List[int]] = {}
+    for i, kind in enumerate(kinds):
+        by_kind.setdefault(kind, []).append(i)
+    points = np.zeros(n)
+    variance = np.zeros(n)
+    groups: Dict[str, Tuple[np.ndarray, StatlineBatch]] = {}
+    for kind, members in by_kind.items():
+        metrics, estimator = ESTIMATORS[kind]
+        rows = np.asarray(members)
+        matrix = baseline_matrix([baselines[i] for i in members], metrics)
+        stats, pts, var = estimator(matrix, proe_v[rows], waf_v[rows])
+        points[rows] = pts
+        variance[rows] = var
+        groups[kind] = (rows, stats)
+    return PoolProjection(kinds, points, variance, groups)
@@ -0,0 +1,159 @@
+"""Multi-week horizon projections.
+
+Every week of the horizon is projected in one batched pass over
+``players x weeks`` rows; bye weeks score nothing. An ``N``-week horizon is
+the sum of the first ``N`` weeks, so every horizon up to rest of season comes
+out of one cumulative sum.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .estimators import OFFENSE_METRICS, project_offense_batch, project_pool
+
+# Last week projected for rest of season: the end of the fantasy playoffs.
+LAST_WEEK = 17
+
+
+@dataclass(frozen=True, eq=False)
+class HorizonProjection:
+    """Weekly projections from ``first_week`` on, ``players x weeks``.
+
+    ``playing`` is False on a player's bye week, where points and variance
+    are zero.
+    """
+
+    first_week: int
+    points: np.ndarray
+    variance: np.ndarray
+    playing: np.ndarray
+
+    @property
+    def weeks(self) -> int:
+        """Length of the rest-of-season horizon."""
+
+        return self.points.shape[1]
+
+    def total(self, horizon: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Points, variance and games over the next ``horizon`` weeks.
+
+        Weeks are treated as independent, so variances add. Horizons past the
+        last week are cut to rest of season.
+        """
+
+        if horizon < 1:
+            raise ValueError(f"horizon must be at least 1 week, got {horizon}")
+        end = min(horizon, self.weeks)
+        return (
+            self.points[:, :end].sum(axis=1),
+            self.variance[:, :end].sum(axis=1),
+            self.playing[:, :end].sum(axis=1),
+        )
+
+    def totals(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """:meth:`total` for every horizon at once, ``players x weeks``.
+
+        Column ``h - 1`` holds the ``h``-week horizon.
+        """
+
+        return (
+            np.cumsum(self.points, axis=1),
+            np.cumsum(self.variance, axis=1),
+            np.cumsum(self.playing, axis=1),
+        )
+
+
+def bye_mask(
+    bye_weeks: Sequence[Optional[int]], first_week: int, weeks: int
+) -> np.ndarray:
+    """``players x weeks`` mask, False where the week is the player's bye."""
+
+    byes = np.array([np.nan if b is None else b for b in bye_weeks], dtype=float)
+    calendar = first_week + np.arange(weeks)
+    return calendar[None, :] != byes[:, None]
+
+
+def project_offense_horizons(
+    baselines: np.ndarray,
+    proe: Any,
+    waf: Any,
+    bye_weeks: Sequence[Optional[int]],
+    first_week: int,
+    last_week: int = LAST_WEEK,
+) -> HorizonProjection:
+    """Project every player for every week from ``first_week`` to ``last_week``.
+
+    ``baselines`` is a ``players x OFFENSE_METRICS`` matrix and ``proe`` holds
+    one value per player. ``waf`` broadcasts to ``players x weeks``, so a
+    known weather factor can be given for the weeks that have one and 1.0
+    elsewhere.
+    """
+
+    b = np.asarray(baselines, dtype=float)
+    if b.ndim != 2 or b.shape[1] != len(OFFENSE_METRICS):
+        raise ValueError(
+            f"expected a players x {len(OFFENSE_METRICS)} baseline matrix, "
+            f"got {b.shape}"
+        )
+    n, weeks = b.shape[0], _weeks(first_week, last_week)
+    proe_v = np.broadcast_to(np.asarray(proe, dtype=float), (n,))
+    waf_m = np.broadcast_to(np.asarray(waf, dtype=float), (n, weeks))
+    _, points, variance = project_offense_batch(
+        np.repeat(b, weeks, axis=0), np.repeat(proe_v, weeks), waf_m.ravel()
+    )
+    return _horizon(points, variance, bye_weeks, first_week, n, weeks)
+
+
+def project_horizons(
+    positions: Sequence[Any],
+    baselines: Sequence[Mapping[str, float]],
+    proe: Any,
+    waf: Any,
+    bye_weeks: Sequence[Optional[int]],
+    first_week: int,
+    last_week: int = LAST_WEEK,
+) -> HorizonProjection:
+    """:func:`project_offense_horizons` for a mixed-position pool.
+
+    Every player is projected with their position's estimator (see
+    :func:`project_pool`), all weeks of a position group in one pass.
+    """
+
+    n, weeks = len(baselines), _weeks(first_week, last_week)
+    proe_v = np.broadcast_to(np.asarray(proe, dtype=float), (n,))
+    waf_m = np.broadcast_to(np.asarray(waf, dtype=float), (n, weeks))
+    pool = project_pool(
+        [p for p in positions for _ in range(weeks)],
+        [b for b in baselines for _ in range(weeks)],
+        np.repeat(proe_v, weeks),
+        waf_m.ravel(),
+    )
+    return _horizon(pool.points, pool.variance, bye_weeks, first_week, n, weeks)
+
+
+def _weeks(first_week: int, last_week: int) -> int:
+    if last_week < first_week:
+        raise ValueError(f"week {first_week} is past the last week {last_week}")
+    return last_week - first_week + 1
+
+
+def _horizon(
+    points: np.ndarray,
+    variance: np.ndarray,
+    bye_weeks: Sequence[Optional[int]],
+    first_week: int,
+    n: int,
+    weeks: int,
+) -> HorizonProjection:
+    # Fold player-major ``players * weeks`` rows into a horizon, zeroing byes.
+    playing = bye_mask(bye_weeks, first_week, weeks)
+    return HorizonProjection(
+        first_week=first_week,
+        points=np.where(playing, points.reshape(n, weeks), 0.0),
+        variance=np.where(playing, variance.reshape(n, weeks), 0.0),
+        playing=playing,
+    )
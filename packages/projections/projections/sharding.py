@@ -0,0 +1,181 @@
+"""Projection runs sharded across processes.
+
+The pool is split by scoring kind and then into runs of at most
+``SHARD_PLAYERS`` players; each shard is projected independently, in a
+process pool when ``max_workers`` allows, and the results are stitched back
+into pool order for a single write. A shard holds only its own players'
+inputs and results, and Monte Carlo draws stay within the simulation's
+player chunks, so peak memory per process does not grow with the pool. Each
+simulated player draws from a stream keyed by their own key, so sharding never
+changes their result.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from scoring import scoring_kind
+
+from .estimators import baseline_matrix, project_pool
+from .horizons import HorizonProjection, LAST_WEEK, project_horizons
+from .simulation import simulate_offense
+
+SHARD_PLAYERS = 512
+
+
+def shard_indices(
+    positions: Sequence[Any], size: int = SHARD_PLAYERS
+) -> List[np.ndarray]:
+    """Pool indices grouped by scoring kind, then cut into runs of ``size``.
+
+    Players keep their pool order within a kind, so id-ordered pools shard
+    by id range.
+    """
+
+    if size < 1:
+        raise ValueError(f"shard size must be positive, got {size}")
+    by_kind: Dict[str, List[int]] = {}
+    for i, position in enumerate(positions):
+        by_kind.setdefault(scoring_kind(position), []).append(i)
+    return [
+        np.asarray(members[start : start + size])
+        for _, members in sorted(by_kind.items())
+        for start in range(0, len(members), size)
+    ]
+
+
+def _map(fn: Callable[[Any], Any], tasks: List[Any], max_workers: Optional[int]):
+    # Daemonic processes (e.g. prefork task workers) cannot start a pool of
+    # their own, so they run shards in-process; runs that should scale go to
+    # a solo-pool worker (see the worker's ``projections`` queue).
+    if (
+        not max_workers
+        or max_workers <= 1
+        or len(tasks) <= 1
+        or multiprocessing.current_process().daemon
+    ):
+        return [fn(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks))) as pool:
+        return list(pool.map(fn, tasks))
+
+
+def _project_shard(task: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    rows, positions, baselines, proe, waf, n_samples, keys, seed = task
+    projected = project_pool(positions, baselines, proe, waf)
+    records = projected.records()
+    variance = projected.variance
+    if n_samples and "offense" in projected.groups:
+        offense, _ = projected.groups["offense"]
+        sim = simulate_offense(
+            baseline_matrix([baselines[i] for i in offense]),
+            proe[offense],
+            waf[offense],
+            n_samples=n_samples,
+            seed=seed,
+            keys=keys[offense],
+        )
+        variance[offense] = sim.variance
+        for j, i in enumerate(offense.tolist()):
+            records[i].update(sim.summary(j))
+    return rows, records, projected.points, variance
+
+
+def project_pool_sharded(
+    positions: Sequence[Any],
+    baselines: Sequence[Mapping[str, float]],
+    proe: Any,
+    waf: Any,
+    n_samples: int = 0,
+    seed: int = 0,
+    max_workers: Optional[int] = None,
+    shard_size: int = SHARD_PLAYERS,
+    keys: Optional[Sequence[int]] = None,
+) -> Tuple[List[Dict[str, Any]], np.ndarray, np.ndarray]:
+    """:func:`project_pool` (plus Monte Carlo with ``n_samples``) by shard.
+
+    Returns every player's statline record, points and variance in pool
+    order. Offensive players with ``n_samples`` get the simulated variance
+    and their :meth:`SimulationResult.summary` merged into the record.
+    Simulated players are seeded from ``seed`` and their entry in ``keys``
+    (player ids; the pool index by default), so results do not depend on
+    ``max_workers``, ``shard_size`` or the rest of the pool.
+    """
+
+    n = len(baselines)
+    proe_v = np.broadcast_to(np.asarray(proe, dtype=float), (n,))
+    waf_v = np.broadcast_to(np.asarray(waf, dtype=float), (n,))
+    key_v = np.arange(n) if keys is None else np.asarray(keys, dtype=np.int64)
+    tasks = [
+        (
+            rows,
+            [positions[i] for i in rows],
+            [baselines[i] for i in rows],
+            proe_v[rows],
+            waf_v[rows],
+            n_samples,
+            key_v[rows],
+            seed,
+        )
+        for rows in shard_indices(positions, shard_size)
+    ]
+    records: List[Dict[str, Any]] = [{} for _ in range(n)]
+    points = np.zeros(n)
+    variance = np.zeros(n)
+    for rows, shard_records, pts, var in _map(_project_shard, tasks, max_workers):
+        points[rows] = pts
+        variance[rows] = var
+        for i, record in zip(rows.tolist(), shard_records):
+            records[i] = record
+    return records, points, variance
+
+
+def _horizon_shard(task: Tuple[Any, ...]) -> Tuple[np.ndarray, HorizonProjection]:
+    rows, positions, baselines, proe, waf, byes, first_week, last_week = task
+    return rows, project_horizons(
+        positions, baselines, proe, waf, byes, first_week, last_week
+    )
+
+
+def project_horizons_sharded(
+    positions: Sequence[Any],
+    baselines: Sequence[Mapping[str, float]],
+    proe: Any,
+    waf: Any,
+    bye_weeks: Sequence[Optional[int]],
+    first_week: int,
+    last_week: int = LAST_WEEK,
+    max_workers: Optional[int] = None,
+    shard_size: int = SHARD_PLAYERS,
+) -> HorizonProjection:
+    """:func:`project_horizons` by shard, merged back into pool order."""
+
+    n, weeks = len(baselines), last_week - first_week + 1
+    if weeks < 1:
+        raise ValueError(f"week {first_week} is past the last week {last_week}")
+    proe_v = np.broadcast_to(np.asarray(proe, dtype=float), (n,))
+    waf_m = np.broadcast_to(np.asarray(waf, dtype=float), (n, weeks))
+    tasks = [
+        (
+            rows,
+            [positions[i] for i in rows],
+            [baselines[i] for i in rows],
+            proe_v[rows],
+            waf_m[rows],
+            [bye_weeks[i] for i in rows],
+            first_week,
+            last_week,
+        )
+        for rows in shard_indices(positions, shard_size)
+    ]
+    points = np.zeros((n, weeks))
+    variance = np.zeros((n, weeks))
+    playing = np.ones((n, weeks), dtype=bool)
+    for rows, part in _map(_horizon_shard, tasks, max_workers):
+        points[rows] = part.points
+        variance[rows] = part.variance
+        playing[rows] = part.playing
+    return HorizonProjection(first_week, points, variance, playing)
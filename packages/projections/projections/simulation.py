@@ -0,0 +1,250 @@
+"""Monte Carlo offense projections.
+
+Every player's attempts, efficiency and touchdowns are drawn from
+distributions centred on the same baselines :func:`project_offense` uses, and
+each simulated statline is scored. Each player draws from their own stream,
+keyed by the root seed and a stable per-player key (their id), so a player's
+result depends only on the seed, the key and their own inputs: not on the rest
+of the pool, chunking or sharding. Draws are float32 and vectorized across
+samples; scoring and summaries are vectorized across a chunk of players.
+
+The gamma and Poisson sampling itself is the cost: drawing a chunk as one
+``players x samples`` array measured no faster than per-player draws, which
+is why each player keeps their own stream. A 2000-player pool at 10k samples
+takes about 5 s on one core (2-3 ms per player; ``RUN_BENCHMARKS=1`` checks
+the budget in ``test_simulation``); pass ``max_workers`` to shard chunks
+across cores.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from scoring.batch import OFFENSE_TERMS, score_batch
+from scoring.distribution import summarize_points
+
+from .estimators import OFFENSE_METRICS
+
+# Simulated statline columns; every other offense stat is zero, so only the
+# scoring terms over these columns contribute.
+SIM_COLUMNS = (
+    "Comp",
+    "Incomp",
+    "PassYds",
+    "PassTD",
+    "INT",
+    "RushYds",
+    "RushTD",
+    "Rec",
+    "RecYds",
+    "RecTD",
+)
+_SIM_TERMS = tuple(t for t in OFFENSE_TERMS if t[0] in SIM_COLUMNS)
+
+# Game-to-game spread of attempts, targets and receptions: their variance is
+# ``mean + mean**2 / VOLUME_DISPERSION`` (a negative binomial's), drawn from a
+# gamma so volumes stay continuous like the point projection. Efficiency is a
+# mean-one gamma multiplier with coefficient of variation ``1 / sqrt(shape)``.
+VOLUME_DISPERSION = 8.0
+PASS_EFFICIENCY_SHAPE = 16.0
+RUSH_EFFICIENCY_SHAPE = 6.0
+REC_EFFICIENCY_SHAPE = 6.0
+
+# Quantile levels stored as the sample sketch: every 5th percentile.
+SKETCH_LEVELS = np.linspace(0.0, 1.0, 21)
+
+# Players scored and summarized together; also the unit of sharding.
+CHUNK_PLAYERS = 64
+
+
+@dataclass(frozen=True, eq=False)
+class SimulationResult:
+    """Per-player summaries of simulated fantasy points.
+
+    ``sketch`` is ``players x len(SKETCH_LEVELS)`` points quantiles.
+    """
+
+    mean: np.ndarray
+    variance: np.ndarray
+    sketch: np.ndarray
+
+    def quantile(self, q: float) -> np.ndarray:
+        """Quantile ``q`` interpolated from the sketch."""
+
+        return np.array([np.interp(q, SKETCH_LEVELS, row) for row in self.sketch])
+
+    def summary(self, index: int) -> Dict[str, Any]:
+        """JSON-ready ``p10``/``p50``/``p90`` and sketch for ``Projection.data``."""
+
+        row = self.sketch[index]
+        return {
+            "p10": round(float(row[2]), 2),
+            "p50": round(float(row[10]), 2),
+            "p90": round(float(row[18]), 2),
+            "sketch": [round(v, 2) for v in row.tolist()],
+        }
+
+
+def _volume(rng: np.random.Generator, mean: float, n: int) -> np.ndarray:
+    shape = VOLUME_DISPERSION * mean / (VOLUME_DISPERSION + mean)
+    draws = rng.standard_gamma(shape, n, dtype=np.float32)
+    draws *= mean / shape
+    return draws
+
+
+def _efficiency(rng: np.random.Generator, shape: float, n: int) -> np.ndarray:
+    draws = rng.standard_gamma(shape, n, dtype=np.float32)
+    draws *= 1.0 / shape
+    return draws
+
+
+def _simulate_player(
+    rng: np.random.Generator,
+    metric: Dict[str, float],
+    proe: float,
+    waf: float,
+    out: np.ndarray,
+) -> None:
+    # ``out`` is one player's SIM_COLUMNS x n_samples block, written in place.
+    col = dict(zip(SIM_COLUMNS, out))
+    n = out.shape[1]
+
+    # Completions follow attempts at the completion rate: at a quarter point
+    # each way their own binomial noise is a rounding error next to yardage
+    # and touchdowns.
+    pass_mean = metric["pass_attempts"] * (1 + proe) * waf
+    if pass_mean > 0:
+        att = _volume(rng, pass_mean, n)
+        np.multiply(att, metric["comp_rate"], out=col["Comp"])
+        np.subtract(att, col["Comp"], out=col["Incomp"])
+        np.maximum(col["Incomp"], 0, out=col["Incomp"])
+        np.multiply(
+            _efficiency(rng, PASS_EFFICIENCY_SHAPE, n),
+            att * (metric["yards_per_attempt"] * waf),
+            out=col["PassYds"],
+        )
+        col["PassTD"][:] = rng.poisson(att * metric["td_rate"])
+        col["INT"][:] = rng.poisson(att * metric["int_rate"])
+
+    rush_mean = metric["rush_attempts"] * waf
+    if rush_mean > 0:
+        att = _volume(rng, rush_mean, n)
+        np.multiply(
+            _efficiency(rng, RUSH_EFFICIENCY_SHAPE, n),
+            att * metric["yards_per_rush"],
+            out=col["RushYds"],
+        )
+        col["RushTD"][:] = rng.poisson(att * metric["rush_td_rate"])
+
+    rec_mean = metric["targets"] * (1 + proe) * waf * metric["catch_rate"]
+    if rec_mean > 0:
+        rec = _volume(rng, rec_mean, n)
+        col["Rec"][:] = rec
+        np.multiply(
+            _efficiency(rng, REC_EFFICIENCY_SHAPE, n),
+            rec * (metric["yards_per_rec"] * waf),
+            out=col["RecYds"],
+        )
+        col["RecTD"][:] = rng.poisson(rec * metric["rec_td_rate"])
+
+
+def _player_rng(seed: int, key: int) -> np.random.Generator:
+    # Each player's stream is keyed by the root seed and their own key, so
+    # their draws do not depend on who else is simulated or where.
+    return np.random.default_rng(np.random.SeedSequence([seed, key]))
+
+
+def _simulate_chunk(
+    args: Tuple[np.ndarray, np.ndarray, np.ndarray, int, np.ndarray, int],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    baselines, proe, waf, n_samples, keys, seed = args
+    n_players = baselines.shape[0]
+    sim = np.zeros((len(SIM_COLUMNS), n_players, n_samples), dtype=np.float32)
+    for j, key in enumerate(keys.tolist()):
+        _simulate_player(
+            _player_rng(seed, key),
+            dict(zip(OFFENSE_METRICS, baselines[j].tolist())),
+            float(proe[j]),
+            float(waf[j]),
+            sim[:, j],
+        )
+
+    # ``sim`` is stat-major, so its transpose is the column-major statline
+    # matrix score_batch reads without copying.
+    flat = sim.reshape(len(SIM_COLUMNS), -1).T
+    points = score_batch(flat, SIM_COLUMNS, _SIM_TERMS).reshape(n_players, n_samples)
+    dist = summarize_points(points, SKETCH_LEVELS)
+    sketch = np.stack([dist.quantiles[q] for q in SKETCH_LEVELS], axis=1)
+    return dist.mean, dist.variance, sketch
+
+
+def simulate_offense(
+    baselines: np.ndarray,
+    proe: Any,
+    waf: Any,
+    n_samples: int = 10_000,
+    seed: int = 0,
+    max_workers: Optional[int] = None,
+    keys: Optional[Sequence[int]] = None,
+) -> SimulationResult:
+    """Simulate fantasy points for a ``players x OFFENSE_METRICS`` pool.
+
+    Parameters
+    ----------
+    baselines: np.ndarray
+        Baseline matrix as built by :func:`baseline_matrix`.
+    proe, waf:
+        Per-player (or scalar) pass rate over expectation and weather factor.
+    n_samples: int
+        Simulated games per player.
+    seed: int
+        Root seed; the same seed reproduces the same result.
+    max_workers: Optional[int]
+        Processes to shard chunks of players across. ``None``, ``0`` or ``1``
+        simulates in-process.
+    keys: Optional[Sequence[int]]
+        Non-negative per-player keys, e.g. player ids, that pick each
+        player's random stream. Defaults to the row index, which makes a
+        player's draws depend on their position in the pool.
+    """
+
+    b = np.asarray(baselines, dtype=float)
+    if b.ndim != 2 or b.shape[1] != len(OFFENSE_METRICS):
+        raise ValueError(
+            f"expected a players x {len(OFFENSE_METRICS)} baseline matrix, "
+            f"got {b.shape}"
+        )
+    n = b.shape[0]
+    key_v = np.arange(n) if keys is None else np.asarray(keys, dtype=np.int64)
+    if key_v.shape != (n,):
+        raise ValueError(f"expected {n} keys, got {key_v.shape}")
+    proe_v = np.broadcast_to(np.asarray(proe, dtype=float), (n,))
+    waf_v = np.broadcast_to(np.asarray(waf, dtype=float), (n,))
+    chunks = [
+        (
+            b[s : s + CHUNK_PLAYERS],
+            proe_v[s : s + CHUNK_PLAYERS],
+            waf_v[s : s + CHUNK_PLAYERS],
+            n_samples,
+            key_v[s : s + CHUNK_PLAYERS],
+            seed,
+        )
+        for s in range(0, n, CHUNK_PLAYERS)
+    ]
+    results: List[Tuple[np.ndarray, np.ndarray, np.ndarray]]
+    if max_workers and max_workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_simulate_chunk, chunks))
+    else:
+        results = [_simulate_chunk(chunk) for chunk in chunks]
+    if not results:
+        empty = np.zeros(0)
+        return SimulationResult(empty, empty, np.zeros((0, SKETCH_LEVELS.size)))
+    means, variances, sketches = zip(*results)
+    return SimulationResult(
+        np.concatenate(means), np.concatenate(variances), np.concatenate(sketches)
+    )
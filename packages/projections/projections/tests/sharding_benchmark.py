@@ -0,0 +1,88 @@
+"""Throughput of sharded projection runs by process count.
+
+Projects a seeded pool of offensive players with Monte Carlo at 1, 2, 4, ...
+worker processes up to the core count and reports players per second and the
+speedup over one process. Run ``python sharding_benchmark.py`` from this
+directory; ``test_sharding.py`` (with ``RUN_BENCHMARKS=1`` on a multi-core
+machine) checks that throughput scales with the cores.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+sys.path.append(str(Path(__file__).resolve().parents[3] / "scoring"))
+sys.path.append(str(Path(__file__).resolve().parents[3] / "perfbench"))
+
+import perfbench  # noqa: E402
+from projections import project_pool_sharded  # noqa: E402
+
+# Enough players for 16 default-size shards, so up to 16 cores have work.
+PLAYERS = 8192
+SAMPLES = 2000
+
+
+def synthetic_pool(size: int, seed: int = 0) -> Tuple[List[str], List[Dict]]:
+    rng = np.random.default_rng(seed)
+    positions = rng.choice(["QB", "RB", "WR", "TE"], size=size).tolist()
+    baselines = [
+        {
+            "pass_attempts": 34.0 if pos == "QB" else 0.0,
+            "rush_attempts": float(rng.uniform(1, 18)),
+            "targets": 0.0 if pos == "QB" else float(rng.uniform(2, 9)),
+        }
+        for pos in positions
+    ]
+    return positions, baselines
+
+
+def worker_counts(cores: int) -> List[int]:
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+def run(
+    repeat: int = 1,
+    players: int = PLAYERS,
+    samples: int = SAMPLES,
+    cores: int | None = None,
+) -> perfbench.Results:
+    """Seconds, players per second and speedup per worker count."""
+
+    positions, baselines = synthetic_pool(players)
+    case: Dict[str, Dict[str, float]] = {}
+    serial = None
+    for workers in worker_counts(cores or os.cpu_count() or 1):
+        seconds, _ = perfbench.best_of(
+            lambda: project_pool_sharded(
+                positions,
+                baselines,
+                0.0,
+                1.0,
+                n_samples=samples,
+                max_workers=workers,
+            ),
+            repeat,
+        )
+        serial = serial or seconds
+        case[f"workers-{workers}"] = {
+            "seconds": round(seconds, 4),
+            "players_per_s": round(players / seconds, 1),
+            "speedup": round(serial / seconds, 2),
+        }
+    return {f"pool-{players}": case}
+
+
+if __name__ == "__main__":
+    print(json.dumps(run(), indent=2, sort_keys=True))
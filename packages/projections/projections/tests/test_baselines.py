@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from projections import (
+    COUNTERS,
+    OFFENSE_METRICS,
+    WeeklyCounts,
+    aggregate_player_stats,
+    aggregate_plays,
+    compute_baselines,
+)
+from projections.baselines import PRIOR_WEIGHT
+
+PBP = """\
+week,posteam,passer_player_id,rusher_player_id,receiver_player_id,pass_attempt,sack,complete_pass,passing_yards,receiving_yards,pass_touchdown,interception,rush_attempt,rushing_yards,rush_touchdown,pass_oe
+1,KC,QB1,NA,WR1,1,0,1,12,12,0,0,0,NA,0,10
+1,KC,QB1,NA,WR1,1,0,0,NA,NA,0,1,0,NA,0,-20
+1,KC,QB1,NA,NA,1,1,0,NA,NA,0,0,0,NA,0,NA
+1,KC,NA,RB1,NA,0,0,0,NA,NA,0,0,1,5,1,NA
+2,BUF,QB2,NA,WR2,1,0,1,30,30,1,0,0,NA,0,30
+""".splitlines()
+
+
+def pbp_columns(plays=slice(None)):
+    header, *rows = [line.split(",") for line in PBP]
+    rows = rows[plays]
+    return {name: [r[i] for r in rows] for i, name in enumerate(header)}
+
+
+def row(counts, pid, week):
+    i = np.flatnonzero((counts.ids == pid) & (counts.weeks == week))[0]
+    return dict(zip(COUNTERS, counts.counts[i].tolist()))
+
+
+def test_aggregate_plays_credits_passer_rusher_and_receiver():
+    counts = aggregate_plays(pbp_columns())
+    assert sorted(counts.ids.tolist()) == ["QB1", "QB2", "RB1", "WR1", "WR2"]
+    qb = row(counts, "QB1", 1)
+    # The sack is not an attempt.
+    assert (qb["pass_att"], qb["comp"], qb["pass_yds"], qb["int"]) == (2, 1, 12, 1)
+    assert qb["proe_sum"] == pytest.approx(-0.1) and qb["proe_plays"] == 2
+    assert row(counts, "WR1", 1)["targets"] == 2
+    assert row(counts, "WR2", 2)["rec_td"] == 1
+    rb = row(counts, "RB1", 1)
+    assert (rb["rush_att"], rb["rush_yds"], rb["rush_td"], rb["games"]) == (1, 5, 1, 1)
+
+
+def test_merge_sums_player_weeks_and_player_stats_match():
+    week1 = aggregate_plays(pbp_columns(slice(0, 4)))
+    week2 = aggregate_plays(pbp_columns(slice(4, None)))
+    merged = week1.merge(week2)
+    whole = aggregate_plays(pbp_columns())
+    order = np.lexsort((merged.weeks, merged.ids))
+    assert np.array_equal(
+        merged.counts[order], whole.counts[np.lexsort((whole.weeks, whole.ids))]
+    )
+    assert merged.before(2).last_week == 1
+
+    stats = aggregate_player_stats(
+        {
+            "player_id": ["QB2", "NA"],
+            "week": ["2", "2"],
+            "attempts": ["1", "3"],
+            "completions": ["1", "2"],
+            "passing_yards": ["30", "1"],
+            "passing_tds": ["1", "0"],
+        }
+    )
+    assert len(stats) == 1
+    assert row(stats, "QB2", 2)["pass_yds"] == row(whole, "QB2", 2)["pass_yds"]
+
+
+def test_compute_baselines_weights_recent_weeks_and_shrinks_rates(tmp_path):
+    ids = np.array(["RB1", "RB1"])
+    weeks = np.array([1, 5])
+    counts = np.zeros((2, len(COUNTERS)))
+    rush, yds = COUNTERS.index("rush_att"), COUNTERS.index("rush_yds")
+    counts[:, rush] = [10, 20]
+    counts[:, yds] = [30, 100]
+    counts[:, 0] = 1
+    weekly = WeeklyCounts(ids, weeks, counts)
+
+    base = compute_baselines(weekly, half_life=4.0)["RB1"]
+    # Week 1 is one half-life older than week 5.
+    assert base["rush_attempts"] == pytest.approx((5 + 20) / 1.5, abs=1e-4)
+    expected = (15 + 100 + PRIOR_WEIGHT * OFFENSE_METRICS["yards_per_rush"]) / (
+        5 + 20 + PRIOR_WEIGHT
+    )
+    assert base["yards_per_rush"] == pytest.approx(expected, abs=1e-4)
+    assert "comp_rate" not in base and base["pass_attempts"] == 0
+
+    path = tmp_path / "counts.npz"
+    weekly.save(path)
+    loaded = WeeklyCounts.load(path)
+    assert compute_baselines(loaded) == compute_baselines(weekly)
+    assert len(WeeklyCounts.load(tmp_path / "missing.npz")) == 0
+    assert compute_baselines(WeeklyCounts.empty()) == {}
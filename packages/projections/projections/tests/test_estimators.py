@@ -1,4 +1,12 @@
-from projections import project_offense
+import numpy as np
+import pytest
+
+from projections import (
+    OFFENSE_METRICS,
+    baseline_matrix,
+    project_offense,
+    project_offense_batch,
+)
 
 
 def sample_baselines():
@@ -36,3 +44,87 @@ def test_weather_sensitivity():
     cat_good, _, _ = project_offense(base, proe=0.0, waf=1.0)
     cat_bad, _, _ = project_offense(base, proe=0.0, waf=0.5)
     assert cat_bad["PassYds"] < cat_good["PassYds"]
+
+
+def test_batch_matches_scalar_per_player():
+    rng = np.random.default_rng(5)
+    pool = []
+    for _ in range(200):
+        base = {k: v * rng.uniform(0.5, 1.5) for k, v in sample_baselines().items()}
+        # Some players lack metrics and fall back to the defaults.
+        pool.append({k: v for k, v in base.items() if rng.random() > 0.2})
+    proe = rng.uniform(-0.2, 0.3, len(pool))
+    waf = rng.uniform(0.6, 1.0, len(pool))
+
+    stats, points, variance = project_offense_batch(baseline_matrix(pool), proe, waf)
+    for i, base in enumerate(pool):
+        cat, pts, var = project_offense(base, proe[i], waf[i])
+        assert stats.record(i) == cat
+        assert points[i] == pts and variance[i] == var
+
+
+def test_batch_scalar_weather_and_validation():
+    matrix = baseline_matrix([sample_baselines()] * 3)
+    stats, _, _ = project_offense_batch(matrix, 0.0, [1.0, 0.8, 0.5])
+    assert list(stats.PassYds) == sorted(stats.PassYds, reverse=True)
+    assert baseline_matrix([]).shape == (0, len(OFFENSE_METRICS))
+    with pytest.raises(ValueError):
+        project_offense_batch(np.zeros((2, 3)), 0.0, 1.0)
+
+
+def test_kicker_defense_idp_batches_score_their_statlines():
+    from projections import (
+        DEFENSE_METRICS,
+        IDP_METRICS,
+        KICKER_METRICS,
+        project_defense_batch,
+        project_idp_batch,
+        project_kicker_batch,
+    )
+    from scoring import defense_points, idp_points, kicker_points
+
+    kickers = baseline_matrix([{}, {"fg_attempts": 3}], KICKER_METRICS)
+    stats, points, variance = project_kicker_batch(kickers, 0.0, [1.0, 0.6])
+    assert points[1] > points[0] > 0
+    assert points[0] == pytest.approx(kicker_points(stats.statline(0)))
+    assert stats.FG0_39[1] + stats.FGMiss0_39[1] == pytest.approx(3 * 0.55)
+    # Bad weather costs long field goals, not short ones.
+    assert stats.FG40_49[1] / 3 < stats.FG40_49[0] / 1.8
+    assert stats.FG0_39[1] / 3 == pytest.approx(stats.FG0_39[0] / 1.8)
+
+    defenses = baseline_matrix([{}, {"points_allowed": 40}], DEFENSE_METRICS)
+    stats, points, variance = project_defense_batch(defenses, 0.0, [1.0, 1.0])
+    assert stats.PtsAllow.tolist() == [22, 40]
+    assert points[1] < points[0]
+    assert points[1] == pytest.approx(defense_points(stats.statline(1)))
+    assert np.all(variance >= 0)
+    _, snowy, _ = project_defense_batch(defenses, 0.0, 0.6)
+    assert snowy[0] > points[0]
+
+    idps = baseline_matrix([{}, {"solo_tackles": 6, "sacks": 0.5}], IDP_METRICS)
+    stats, points, _ = project_idp_batch(idps, 0.0, 1.0)
+    assert points[0] == 0 and points[1] == idp_points(stats.statline(1)) == 11
+
+
+def test_project_pool_dispatches_by_position():
+    from projections import project_pool
+
+    positions = ["WR", "K", "DEF", "LB", "QB", None]
+    pool = [
+        {"targets": 8},
+        {},
+        {"sacks": 3},
+        {"solo_tackles": 5},
+        {"pass_attempts": 30},
+        {"rush_attempts": 10},
+    ]
+    projected = project_pool(positions, pool, 0.0, 1.0)
+    assert projected.kinds == ["offense", "kicker", "defense", "idp"] + ["offense"] * 2
+    records = projected.records()
+    assert "Rec" in records[0] and "FG0_39" in records[1]
+    assert "PtsAllow" in records[2] and "TackleSolo" in records[3]
+    rows, stats = projected.groups["offense"]
+    assert rows.tolist() == [0, 4, 5] and len(stats) == 3
+    _, offense, _ = project_offense_batch(baseline_matrix([pool[0]]), 0.0, 1.0)
+    assert projected.points[0] == offense[0]
+    assert np.all(projected.points > 0)
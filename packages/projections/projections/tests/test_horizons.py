@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from projections import (
+    baseline_matrix,
+    bye_mask,
+    project_offense_batch,
+    project_offense_horizons,
+)
+
+
+def pool():
+    return baseline_matrix(
+        [{"rush_attempts": 15, "targets": 3}, {"targets": 9}, {"pass_attempts": 33}]
+    )
+
+
+def test_horizons_match_weekly_projections_and_skip_byes():
+    _, weekly, variance = project_offense_batch(pool(), 0.0, 1.0)
+    proj = project_offense_horizons(pool(), 0.0, 1.0, [6, None, 9], 5, last_week=9)
+    assert proj.weeks == 5
+    assert proj.points[:, 0] == pytest.approx(weekly)
+    # Player 0 is on bye in week 6, player 2 in week 9.
+    assert proj.points[0, 1] == 0 and proj.points[2, 4] == 0
+    points, var, games = proj.total(3)
+    assert points == pytest.approx(weekly * [2, 3, 3])
+    assert var == pytest.approx(variance * [2, 3, 3])
+    assert games.tolist() == [2, 3, 3]
+    ros, _, ros_games = proj.total(20)
+    assert ros_games.tolist() == [4, 5, 4]
+    cumulative, _, _ = proj.totals()
+    assert cumulative[:, 2] == pytest.approx(points)
+    assert cumulative[:, -1] == pytest.approx(ros)
+
+
+def test_horizon_weather_applies_per_week():
+    waf = np.ones((3, 3))
+    waf[1, 0] = 0.5
+    proj = project_offense_horizons(pool(), 0.0, waf, [None] * 3, 1, last_week=3)
+    assert proj.points[1, 0] < proj.points[1, 1] == proj.points[1, 2]
+    assert proj.points[0, 0] == proj.points[0, 1]
+
+
+def test_bye_mask_and_bad_horizons():
+    mask = bye_mask([2, None], 1, 3)
+    assert mask.tolist() == [[True, False, True], [True, True, True]]
+    proj = project_offense_horizons(pool(), 0.0, 1.0, [None] * 3, 1, last_week=2)
+    with pytest.raises(ValueError):
+        proj.total(0)
+    with pytest.raises(ValueError):
+        project_offense_horizons(pool(), 0.0, 1.0, [None] * 3, 5, last_week=4)
+
+
+def test_mixed_pool_horizons_use_position_estimators():
+    from projections import project_horizons, project_pool
+
+    positions = ["K", "DEF", "RB"]
+    pool = [{}, {}, {"rush_attempts": 12}]
+    weekly = project_pool(positions, pool, 0.0, 1.0).points
+    proj = project_horizons(positions, pool, 0.0, 1.0, [None, 3, None], 2, 4)
+    points, _, games = proj.total(3)
+    assert points == pytest.approx(weekly * [3, 2, 3])
+    assert games.tolist() == [3, 2, 3]
@@ -0,0 +1,104 @@
+import os
+
+import numpy as np
+import perfbench
+import pytest
+
+from projections import (
+    project_horizons,
+    project_horizons_sharded,
+    project_pool,
+    project_pool_sharded,
+    shard_indices,
+)
+from projections.sharding import SHARD_PLAYERS
+from sharding_benchmark import PLAYERS, run, worker_counts
+
+
+def pool(n=90):
+    rng = np.random.default_rng(3)
+    positions, baselines = [], []
+    for i in range(n):
+        kind = i % 3
+        positions.append(("WR", "K", "LB")[kind])
+        baselines.append(
+            ({"targets": rng.uniform(2, 9)}, {}, {"solo_tackles": rng.uniform(1, 7)})[
+                kind
+            ]
+        )
+    return positions, baselines
+
+
+def test_shard_indices_group_by_kind_and_cap_size():
+    positions, _ = pool(10)
+    shards = shard_indices(positions, size=2)
+    assert all(len(s) <= 2 for s in shards)
+    assert sorted(np.concatenate(shards).tolist()) == list(range(10))
+    # idp (LB), kicker, offense; id order within a kind.
+    assert [s.tolist() for s in shards[:2]] == [[2, 5], [8]]
+    with pytest.raises(ValueError):
+        shard_indices(positions, size=0)
+
+
+def test_sharded_pool_matches_single_batch():
+    positions, baselines = pool()
+    expected = project_pool(positions, baselines, 0.1, 0.9)
+    records, points, variance = project_pool_sharded(
+        positions, baselines, 0.1, 0.9, shard_size=7
+    )
+    assert np.allclose(points, expected.points)
+    assert np.allclose(variance, expected.variance)
+    assert records == expected.records()
+
+
+def test_sharded_simulation_is_independent_of_workers_and_shards():
+    positions, baselines = pool()
+    local = project_pool_sharded(
+        positions, baselines, 0.0, 1.0, n_samples=300, seed=4, shard_size=16
+    )
+    spread = project_pool_sharded(
+        positions,
+        baselines,
+        0.0,
+        1.0,
+        n_samples=300,
+        seed=4,
+        shard_size=5,
+        max_workers=2,
+    )
+    assert local[0] == spread[0]
+    assert np.array_equal(local[2], spread[2])
+    assert "sketch" in local[0][0] and "sketch" not in local[0][1]
+
+    # Keyed by player id, a sub-pool reproduces the full pool's players.
+    ids = [100 + i for i in range(len(positions))]
+    full = project_pool_sharded(
+        positions, baselines, 0.0, 1.0, n_samples=300, seed=4, keys=ids
+    )
+    part = project_pool_sharded(
+        positions[6:], baselines[6:], 0.0, 1.0, n_samples=300, seed=4, keys=ids[6:]
+    )
+    assert full[0][6:] == part[0]
+
+
+def test_sharded_horizons_match_single_batch():
+    positions, baselines = pool(30)
+    byes = [5 + i % 4 for i in range(30)]
+    expected = project_horizons(positions, baselines, 0.0, 1.0, byes, 4, 10)
+    sharded = project_horizons_sharded(
+        positions, baselines, 0.0, 1.0, byes, 4, 10, max_workers=2, shard_size=4
+    )
+    assert np.allclose(sharded.points, expected.points)
+    assert np.array_equal(sharded.playing, expected.playing)
+
+
+@pytest.mark.skipif(
+    not perfbench.enabled() or (os.cpu_count() or 1) < 2,
+    reason="set RUN_BENCHMARKS=1 on a multi-core machine",
+)
+def test_sharded_throughput_scales_with_cores():
+    case = run()[f"pool-{PLAYERS}"]
+    workers = worker_counts(os.cpu_count() or 1)[-1]
+    usable = min(workers, -(-PLAYERS // SHARD_PLAYERS))
+    # Half of linear scaling leaves room for pool start-up on a busy machine.
+    assert case[f"workers-{workers}"]["speedup"] >= 0.5 * usable
@@ -0,0 +1,89 @@
+import numpy as np
+import perfbench
+import pytest
+
+from projections import (
+    SKETCH_LEVELS,
+    baseline_matrix,
+    project_offense,
+    project_offense_batch,
+    simulate_offense,
+)
+from sharding_benchmark import synthetic_pool
+
+
+def pool():
+    return baseline_matrix(
+        [
+            {"pass_attempts": 34, "rush_attempts": 3},
+            {"rush_attempts": 16, "targets": 3},
+            {"targets": 8, "yards_per_rec": 13},
+            {},
+        ]
+    )
+
+
+def test_simulation_is_reproducible_and_shard_independent():
+    big = np.tile(pool(), (40, 1))
+    a = simulate_offense(big, 0.0, 1.0, n_samples=500, seed=7)
+    b = simulate_offense(big, 0.0, 1.0, n_samples=500, seed=7, max_workers=2)
+    assert a.sketch.shape == (160, SKETCH_LEVELS.size)
+    assert np.array_equal(a.sketch, b.sketch)
+    assert np.array_equal(a.variance, b.variance)
+    other = simulate_offense(big, 0.0, 1.0, n_samples=500, seed=8)
+    assert not np.array_equal(a.sketch, other.sketch)
+
+
+def test_player_draws_follow_their_key_not_their_row():
+    big = np.tile(pool(), (40, 1))
+    keys = np.arange(1000, 1160)
+    full = simulate_offense(big, 0.0, 1.0, n_samples=500, seed=7, keys=keys)
+    # The same player alone, or at another row of a reordered pool, draws
+    # the same games.
+    alone = simulate_offense(big[[129]], 0.0, 1.0, n_samples=500, seed=7, keys=[1129])
+    assert np.array_equal(alone.sketch[0], full.sketch[129])
+    order = np.arange(160)[::-1]
+    flipped = simulate_offense(
+        big[order], 0.0, 1.0, n_samples=500, seed=7, keys=keys[order]
+    )
+    assert np.array_equal(flipped.sketch[::-1], full.sketch)
+    assert np.array_equal(flipped.mean[::-1], full.mean)
+    with pytest.raises(ValueError):
+        simulate_offense(big, 0.0, 1.0, n_samples=10, keys=[1, 2])
+
+
+def test_simulated_mean_tracks_point_projection():
+    _, points, _ = project_offense_batch(pool(), 0.0, 1.0)
+    sim = simulate_offense(pool(), 0.0, 1.0, n_samples=20000)
+    assert sim.mean[:3] == pytest.approx(points[:3], rel=0.1)
+    assert np.all(sim.variance[:3] > 0)
+    # Idle players never score.
+    assert sim.mean[3] == 0 and sim.variance[3] == 0
+    assert np.all(np.diff(sim.sketch, axis=1) >= 0)
+    p10, p90 = sim.quantile(0.1), sim.quantile(0.9)
+    assert np.all(p10[:3] < points[:3]) and np.all(points[:3] < p90[:3])
+
+
+def test_project_offense_simulation_mode():
+    base = {"targets": 8, "catch_rate": 0.65, "yards_per_rec": 12}
+    cat, pts, var = project_offense(base, proe=0.0, waf=1.0, n_samples=2000)
+    assert var != pytest.approx(pts * 0.1)
+    assert cat["p10"] <= cat["p50"] <= cat["p90"]
+    assert len(cat["sketch"]) == SKETCH_LEVELS.size
+    assert project_offense(base, 0.0, 1.0, n_samples=2000)[0] == cat
+
+
+def test_simulation_rejects_bad_matrix():
+    with pytest.raises(ValueError):
+        simulate_offense(np.zeros((2, 3)), 0.0, 1.0)
+
+
+@pytest.mark.skipif(not perfbench.enabled(), reason="set RUN_BENCHMARKS=1")
+def test_full_pool_simulates_within_budget():
+    # 2000 players x 10k samples measured about 5.4 s on one core.
+    _, baselines = synthetic_pool(2000)
+    matrix = baseline_matrix(baselines)
+    seconds, _ = perfbench.best_of(
+        lambda: simulate_offense(matrix, 0.0, 1.0, n_samples=10_000), 1
+    )
+    assert seconds < 8.0, f"{seconds:.1f}s for 2000 players x 10k samples"
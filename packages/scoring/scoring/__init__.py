@@ -1,4 +1,5 @@
 from .league_scoring import (
+    Statline,
     OffenseStatline,
     KickerStatline,
     DefenseStatline,
@@ -8,8 +9,30 @@ from .league_scoring import (
     defense_points,
     idp_points,
 )
+from .batch import (
+    OFFENSE_COLUMNS,
+    KICKER_COLUMNS,
+    DEFENSE_COLUMNS,
+    IDP_COLUMNS,
+    StatlineBatch,
+    statline_matrix,
+    offense_points_batch,
+    kicker_points_batch,
+    defense_points_batch,
+    idp_points_batch,
+)
+from .compiled import (
+    DEFAULT_RULES,
+    ScoringRules,
+    compile_yahoo_scoring,
+    league_rules,
+    scoring_kind,
+)
+from .live import LiveScoreboard, points_delta
+from .distribution import PointsDistribution, points_distribution, summarize_points
 
 __all__ = [
+    "Statline",
     "OffenseStatline",
     "KickerStatline",
     "DefenseStatline",
@@ -18,4 +41,24 @@ __all__ = [
     "kicker_points",
     "defense_points",
     "idp_points",
+    "OFFENSE_COLUMNS",
+    "KICKER_COLUMNS",
+    "DEFENSE_COLUMNS",
+    "IDP_COLUMNS",
+    "StatlineBatch",
+    "statline_matrix",
+    "offense_points_batch",
+    "kicker_points_batch",
+    "defense_points_batch",
+    "idp_points_batch",
+    "DEFAULT_RULES",
+    "ScoringRules",
+    "compile_yahoo_scoring",
+    "league_rules",
+    "scoring_kind",
+    "LiveScoreboard",
+    "points_delta",
+    "PointsDistribution",
+    "points_distribution",
+    "summarize_points",
 ]
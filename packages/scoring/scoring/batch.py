@@ -0,0 +1,269 @@
+"""Vectorized scoring of many statlines at once.
+
+Each ``*_points_batch`` function takes an ``n x len(*_COLUMNS)`` array whose
+columns follow the field order of the matching statline dataclass and returns
+the ``n`` fantasy point totals. Terms are accumulated in the same order and
+with the same operations as the scalar functions, so results are identical
+to scoring every row one at a time.
+"""
+
+from __future__ import annotations
+
+from dataclasses import fields
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from .league_scoring import (
+    PA_BOUNDS,
+    PA_POINTS,
+    PASS_YDS_BONUS,
+    REC_YDS_BONUS,
+    RUSH_YDS_BONUS,
+    DefenseStatline,
+    IDPStatline,
+    KickerStatline,
+    OffenseStatline,
+)
+
+OFFENSE_COLUMNS = tuple(f.name for f in fields(OffenseStatline))
+KICKER_COLUMNS = tuple(f.name for f in fields(KickerStatline))
+DEFENSE_COLUMNS = tuple(f.name for f in fields(DefenseStatline))
+IDP_COLUMNS = tuple(f.name for f in fields(IDPStatline))
+
+# (column, op, argument) in the order the scalar functions add them up:
+# "mul" adds argument * value, "div" adds value / argument, "bonus" adds 2 per
+# threshold in argument reached and "tiers" adds the points-allowed tier.
+Term = Tuple[str, str, Any]
+
+OFFENSE_TERMS: Tuple[Term, ...] = (
+    ("Comp", "mul", 0.25),
+    ("Incomp", "mul", -0.25),
+    ("PassYds", "div", 25),
+    ("PassYds", "bonus", PASS_YDS_BONUS),
+    ("PassTD", "mul", 6),
+    ("INT", "mul", -2),
+    ("e40c", "mul", 2),
+    ("e40ptd", "mul", 2),
+    ("Pass1D", "mul", 0.5),
+    ("PickSix", "mul", -2),
+    ("RushYds", "div", 10),
+    ("RushYds", "bonus", RUSH_YDS_BONUS),
+    ("RushTD", "mul", 6),
+    ("e40r", "mul", 2),
+    ("e40rtd", "mul", 2),
+    ("Rush1D", "mul", 0.5),
+    ("Rec", "mul", 1),
+    ("RecYds", "div", 10),
+    ("RecYds", "bonus", REC_YDS_BONUS),
+    ("RecTD", "mul", 6),
+    ("e40rec", "mul", 2),
+    ("e40rectd", "mul", 2),
+    ("Rec1D", "mul", 0.5),
+    ("RetYds", "div", 30),
+    ("RetTD", "mul", 6),
+    ("TwoPt", "mul", 2),
+    ("FumblesLost", "mul", -2),
+    ("OffFumRetTD", "mul", 6),
+)
+
+KICKER_TERMS: Tuple[Term, ...] = (
+    ("FG0_39", "mul", 3),
+    ("FG40_49", "mul", 4),
+    ("FG50_59", "mul", 5),
+    ("FG60", "mul", 6),
+    ("PAT", "mul", 1),
+    ("FGMiss0_39", "mul", -1),
+    ("FGMiss40_49", "mul", -1),
+    ("FGMiss50_59", "mul", -1),
+    ("FGMiss60", "mul", -1),
+    ("PATMiss", "mul", -1),
+)
+
+DEFENSE_TERMS: Tuple[Term, ...] = (
+    ("Sack", "mul", 1),
+    ("INT", "mul", 2),
+    ("FumRec", "mul", 2),
+    ("Safety", "mul", 2),
+    ("TD", "mul", 6),
+    ("BlkKick", "mul", 2),
+    ("RetYds", "div", 30),
+    ("RetTD", "mul", 6),
+    ("PtsAllow", "tiers", None),
+)
+
+IDP_TERMS: Tuple[Term, ...] = (
+    ("TackleSolo", "mul", 1.5),
+    ("TackleAst", "mul", 0.75),
+    ("Sack", "mul", 4),
+    ("INT", "mul", 3),
+    ("FumForce", "mul", 2),
+    ("FumRec", "mul", 2),
+    ("Safety", "mul", 2),
+    ("TD", "mul", 6),
+    ("PassDef", "mul", 1.5),
+    ("RetYds", "div", 30),
+    ("RetTD", "mul", 6),
+)
+
+_PA_BOUNDS = np.asarray(PA_BOUNDS, dtype=float)
+# Index 0 holds the tier for values below the first bound (scored as 35+).
+_PA_POINTS = np.asarray([PA_POINTS[-1]] + PA_POINTS, dtype=float)
+
+
+def points_allowed_batch(pa: np.ndarray) -> np.ndarray:
+    """Vectorized :func:`defense_points_allowed`."""
+
+    return _PA_POINTS[np.searchsorted(_PA_BOUNDS, pa, side="right")]
+
+
+def bonus_bins_batch(values: np.ndarray, bins: Sequence[float]) -> np.ndarray:
+    """Vectorized :func:`bonus_bins`: thresholds reached by each value."""
+
+    # Bins take float32 values' dtype so searchsorted does not upcast them.
+    edges = np.asarray(bins, dtype=np.result_type(values, np.float32))
+    return np.searchsorted(edges, values, side="right")
+
+
+def statline_matrix(statlines: Iterable[Any], cls: Type[Any]) -> np.ndarray:
+    """Stack statline dataclasses into an ``n x fields`` float64 array."""
+
+    columns = [f.name for f in fields(cls)]
+    rows = [[getattr(s, c) for c in columns] for s in statlines]
+    return np.array(rows, dtype=float).reshape(len(rows), len(columns))
+
+
+def score_batch(
+    stats: np.ndarray, columns: Sequence[str], terms: Sequence[Term]
+) -> np.ndarray:
+    """Evaluate ``terms`` over every row of ``stats`` laid out as ``columns``."""
+
+    # float32 draws (e.g. Monte Carlo samples) are scored as they are; the
+    # total still accumulates in float64.
+    matrix = np.asarray(stats)
+    if matrix.dtype != np.float32:
+        matrix = matrix.astype(float, copy=False)
+    if matrix.ndim != 2 or matrix.shape[1] != len(columns):
+        raise ValueError(
+            f"expected an n x {len(columns)} statline array, got {matrix.shape}"
+        )
+    # One contiguous row per stat keeps every term a unit-stride pass.
+    by_stat = np.ascontiguousarray(matrix.T)
+    index = {name: i for i, name in enumerate(columns)}
+    total = np.zeros(matrix.shape[0])
+    for column, op, arg in terms:
+        values = by_stat[index[column]]
+        if op == "mul":
+            total += arg * values
+        elif op == "div":
+            total += values / arg
+        elif op == "bonus":
+            total += 2 * bonus_bins_batch(values, arg)
+        elif op == "tiers":
+            total += points_allowed_batch(values)
+        else:
+            raise ValueError(f"unknown scoring op: {op}")
+    return total
+
+
+def offense_points_batch(stats: np.ndarray) -> np.ndarray:
+    return score_batch(stats, OFFENSE_COLUMNS, OFFENSE_TERMS)
+
+
+def kicker_points_batch(stats: np.ndarray) -> np.ndarray:
+    return score_batch(stats, KICKER_COLUMNS, KICKER_TERMS)
+
+
+def defense_points_batch(stats: np.ndarray) -> np.ndarray:
+    return score_batch(stats, DEFENSE_COLUMNS, DEFENSE_TERMS)
+
+
+def idp_points_batch(stats: np.ndarray) -> np.ndarray:
+    return score_batch(stats, IDP_COLUMNS, IDP_TERMS)
+
+
+KIND_SCORERS = {
+    "offense": offense_points_batch,
+    "kicker": kicker_points_batch,
+    "defense": defense_points_batch,
+    "idp": idp_points_batch,
+}
+
+_SCORERS = {
+    OffenseStatline: offense_points_batch,
+    KickerStatline: kicker_points_batch,
+    DefenseStatline: defense_points_batch,
+    IDPStatline: idp_points_batch,
+}
+
+
+class StatlineBatch:
+    """Many statlines of one type held as a single float64 block.
+
+    ``values`` is ``n x fields`` in column-major order, so each stat is a
+    contiguous column exposed by name (``batch.PassYds``) without copying.
+    A season of statlines costs 8 bytes per stat instead of a Python object
+    per value.
+    """
+
+    __slots__ = ("cls", "columns", "values", "_index")
+
+    def __init__(self, cls: Type[Any], values: Optional[np.ndarray] = None) -> None:
+        self.cls = cls
+        self.columns = tuple(f.name for f in fields(cls))
+        if values is None:
+            values = np.zeros((0, len(self.columns)))
+        values = np.asfortranarray(values, dtype=float)
+        if values.ndim != 2 or values.shape[1] != len(self.columns):
+            raise ValueError(
+                f"expected an n x {len(self.columns)} statline array, "
+                f"got {values.shape}"
+            )
+        self.values = values
+        self._index = {name: i for i, name in enumerate(self.columns)}
+
+    @classmethod
+    def from_statlines(
+        cls, statlines: Iterable[Any], statline_cls: Type[Any]
+    ) -> "StatlineBatch":
+        return cls(statline_cls, statline_matrix(statlines, statline_cls))
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[Mapping[str, Any]], statline_cls: Type[Any]
+    ) -> "StatlineBatch":
+        """Build from ``Projection.data``-style dicts; missing stats are zero."""
+
+        columns = [f.name for f in fields(statline_cls)]
+        rows = [[float(r.get(c) or 0.0) for c in columns] for r in records]
+        return cls(
+            statline_cls, np.array(rows, dtype=float).reshape(len(rows), len(columns))
+        )
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self.values[:, self._index[name]]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self._index[name]]
+
+    def record(self, i: int) -> Dict[str, float]:
+        return dict(zip(self.columns, self.values[i].tolist()))
+
+    def records(self) -> List[Dict[str, float]]:
+        """Every row as a JSON-ready dict, e.g. for ``Projection.data``."""
+
+        return [dict(zip(self.columns, row)) for row in self.values.tolist()]
+
+    def statline(self, i: int) -> Any:
+        return self.cls(*self.values[i].tolist())
+
+    def points(self) -> np.ndarray:
+        return _SCORERS[self.cls](self.values)
@@ -0,0 +1,412 @@
+"""League scoring settings compiled to coefficient vectors.
+
+A :class:`ScoringRules` holds, for every statline kind, one coefficient per
+column of the matching ``*_COLUMNS`` layout plus yardage bonus tables and the
+defense points-allowed tiers. Scoring a batch of statlines is then a matrix
+product followed by a ``np.searchsorted`` lookup per bonus table, whatever
+the league's settings are.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .batch import (
+    DEFENSE_COLUMNS,
+    DEFENSE_TERMS,
+    IDP_COLUMNS,
+    IDP_TERMS,
+    KICKER_COLUMNS,
+    KICKER_TERMS,
+    OFFENSE_COLUMNS,
+    OFFENSE_TERMS,
+)
+from .league_scoring import PA_BOUNDS, PA_POINTS
+
+COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "offense": OFFENSE_COLUMNS,
+    "kicker": KICKER_COLUMNS,
+    "defense": DEFENSE_COLUMNS,
+    "idp": IDP_COLUMNS,
+}
+
+# Yahoo stat ids feeding each statline column; the first id the league scores
+# wins. Yahoo splits short field goals three ways and tops out at 50+.
+YAHOO_STAT_IDS: Dict[str, Dict[str, Tuple[int, ...]]] = {
+    "offense": {
+        "Comp": (2,),
+        "Incomp": (3,),
+        "PassYds": (4,),
+        "PassTD": (5,),
+        "INT": (6,),
+        "PickSix": (58,),
+        "Pass1D": (79,),
+        "RushYds": (9,),
+        "RushTD": (10,),
+        "Rush1D": (81,),
+        "Rec": (11,),
+        "RecYds": (12,),
+        "RecTD": (13,),
+        "Rec1D": (80,),
+        "RetYds": (14,),
+        "RetTD": (15,),
+        "TwoPt": (16,),
+        "FumblesLost": (18,),
+        "OffFumRetTD": (57,),
+        "e40c": (59,),
+        "e40ptd": (60,),
+        "e40r": (61,),
+        "e40rtd": (62,),
+        "e40rec": (63,),
+        "e40rectd": (64,),
+    },
+    "kicker": {
+        "FG0_39": (21, 20, 19),
+        "FG40_49": (22,),
+        "FG50_59": (23,),
+        "FG60": (23,),
+        "FGMiss0_39": (26, 25, 24),
+        "FGMiss40_49": (27,),
+        "FGMiss50_59": (28,),
+        "FGMiss60": (28,),
+        "PAT": (29,),
+        "PATMiss": (30,),
+    },
+    "defense": {
+        "Sack": (32,),
+        "INT": (33,),
+        "FumRec": (34,),
+        "TD": (35,),
+        "Safety": (36,),
+        "BlkKick": (37,),
+        "PtsAllow": (31,),
+        "RetYds": (48,),
+        "RetTD": (49,),
+    },
+    "idp": {
+        "TackleSolo": (38,),
+        "TackleAst": (39,),
+        "Sack": (40,),
+        "INT": (41,),
+        "FumForce": (42,),
+        "FumRec": (43,),
+        "TD": (44,),
+        "Safety": (45,),
+        "PassDef": (46,),
+        # Yahoo scores individual players' returns under the offensive ids.
+        "RetYds": (14,),
+        "RetTD": (15,),
+    },
+}
+
+# Yahoo "Points Allowed" tier stat ids, one per entry of ``PA_BOUNDS``.
+YAHOO_PA_TIER_IDS = (50, 51, 52, 53, 54, 55, 56)
+
+# Statline kind scored for a player's primary position; anything else is
+# scored as offense.
+POSITION_KINDS = {
+    "K": "kicker",
+    "DEF": "defense",
+    "DST": "defense",
+    "D/ST": "defense",
+    "IDP": "idp",
+    "DL": "idp",
+    "DE": "idp",
+    "DT": "idp",
+    "LB": "idp",
+    "DB": "idp",
+    "CB": "idp",
+    "S": "idp",
+}
+
+# (column index, ascending thresholds, points for reaching 0..n thresholds)
+Bonus = Tuple[int, np.ndarray, np.ndarray]
+
+
+def scoring_kind(position: Optional[str]) -> str:
+    return POSITION_KINDS.get((position or "").upper(), "offense")
+
+
+@dataclass(frozen=True, eq=False)
+class ScoringRules:
+    """Compiled scoring for one league.
+
+    ``pa_points`` has one more entry than ``PA_BOUNDS``: index 0 scores
+    values below the first bound, index ``i`` the tier starting at
+    ``PA_BOUNDS[i - 1]``.
+    """
+
+    coefficients: Dict[str, np.ndarray]
+    bonuses: Dict[str, Tuple[Bonus, ...]]
+    pa_points: np.ndarray
+    digest: str = field(default="")
+
+    def __post_init__(self) -> None:
+        # Plain-Python lookups for scoring one changed stat at a time, where
+        # per-call numpy overhead would dominate.
+        linear: Dict[str, Dict[str, float]] = {}
+        tables: Dict[str, Dict[str, List[Tuple[List[float], List[float]]]]] = {}
+        for kind, columns in COLUMNS.items():
+            coef = self.coefficients[kind].tolist()
+            linear[kind] = dict(zip(columns, coef))
+            tables[kind] = {}
+            for col, targets, awards in self.bonuses[kind]:
+                tables[kind].setdefault(columns[col], []).append(
+                    (targets.tolist(), awards.tolist())
+                )
+        tables["defense"].setdefault("PtsAllow", []).append(
+            (list(PA_BOUNDS), self.pa_points.tolist())
+        )
+        object.__setattr__(self, "_linear", linear)
+        object.__setattr__(self, "_tables", tables)
+
+    def score(self, kind: str, stats: np.ndarray) -> np.ndarray:
+        """Points for an ``n x len(COLUMNS[kind])`` statline array."""
+
+        coef = self.coefficients[kind]
+        matrix = np.asarray(stats, dtype=float)
+        if matrix.ndim != 2 or matrix.shape[1] != coef.size:
+            raise ValueError(
+                f"expected an n x {coef.size} {kind} statline array, "
+                f"got {matrix.shape}"
+            )
+        points = matrix @ coef
+        for col, targets, awards in self.bonuses[kind]:
+            points += awards[np.searchsorted(targets, matrix[:, col], side="right")]
+        if kind == "defense":
+            pa = matrix[:, DEFENSE_COLUMNS.index("PtsAllow")]
+            points += self.pa_points[np.searchsorted(_PA_BOUNDS, pa, side="right")]
+        return points
+
+    def delta(
+        self, kind: str, previous: Mapping[str, float], change: Mapping[str, float]
+    ) -> float:
+        """Point change when ``change`` is added to the ``previous`` statline.
+
+        Only the changed columns are looked at: their linear term plus any
+        bonus threshold or points-allowed tier crossed between the old and
+        new value. Unknown columns are ignored.
+        """
+
+        linear = self._linear[kind]  # type: ignore[attr-defined]
+        tables = self._tables[kind]  # type: ignore[attr-defined]
+        total = 0.0
+        for column, step in change.items():
+            if not step or column not in linear:
+                continue
+            old = float(previous.get(column) or 0.0)
+            new = old + step
+            total += linear[column] * step
+            for targets, awards in tables.get(column, ()):
+                total += (
+                    awards[bisect_right(targets, new)]
+                    - awards[bisect_right(targets, old)]
+                )
+        return total
+
+    def score_records(
+        self, kinds: Sequence[str], records: Sequence[Mapping[str, Any]]
+    ) -> np.ndarray:
+        """Points for stat dictionaries (e.g. ``Projection.data``) of mixed kinds.
+
+        Keys outside the kind's columns are ignored and missing ones count as
+        zero. Records of the same kind are scored as one batch.
+        """
+
+        out = np.zeros(len(records))
+        groups: Dict[str, List[int]] = {}
+        for i, kind in enumerate(kinds):
+            groups.setdefault(kind, []).append(i)
+        for kind, rows in groups.items():
+            columns = COLUMNS[kind]
+            matrix = np.array(
+                [[float(records[i].get(c) or 0.0) for c in columns] for i in rows],
+                dtype=float,
+            ).reshape(len(rows), len(columns))
+            out[rows] = self.score(kind, matrix)
+        return out
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "coefficients": {k: v.tolist() for k, v in self.coefficients.items()},
+            "bonuses": {
+                k: [[col, t.tolist(), a.tolist()] for col, t, a in bonuses]
+                for k, bonuses in self.bonuses.items()
+            },
+            "pa_points": self.pa_points.tolist(),
+            "digest": self.digest,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "ScoringRules":
+        return cls(
+            coefficients={
+                k: np.asarray(v, dtype=float) for k, v in data["coefficients"].items()
+            },
+            bonuses={
+                k: tuple(
+                    (int(col), np.asarray(t, dtype=float), np.asarray(a, dtype=float))
+                    for col, t, a in bonuses
+                )
+                for k, bonuses in data["bonuses"].items()
+            },
+            pa_points=np.asarray(data["pa_points"], dtype=float),
+            digest=data.get("digest", ""),
+        )
+
+
+_PA_BOUNDS = np.asarray(PA_BOUNDS, dtype=float)
+
+
+def _bonus(col: int, targets: Sequence[float], points: Sequence[float]) -> Bonus:
+    order = np.argsort(np.asarray(targets, dtype=float), kind="stable")
+    sorted_targets = np.asarray(targets, dtype=float)[order]
+    awards = np.concatenate([[0.0], np.cumsum(np.asarray(points, dtype=float)[order])])
+    return col, sorted_targets, awards
+
+
+def _compile_terms() -> ScoringRules:
+    # The hand-written default rules of league_scoring, as a ScoringRules.
+    coefficients: Dict[str, np.ndarray] = {}
+    bonuses: Dict[str, Tuple[Bonus, ...]] = {}
+    terms = {
+        "offense": OFFENSE_TERMS,
+        "kicker": KICKER_TERMS,
+        "defense": DEFENSE_TERMS,
+        "idp": IDP_TERMS,
+    }
+    for kind, columns in COLUMNS.items():
+        coef = np.zeros(len(columns))
+        kind_bonuses = []
+        for column, op, arg in terms[kind]:
+            col = columns.index(column)
+            if op == "mul":
+                coef[col] += arg
+            elif op == "div":
+                coef[col] += 1.0 / arg
+            elif op == "bonus":
+                kind_bonuses.append(_bonus(col, arg, [2] * len(arg)))
+        coefficients[kind] = coef
+        bonuses[kind] = tuple(kind_bonuses)
+    pa_points = np.asarray([PA_POINTS[-1]] + PA_POINTS, dtype=float)
+    return ScoringRules(coefficients, bonuses, pa_points, digest="default")
+
+
+DEFAULT_RULES = _compile_terms()
+
+
+def _as_dict(value: Any) -> Dict[str, Any]:
+    # Yahoo's JSON wraps objects in single-key lists; merge them back.
+    if isinstance(value, list):
+        merged: Dict[str, Any] = {}
+        for item in value:
+            if isinstance(item, dict):
+                merged.update(item)
+        return merged
+    return value if isinstance(value, dict) else {}
+
+
+def _stat_entries(container: Any) -> List[Dict[str, Any]]:
+    stats = _as_dict(container).get("stats", [])
+    return [_as_dict(_as_dict(s).get("stat")) for s in stats]
+
+
+def settings_digest(settings: Any) -> str:
+    return hashlib.sha1(
+        json.dumps(settings, sort_keys=True, default=str).encode()
+    ).hexdigest()[:16]
+
+
+def compile_yahoo_scoring(settings: Any) -> ScoringRules:
+    """Compile a Yahoo league ``settings`` object into :class:`ScoringRules`.
+
+    Uses ``stat_modifiers`` for per-unit values and their ``bonuses`` for
+    threshold awards; stats flagged ``is_only_display_stat`` in
+    ``stat_categories`` never score. Unscored columns get a zero coefficient.
+    """
+
+    digest = settings_digest(settings)
+    settings = _as_dict(settings)
+    display_only = {
+        str(s.get("stat_id"))
+        for s in _stat_entries(settings.get("stat_categories"))
+        if str(s.get("is_only_display_stat", "0")) == "1"
+    }
+    values: Dict[int, float] = {}
+    bonus_specs: Dict[int, List[Tuple[float, float]]] = {}
+    for stat in _stat_entries(settings.get("stat_modifiers")):
+        sid = stat.get("stat_id")
+        if sid is None or str(sid) in display_only:
+            continue
+        values[int(sid)] = float(stat.get("value") or 0.0)
+        for bonus in stat.get("bonuses") or []:
+            spec = _as_dict(_as_dict(bonus).get("bonus", bonus))
+            if "target" in spec:
+                bonus_specs.setdefault(int(sid), []).append(
+                    (float(spec["target"]), float(spec.get("points") or 0.0))
+                )
+
+    coefficients: Dict[str, np.ndarray] = {}
+    bonuses: Dict[str, Tuple[Bonus, ...]] = {}
+    for kind, columns in COLUMNS.items():
+        coef = np.zeros(len(columns))
+        kind_bonuses = []
+        for col, column in enumerate(columns):
+            sid = next(
+                (s for s in YAHOO_STAT_IDS[kind].get(column, ()) if s in values), None
+            )
+            if sid is None:
+                continue
+            coef[col] = values[sid]
+            if sid in bonus_specs:
+                targets, points = zip(*bonus_specs[sid])
+                kind_bonuses.append(_bonus(col, targets, points))
+        coefficients[kind] = coef
+        bonuses[kind] = tuple(kind_bonuses)
+    tiers = [values.get(sid, 0.0) for sid in YAHOO_PA_TIER_IDS]
+    pa_points = np.asarray([tiers[-1]] + tiers, dtype=float)
+    return ScoringRules(coefficients, bonuses, pa_points, digest)
+
+
+# Compiled rules per league id, with the digest of the settings they came from,
+# least recently used first; at most LEAGUE_RULES_LIMIT leagues are kept.
+_LEAGUE_RULES: OrderedDict[int, ScoringRules] = OrderedDict()
+LEAGUE_RULES_LIMIT = int(os.getenv("LEAGUE_RULES_LIMIT", "512"))
+REDIS_TTL_SECONDS = 7 * 24 * 3600
+
+
+def league_rules(league_id: int, settings: Any, redis: Any = None) -> ScoringRules:
+    """Compiled rules for a league, cached in process and optionally in Redis.
+
+    Leagues without stored settings use :data:`DEFAULT_RULES`. Entries are
+    keyed by a digest of ``settings``, so changed settings recompile.
+    """
+
+    if not settings:
+        return DEFAULT_RULES
+    digest = settings_digest(settings)
+    rules = _LEAGUE_RULES.get(league_id)
+    if rules is not None and rules.digest == digest:
+        _LEAGUE_RULES.move_to_end(league_id)
+        return rules
+    key = f"scoring:{league_id}:{digest}"
+    cached = redis.get(key) if redis is not None else None
+    if cached:
+        rules = ScoringRules.from_dict(json.loads(cached))
+    else:
+        rules = compile_yahoo_scoring(settings)
+        if redis is not None:
+            redis.set(key, json.dumps(rules.to_dict()), ex=REDIS_TTL_SECONDS)
+    _LEAGUE_RULES[league_id] = rules
+    _LEAGUE_RULES.move_to_end(league_id)
+    while len(_LEAGUE_RULES) > LEAGUE_RULES_LIMIT:
+        _LEAGUE_RULES.popitem(last=False)
+    return rules
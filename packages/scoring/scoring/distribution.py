@@ -0,0 +1,96 @@
+"""Fantasy points distributions from sampled statlines.
+
+Bonus thresholds and points-allowed tiers make points nonlinear in the
+underlying stats, so the spread of points has to come from scoring sampled
+statlines rather than from scaling a point estimate.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .batch import KIND_SCORERS
+from .compiled import ScoringRules
+
+DEFAULT_QUANTILES = (0.1, 0.5, 0.9)
+
+
+@dataclass(frozen=True, eq=False)
+class PointsDistribution:
+    """Scored samples and their summary statistics.
+
+    ``points`` has the shape of the sample array without its stat axis, e.g.
+    ``players x n_samples``; ``mean``, ``variance`` and each quantile drop the
+    trailing sample axis as well.
+    """
+
+    points: np.ndarray
+    mean: np.ndarray
+    variance: np.ndarray
+    quantiles: Dict[float, np.ndarray]
+
+    def summary(self, index: Optional[int] = None) -> Dict[str, float]:
+        """JSON-ready ``mean``/``variance``/``pNN`` values for one player.
+
+        ``index`` selects the player when the samples had a player axis.
+        """
+
+        def pick(values: np.ndarray) -> float:
+            return float(values if index is None else values[index])
+
+        out = {"mean": pick(self.mean), "variance": pick(self.variance)}
+        for q, values in self.quantiles.items():
+            out[f"p{round(q * 100):02d}"] = pick(values)
+        return out
+
+
+def points_distribution(
+    kind: str,
+    samples: np.ndarray,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    rules: Optional[ScoringRules] = None,
+) -> PointsDistribution:
+    """Score ``... x n_samples x n_stats`` sampled statlines in one pass.
+
+    ``kind`` picks the statline layout (``"offense"``, ``"kicker"``,
+    ``"defense"`` or ``"idp"``); a 3-D array scores every player at once.
+    Without ``rules`` the default league scoring is used.
+    """
+
+    draws = np.asarray(samples, dtype=float)
+    if draws.ndim < 2 or draws.shape[-2] == 0:
+        raise ValueError("samples need a non-empty sample axis and a stat axis")
+    flat = draws.reshape(-1, draws.shape[-1])
+    scored = rules.score(kind, flat) if rules else KIND_SCORERS[kind](flat)
+    return summarize_points(scored.reshape(draws.shape[:-1]), quantiles)
+
+
+def summarize_points(
+    points: np.ndarray, quantiles: Sequence[float] = DEFAULT_QUANTILES
+) -> PointsDistribution:
+    """Summarize already-scored ``... x n_samples`` points.
+
+    Quantiles are linearly interpolated like ``np.quantile``'s default, but
+    from a single sort of the sample axis, which is much cheaper than
+    ``np.quantile`` once more than a couple of levels are asked for.
+    """
+
+    points = np.asarray(points, dtype=float)
+    if points.ndim < 1 or points.shape[-1] == 0:
+        raise ValueError("points need a non-empty sample axis")
+    ordered = np.sort(points, axis=-1)
+    last = points.shape[-1] - 1
+    pos = np.asarray(quantiles, dtype=float) * last
+    lo = np.floor(pos).astype(int)
+    hi = np.minimum(lo + 1, last)
+    frac = pos - lo
+    qs = ordered[..., lo] * (1 - frac) + ordered[..., hi] * frac
+    return PointsDistribution(
+        points=points,
+        mean=points.mean(axis=-1),
+        variance=points.var(axis=-1),
+        quantiles={q: qs[..., i] for i, q in enumerate(quantiles)},
+    )
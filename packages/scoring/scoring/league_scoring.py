@@ -1,12 +1,38 @@
+from bisect import bisect_right
 from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Type, TypeVar
+
+S = TypeVar("S", bound="Statline")
+
+# Yardage thresholds that each award a 2 point bonus once reached.
+PASS_YDS_BONUS = [300, 400, 500]
+RUSH_YDS_BONUS = [100, 150, 200]
+REC_YDS_BONUS = [100, 150, 200]
 
 
 def bonus_bins(val, bins):
     return sum(1 for b in bins if val >= b)
 
 
-@dataclass
-class OffenseStatline:
+class Statline:
+    """Shared helpers for the slotted statline dataclasses below."""
+
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, float]:
+        """Plain ``{field: value}`` dict, e.g. for ``Projection.data``."""
+        names = self.__dataclass_fields__  # type: ignore[attr-defined]
+        return {name: getattr(self, name) for name in names}
+
+    @classmethod
+    def from_dict(cls: Type[S], data: Mapping[str, Any]) -> S:
+        """Build from a dict, ignoring keys that are not statline fields."""
+        names = cls.__dataclass_fields__  # type: ignore[attr-defined]
+        return cls(**{k: v for k, v in data.items() if k in names})
+
+
+@dataclass(slots=True)
+class OffenseStatline(Statline):
     Comp: float = 0
     Incomp: float = 0
     PassYds: float = 0
@@ -39,7 +65,7 @@ def offense_points(s: OffenseStatline) -> float:
         0.25 * s.Comp
         - 0.25 * s.Incomp
         + s.PassYds / 25
-        + 2 * bonus_bins(s.PassYds, [300, 400, 500])
+        + 2 * bonus_bins(s.PassYds, PASS_YDS_BONUS)
         + 6 * s.PassTD
         - 2 * s.INT
         + 2 * s.e40c
@@ -47,14 +73,14 @@ def offense_points(s: OffenseStatline) -> float:
         + 0.5 * s.Pass1D
         - 2 * s.PickSix
         + s.RushYds / 10
-        + 2 * bonus_bins(s.RushYds, [100, 150, 200])
+        + 2 * bonus_bins(s.RushYds, RUSH_YDS_BONUS)
         + 6 * s.RushTD
         + 2 * s.e40r
         + 2 * s.e40rtd
         + 0.5 * s.Rush1D
         + s.Rec
         + s.RecYds / 10
-        + 2 * bonus_bins(s.RecYds, [100, 150, 200])
+        + 2 * bonus_bins(s.RecYds, REC_YDS_BONUS)
         + 6 * s.RecTD
         + 2 * s.e40rec
         + 2 * s.e40rectd
@@ -67,8 +93,8 @@ def offense_points(s: OffenseStatline) -> float:
     )
 
 
-@dataclass
-class KickerStatline:
+@dataclass(slots=True)
+class KickerStatline(Statline):
     FG0_39: float = 0
     FG40_49: float = 0
     FG50_59: float = 0
@@ -96,8 +122,8 @@ def kicker_points(s: KickerStatline) -> float:
     )
 
 
-@dataclass
-class DefenseStatline:
+@dataclass(slots=True)
+class DefenseStatline(Statline):
     Sack: float = 0
     INT: float = 0
     FumRec: float = 0
@@ -109,20 +135,16 @@ class DefenseStatline:
     RetTD: float = 0
 
 
+# Points-allowed tiers: lower bound of each tier and the points it awards.
+PA_BOUNDS = [0, 1, 7, 14, 21, 28, 35]
+PA_POINTS = [10, 7, 4, 1, 0, -1, -4]
+
+
 def defense_points_allowed(pa: float) -> float:
-    if pa == 0:
-        return 10
-    if 1 <= pa <= 6:
-        return 7
-    if 7 <= pa <= 13:
-        return 4
-    if 14 <= pa <= 20:
-        return 1
-    if 21 <= pa <= 27:
-        return 0
-    if 28 <= pa <= 34:
-        return -1
-    return -4
+    # Fractional (projected) values fall into the tier whose range contains
+    # them, e.g. 6.5 scores like 1-6; negative values score like 35+.
+    idx = bisect_right(PA_BOUNDS, pa) - 1
+    return PA_POINTS[idx] if idx >= 0 else PA_POINTS[-1]
 
 
 def defense_points(s: DefenseStatline) -> float:
@@ -139,8 +161,8 @@ def defense_points(s: DefenseStatline) -> float:
     )
 
 
-@dataclass
-class IDPStatline:
+@dataclass(slots=True)
+class IDPStatline(Statline):
     TackleSolo: float = 0
     TackleAst: float = 0
     Sack: float = 0
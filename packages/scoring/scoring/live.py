@@ -0,0 +1,70 @@
+"""Running fantasy totals updated from live stat deltas."""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+from .compiled import DEFAULT_RULES, ScoringRules
+
+
+def points_delta(
+    kind: str,
+    previous: Mapping[str, float],
+    change: Mapping[str, float],
+    rules: Optional[ScoringRules] = None,
+) -> float:
+    """Fantasy point change from adding ``change`` to the ``previous`` statline.
+
+    ``kind`` is one of ``"offense"``, ``"kicker"``, ``"defense"`` or
+    ``"idp"``. The cost is proportional to the number of changed stats.
+    """
+
+    return (rules or DEFAULT_RULES).delta(kind, previous, change)
+
+
+class LiveScoreboard:
+    """Accumulated statlines and points for players with games in progress.
+
+    Each :meth:`apply` only touches the stats in the delta, so a league tick
+    costs O(changed stats) however many players are rostered.
+    """
+
+    def __init__(self, rules: Optional[ScoringRules] = None) -> None:
+        self.rules = rules or DEFAULT_RULES
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self.points: Dict[str, float] = {}
+        self._kinds: Dict[str, str] = {}
+
+    def apply(
+        self, player_id: str, change: Mapping[str, float], kind: str = "offense"
+    ) -> float:
+        """Add a stat delta for one player and return its point delta.
+
+        A player's ``kind`` is fixed by the first delta seen for them, and
+        their total starts from the score of an empty statline (a defense
+        that has allowed no points yet is already worth the shutout tier).
+        """
+
+        if player_id not in self._kinds:
+            self._kinds[player_id] = kind
+            self.stats[player_id] = {}
+            self.points[player_id] = float(self.rules.score_records([kind], [{}])[0])
+        kind = self._kinds[player_id]
+        stats = self.stats[player_id]
+        delta = self.rules.delta(kind, stats, change)
+        for column, step in change.items():
+            stats[column] = stats.get(column, 0.0) + step
+        self.points[player_id] += delta
+        return delta
+
+    def apply_many(
+        self, updates: Iterable[Tuple[str, Mapping[str, float], str]]
+    ) -> Dict[str, float]:
+        """Apply ``(player_id, change, kind)`` deltas; return point deltas per player."""
+
+        deltas: Dict[str, float] = {}
+        for player_id, change, kind in updates:
+            deltas[player_id] = deltas.get(player_id, 0.0) + self.apply(
+                player_id, change, kind
+            )
+        return deltas
@@ -0,0 +1,182 @@
+"""Scoring engine benchmarks on seeded synthetic statlines.
+
+Run ``python scoring_benchmark.py --write`` from this directory to refresh
+``benchmark_baseline.json`` after an intentional performance change;
+``test_scoring.py`` fails when an engine drifts from the golden cases or
+(with ``RUN_BENCHMARKS=1``) regresses past the tolerances stored there.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+sys.path.append(str(Path(__file__).resolve().parents[3] / "perfbench"))
+
+import perfbench  # noqa: E402
+from scoring import (  # noqa: E402
+    DEFAULT_RULES,
+    DefenseStatline,
+    IDPStatline,
+    KickerStatline,
+    OffenseStatline,
+    defense_points,
+    defense_points_batch,
+    idp_points,
+    idp_points_batch,
+    kicker_points,
+    kicker_points_batch,
+    offense_points,
+    offense_points_batch,
+)
+
+BASELINE_PATH = Path(__file__).with_name("benchmark_baseline.json")
+
+# kind: (statline class, scalar scorer, batch scorer, per-stat upper bound)
+KINDS: Dict[str, Tuple[Any, Callable[[Any], float], Callable, int]] = {
+    "offense": (OffenseStatline, offense_points, offense_points_batch, 220),
+    "kicker": (KickerStatline, kicker_points, kicker_points_batch, 6),
+    "defense": (DefenseStatline, defense_points, defense_points_batch, 45),
+    "idp": (IDPStatline, idp_points, idp_points_batch, 15),
+}
+
+SIZES = [10_000, 100_000, 1_000_000]
+# A million boxed statlines would need gigabytes; the scalar engine is timed
+# up to this size only.
+SCALAR_MAX = 100_000
+
+# Hand-picked statlines around bonus thresholds and points-allowed tiers; the
+# baseline stores their exact scalar points.
+GOLDEN: Dict[str, List[Dict[str, float]]] = {
+    "offense": [
+        {"Comp": 25, "Incomp": 15, "PassYds": 405, "PassTD": 3, "INT": 1},
+        {"PassYds": 299.96, "PassTD": 1, "PickSix": 1, "Pass1D": 11},
+        {"RushYds": 150, "RushTD": 1, "Rush1D": 8, "Rec": 4, "RecYds": 50},
+        {"RushYds": 99.9, "Rec": 7, "RecYds": 200, "RecTD": 2, "e40rec": 1},
+        {"RetYds": 91, "RetTD": 1, "TwoPt": 1, "FumblesLost": 2, "OffFumRetTD": 1},
+        {"Comp": 17.3, "Incomp": 9.1, "PassYds": 231.7, "RushYds": 18.2},
+    ],
+    "kicker": [
+        {"FG0_39": 2, "FG40_49": 1, "FG50_59": 1, "PAT": 3},
+        {"FG60": 1, "FGMiss0_39": 1, "FGMiss60": 1, "PATMiss": 1},
+        {"FG0_39": 1.4, "FG40_49": 0.6, "PAT": 2.3},
+    ],
+    "defense": [
+        {"PtsAllow": 0, "Sack": 3, "INT": 2, "FumRec": 1},
+        {"PtsAllow": 6.5, "Sack": 2.4, "RetYds": 31},
+        {"PtsAllow": 17, "TD": 1, "Safety": 1, "BlkKick": 1},
+        {"PtsAllow": 34, "RetTD": 1},
+        {"PtsAllow": 35},
+    ],
+    "idp": [
+        {"TackleSolo": 8, "TackleAst": 4, "Sack": 1, "FumForce": 1},
+        {"TackleSolo": 5, "INT": 1, "TD": 1, "PassDef": 2, "RetYds": 30},
+        {"TackleSolo": 4.7, "TackleAst": 2.2, "Sack": 0.35},
+    ],
+}
+
+
+def synthetic_stats(kind: str, size: int, seed: int) -> np.ndarray:
+    """Seeded ``size x fields`` integer-valued statlines of ``kind``."""
+
+    cls, _, _, high = KINDS[kind]
+    rng = np.random.default_rng(seed)
+    width = len(cls.__dataclass_fields__)
+    return rng.integers(0, high, size=(size, width)).astype(float)
+
+
+def golden_points(kind: str) -> List[float]:
+    cls, scalar, _, _ = KINDS[kind]
+    return [float(scalar(cls(**case))) for case in GOLDEN[kind]]
+
+
+def check_golden(baseline: Dict[str, Any]) -> List[str]:
+    """Engines whose golden-case points differ from the baseline bit for bit."""
+
+    failures = []
+    for kind, (cls, scalar, batch, _) in KINDS.items():
+        expected = baseline["golden"][kind]
+        statlines = [cls(**case) for case in GOLDEN[kind]]
+        matrix = np.array(
+            [[getattr(s, c) for c in cls.__dataclass_fields__] for s in statlines]
+        )
+        engines = {
+            "scalar": [float(scalar(s)) for s in statlines],
+            "batch": batch(matrix).tolist(),
+        }
+        for name, got in engines.items():
+            if got != expected:
+                failures.append(f"golden/{kind}/{name}: {got} != {expected}")
+        compiled = DEFAULT_RULES.score(kind, matrix)
+        gap = float(np.max(np.abs(compiled - expected)))
+        if gap > baseline["tolerance"]["gap"]:
+            failures.append(f"golden/{kind}/compiled: off by {gap}")
+    return failures
+
+
+def run(
+    repeat: int = 3, sizes: Sequence[int] = SIZES, scalar_max: int = SCALAR_MAX
+) -> perfbench.Results:
+    """Time every engine on every kind and size.
+
+    The scalar engine is skipped above ``scalar_max`` statlines. ``gap`` is
+    the largest absolute difference from the scalar points (or from the batch
+    engine where scalar was skipped).
+    """
+
+    results: perfbench.Results = {}
+    for kind, (cls, scalar, batch, _) in KINDS.items():
+        for size in sizes:
+            stats = synthetic_stats(kind, size, seed=size)
+            engines: Dict[str, Callable[[], np.ndarray]] = {
+                "batch": lambda: batch(stats),
+                "compiled": lambda: DEFAULT_RULES.score(kind, stats),
+            }
+            if size <= scalar_max:
+                statlines = [cls(*row) for row in stats.tolist()]
+                engines["scalar"] = lambda: np.array([scalar(s) for s in statlines])
+            timed = {
+                name: perfbench.best_of(fn, repeat) for name, fn in engines.items()
+            }
+            reference = timed.get("scalar", timed["batch"])[1]
+            results[f"{kind}-{size}"] = {
+                name: {
+                    "seconds": round(secs, 6),
+                    "gap": float(np.max(np.abs(points - reference))),
+                }
+                for name, (secs, points) in timed.items()
+            }
+    return results
+
+
+def compare(results: perfbench.Results, baseline: Dict[str, Any]) -> List[str]:
+    """Describe every measurement that regressed past the baseline tolerances.
+
+    The batch engine must match the scalar functions exactly; the compiled
+    dot-product engine within ``tolerance.gap``.
+    """
+
+    tol = baseline["tolerance"]
+    return perfbench.compare(
+        results,
+        baseline,
+        gap_allowed=lambda name: 0.0 if name in ("scalar", "batch") else tol["gap"],
+        gap_message="differs from scalar by",
+    )
+
+
+TOLERANCE = {"time_factor": 5.0, "time_floor_s": 0.05, "gap": 1e-9}
+
+
+if __name__ == "__main__":
+    perfbench.main(
+        __doc__,
+        run,
+        BASELINE_PATH,
+        TOLERANCE,
+        extra=lambda: {"golden": {kind: golden_points(kind) for kind in KINDS}},
+    )
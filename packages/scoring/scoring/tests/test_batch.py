@@ -0,0 +1,123 @@
+import random
+import time
+
+import numpy as np
+import pytest
+
+from scoring import (
+    OFFENSE_COLUMNS,
+    DefenseStatline,
+    IDPStatline,
+    KickerStatline,
+    OffenseStatline,
+    defense_points,
+    defense_points_batch,
+    idp_points,
+    idp_points_batch,
+    kicker_points,
+    kicker_points_batch,
+    offense_points,
+    offense_points_batch,
+    statline_matrix,
+    StatlineBatch,
+)
+from scoring.league_scoring import defense_points_allowed
+
+CASES = [
+    (OffenseStatline, offense_points, offense_points_batch, 600),
+    (KickerStatline, kicker_points, kicker_points_batch, 6),
+    (DefenseStatline, defense_points, defense_points_batch, 60),
+    (IDPStatline, idp_points, idp_points_batch, 15),
+]
+
+
+def _random_statlines(cls, high, n, seed, fractional=False):
+    rng = random.Random(seed)
+    names = list(cls.__dataclass_fields__)
+    out = []
+    for _ in range(n):
+        if fractional:
+            values = [round(rng.uniform(0, high), 3) for _ in names]
+        else:
+            values = [rng.randint(0, high) for _ in names]
+        out.append(cls(**dict(zip(names, values))))
+    return out
+
+
+@pytest.mark.parametrize("fractional", [False, True])
+@pytest.mark.parametrize("cls,scalar,batch,high", CASES)
+def test_batch_matches_scalar_exactly(cls, scalar, batch, high, fractional):
+    statlines = _random_statlines(cls, high, 500, seed=high, fractional=fractional)
+    got = batch(statline_matrix(statlines, cls))
+    expected = np.array([scalar(s) for s in statlines], dtype=float)
+    assert np.array_equal(got, expected)
+
+
+def test_bonus_thresholds_are_inclusive():
+    yards = [99, 100, 149.9, 150, 200, 299, 300, 400, 500, 650]
+    statlines = [OffenseStatline(PassYds=y, RushYds=y, RecYds=y) for y in yards]
+    got = offense_points_batch(statline_matrix(statlines, OffenseStatline))
+    assert got.tolist() == [offense_points(s) for s in statlines]
+
+
+def test_points_allowed_tiers():
+    pa = [-3, 0, 0.5, 1, 6, 6.5, 7, 13, 14, 20, 21, 27, 28, 34, 35, 60]
+    statlines = [DefenseStatline(PtsAllow=p) for p in pa]
+    got = defense_points_batch(statline_matrix(statlines, DefenseStatline))
+    assert got.tolist() == [defense_points_allowed(p) for p in pa]
+    assert got.tolist() == [-4, 10, 10, 7, 7, 7, 4, 4, 1, 1, 0, 0, -1, -1, -4, -4]
+
+
+def test_batch_rejects_wrong_width():
+    with pytest.raises(ValueError):
+        kicker_points_batch(np.zeros((3, 4)))
+
+
+def test_empty_batch():
+    assert statline_matrix([], KickerStatline).shape == (0, 10)
+    assert kicker_points_batch(np.zeros((0, 10))).shape == (0,)
+
+
+def test_full_season_scores_in_milliseconds():
+    # ~2,000 players x 18 weeks of offensive statlines.
+    rng = np.random.default_rng(0)
+    stats = rng.integers(0, 200, size=(36_000, 25)).astype(float)
+    offense_points_batch(stats)
+    start = time.perf_counter()
+    offense_points_batch(stats)
+    assert time.perf_counter() - start < 0.25
+
+
+def test_statlines_are_slotted_and_round_trip_dicts():
+    s = OffenseStatline(PassYds=250, PassTD=2)
+    assert not hasattr(s, "__dict__")
+    data = s.to_dict()
+    assert data["PassYds"] == 250 and len(data) == len(OFFENSE_COLUMNS)
+    assert OffenseStatline.from_dict({**data, "p10": 3.0}) == s
+
+
+def test_statline_batch_columns_records_and_points():
+    statlines = _random_statlines(OffenseStatline, 300, 50, seed=1)
+    batch = StatlineBatch.from_statlines(statlines, OffenseStatline)
+    assert len(batch) == 50
+    assert batch.PassYds.flags["C_CONTIGUOUS"]
+    assert batch.PassYds.tolist() == [s.PassYds for s in statlines]
+    batch.RushYds[0] = 120.0
+    assert batch.statline(0).RushYds == 120.0
+
+    records = batch.records()
+    assert records[1] == statlines[1].to_dict()
+    again = StatlineBatch.from_records(records, OffenseStatline)
+    assert np.array_equal(again.values, batch.values)
+    assert again.points().tolist() == [
+        offense_points(again.statline(i)) for i in range(len(again))
+    ]
+    with pytest.raises(AttributeError):
+        batch.Targets
+
+
+def test_statline_batch_is_compact():
+    statlines = _random_statlines(OffenseStatline, 300, 1000, seed=2, fractional=True)
+    batch = StatlineBatch.from_statlines(statlines, OffenseStatline)
+    assert batch.values.nbytes == 1000 * len(OFFENSE_COLUMNS) * 8
+    assert StatlineBatch(KickerStatline).values.shape == (0, 10)
@@ -0,0 +1,192 @@
+import json
+
+import numpy as np
+
+from scoring import (
+    DEFAULT_RULES,
+    DefenseStatline,
+    IDPStatline,
+    KickerStatline,
+    OffenseStatline,
+    ScoringRules,
+    compile_yahoo_scoring,
+    defense_points,
+    idp_points,
+    kicker_points,
+    league_rules,
+    offense_points,
+    scoring_kind,
+    statline_matrix,
+)
+from scoring import compiled
+from scoring.batch import OFFENSE_COLUMNS
+from scoring.compiled import COLUMNS
+
+KINDS = [
+    ("offense", OffenseStatline, offense_points, 600),
+    ("kicker", KickerStatline, kicker_points, 6),
+    ("defense", DefenseStatline, defense_points, 60),
+    ("idp", IDPStatline, idp_points, 15),
+]
+
+
+def _modifier(sid, value, bonuses=()):
+    stat = {"stat_id": sid, "value": str(value)}
+    if bonuses:
+        stat["bonuses"] = [
+            {"bonus": {"target": str(t), "points": str(p)}} for t, p in bonuses
+        ]
+    return {"stat": stat}
+
+
+# Half-PPR league with 4 point passing TDs, a 300 yard passing bonus and no
+# first-down or 40+ scoring.
+YAHOO_SETTINGS = {
+    "stat_categories": {
+        "stats": [
+            {"stat": {"stat_id": 4, "name": "Passing Yards"}},
+            {"stat": {"stat_id": 78, "name": "Targets", "is_only_display_stat": "1"}},
+        ]
+    },
+    "stat_modifiers": {
+        "stats": [
+            _modifier(4, 0.04, [(300, 3)]),
+            _modifier(5, 4),
+            _modifier(6, -1),
+            _modifier(9, 0.1),
+            _modifier(10, 6),
+            _modifier(11, 0.5),
+            _modifier(12, 0.1, [(150, 1), (100, 1)]),
+            _modifier(13, 6),
+            _modifier(78, 0.1),
+            _modifier(22, 4),
+            _modifier(21, 3),
+            _modifier(31, 0),
+            *[
+                _modifier(sid, pts)
+                for sid, pts in zip(range(50, 57), [10, 7, 4, 1, 0, -1, -4])
+            ],
+        ]
+    },
+}
+
+
+def test_default_rules_match_scalar_scoring():
+    rng = np.random.default_rng(3)
+    for kind, cls, scalar, high in KINDS:
+        stats = rng.integers(0, high, size=(300, len(COLUMNS[kind]))).astype(float)
+        statlines = [cls(*row) for row in stats.tolist()]
+        assert np.array_equal(statline_matrix(statlines, cls), stats)
+        got = DEFAULT_RULES.score(kind, stats)
+        assert np.allclose(got, [scalar(s) for s in statlines], rtol=0, atol=1e-9)
+
+
+def test_compile_yahoo_modifiers_and_bonuses():
+    rules = compile_yahoo_scoring(YAHOO_SETTINGS)
+    row = dict.fromkeys(OFFENSE_COLUMNS, 0.0)
+    row.update(PassYds=310, PassTD=2, INT=1, Rec=6, RecYds=120, RecTD=1, e40rec=1)
+    stats = np.array([[row[c] for c in OFFENSE_COLUMNS]])
+    expected = 310 * 0.04 + 3 + 2 * 4 - 1 + 6 * 0.5 + 120 * 0.1 + 1 + 6
+    assert abs(rules.score("offense", stats)[0] - expected) < 1e-9
+
+
+def test_compile_yahoo_kicker_defense_and_display_only():
+    rules = compile_yahoo_scoring(YAHOO_SETTINGS)
+    kicker = rules.coefficients["kicker"]
+    assert kicker[COLUMNS["kicker"].index("FG0_39")] == 3
+    assert kicker[COLUMNS["kicker"].index("FG40_49")] == 4
+    assert kicker[COLUMNS["kicker"].index("FG60")] == 0
+    assert rules.score_records(
+        ["defense"] * 3, [{"PtsAllow": p} for p in (0, 17, 40)]
+    ).tolist() == [
+        10,
+        1,
+        -4,
+    ]
+    # Targets are display-only and never score.
+    assert rules.score_records(["offense"], [{"Targets": 10}]).tolist() == [0.0]
+
+
+def test_compile_yahoo_scores_idp_returns():
+    settings = {
+        "stat_modifiers": {
+            "stats": [_modifier(38, 1), _modifier(14, 0.04), _modifier(15, 6)]
+        }
+    }
+    rules = compile_yahoo_scoring(settings)
+    record = {"TackleSolo": 5, "RetYds": 50, "RetTD": 1}
+    assert rules.score_records(["idp"], [record]).tolist() == [5 + 2 + 6]
+    # The same ids score offensive returners.
+    assert rules.score_records(["offense"], [{"RetTD": 1}]).tolist() == [6]
+
+
+def test_compile_yahoo_accepts_list_wrapped_settings():
+    wrapped = [
+        {"stat_categories": YAHOO_SETTINGS["stat_categories"]},
+        {"stat_modifiers": YAHOO_SETTINGS["stat_modifiers"]},
+    ]
+    a = compile_yahoo_scoring(wrapped)
+    b = compile_yahoo_scoring(YAHOO_SETTINGS)
+    assert all(np.array_equal(a.coefficients[k], b.coefficients[k]) for k in COLUMNS)
+
+
+def test_rules_round_trip_through_json():
+    rules = compile_yahoo_scoring(YAHOO_SETTINGS)
+    clone = ScoringRules.from_dict(json.loads(json.dumps(rules.to_dict())))
+    records = [{"PassYds": 320, "RecYds": 160, "Rec": 3}, {"RushYds": 80}]
+    kinds = ["offense", "offense"]
+    assert (
+        clone.score_records(kinds, records).tolist()
+        == rules.score_records(kinds, records).tolist()
+    )
+    assert clone.digest == rules.digest
+
+
+class _Redis:
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+
+def test_league_rules_cached_in_process_and_redis():
+    redis = _Redis()
+    rules = league_rules(901, YAHOO_SETTINGS, redis)
+    assert league_rules(901, YAHOO_SETTINGS, redis) is rules
+    (key,) = redis.store
+    assert key == f"scoring:901:{rules.digest}"
+
+    # Another process finds the compiled rules in Redis.
+    compiled._LEAGUE_RULES.clear()
+    again = league_rules(901, YAHOO_SETTINGS, redis)
+    assert again is not rules and again.digest == rules.digest
+
+    changed = {**YAHOO_SETTINGS, "stat_modifiers": {"stats": [_modifier(5, 6)]}}
+    assert league_rules(901, changed, redis).digest != rules.digest
+    assert league_rules(902, None) is DEFAULT_RULES
+
+
+def test_scoring_kind_by_position():
+    assert [scoring_kind(p) for p in ["QB", "K", "DEF", "LB", None]] == [
+        "offense",
+        "kicker",
+        "defense",
+        "idp",
+        "offense",
+    ]
+
+
+def test_league_rules_cache_drops_least_recently_used(monkeypatch):
+    monkeypatch.setattr(compiled, "_LEAGUE_RULES", compiled.OrderedDict())
+    monkeypatch.setattr(compiled, "LEAGUE_RULES_LIMIT", 2)
+    first = league_rules(1, YAHOO_SETTINGS)
+    league_rules(2, YAHOO_SETTINGS)
+    assert league_rules(1, YAHOO_SETTINGS) is first
+    league_rules(3, YAHOO_SETTINGS)
+    # League 2 was used least recently, so it is the one recompiled.
+    assert list(compiled._LEAGUE_RULES) == [1, 3]
+    assert league_rules(1, YAHOO_SETTINGS) is first
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from scoring import (
+    OFFENSE_COLUMNS,
+    DefenseStatline,
+    compile_yahoo_scoring,
+    defense_points,
+    offense_points_batch,
+    points_distribution,
+    summarize_points,
+)
+
+
+def _rushing_samples(mean_yards, n_samples, seed):
+    rng = np.random.default_rng(seed)
+    stats = np.zeros((n_samples, len(OFFENSE_COLUMNS)))
+    stats[:, OFFENSE_COLUMNS.index("RushYds")] = rng.normal(mean_yards, 25, n_samples)
+    return stats
+
+
+def test_bonus_threshold_skews_distribution():
+    dist = points_distribution("offense", _rushing_samples(98, 20000, seed=1))
+    # Linear scoring would put the mean at 9.8; the 100 yard bonus adds about
+    # 2 * P(yards >= 100) on top.
+    assert dist.mean == pytest.approx(9.8 + 2 * 0.468, abs=0.1)
+    assert dist.quantiles[0.1] < 9.8 < dist.quantiles[0.9]
+    assert (
+        dist.quantiles[0.9] - dist.quantiles[0.5]
+        > dist.quantiles[0.5] - dist.quantiles[0.1]
+    )
+
+
+def test_many_players_in_one_pass():
+    samples = np.stack([_rushing_samples(m, 500, seed=m) for m in (40, 80, 120)])
+    dist = points_distribution("offense", samples, quantiles=(0.25, 0.75))
+    assert dist.points.shape == (3, 500)
+    assert dist.mean.shape == (3,)
+    assert np.array_equal(dist.points[1], offense_points_batch(samples[1]))
+    assert list(dist.mean.argsort()) == [0, 1, 2]
+    summary = dist.summary(2)
+    assert set(summary) == {"mean", "variance", "p25", "p75"}
+    assert summary["p25"] <= summary["p75"]
+
+
+def test_points_allowed_tiers_in_samples():
+    pa = np.array([0, 3, 10, 17, 24, 31, 45], dtype=float)
+    samples = np.zeros((len(pa), 9))
+    samples[:, 6] = pa
+    dist = points_distribution("defense", samples)
+    expected = [defense_points(DefenseStatline(PtsAllow=p)) for p in pa]
+    assert dist.points.tolist() == expected
+    assert dist.summary()["p50"] == 1
+
+
+def test_league_rules_and_validation():
+    rules = compile_yahoo_scoring(
+        {"stat_modifiers": {"stats": [{"stat": {"stat_id": 9, "value": "0.2"}}]}}
+    )
+    dist = points_distribution(
+        "offense", _rushing_samples(50, 100, seed=3), rules=rules
+    )
+    assert dist.mean == pytest.approx(
+        0.2 * _rushing_samples(50, 100, seed=3)[:, 7].mean()
+    )
+    with pytest.raises(ValueError):
+        points_distribution("offense", np.zeros(25))
+    with pytest.raises(ValueError):
+        points_distribution("offense", np.zeros((0, 25)))
+
+
+def test_summarized_quantiles_match_numpy():
+    points = np.random.default_rng(4).gamma(2.0, 5.0, (3, 1001))
+    levels = np.linspace(0.0, 1.0, 21)
+    dist = summarize_points(points, levels)
+    expected = np.quantile(points, levels, axis=-1)
+    for i, q in enumerate(levels):
+        assert np.allclose(dist.quantiles[q], expected[i])
+    assert summarize_points(points[0]).summary()["p50"] == pytest.approx(
+        np.median(points[0])
+    )
+    with pytest.raises(ValueError):
+        summarize_points(np.zeros((2, 0)))
@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from scoring import (
+    DEFAULT_RULES,
+    DefenseStatline,
+    LiveScoreboard,
+    OffenseStatline,
+    compile_yahoo_scoring,
+    defense_points,
+    offense_points,
+    points_delta,
+)
+
+
+def test_rush_yards_crossing_bonus_thresholds():
+    before = {"RushYds": 95, "RushTD": 1}
+    change = {"RushYds": 60}
+    delta = points_delta("offense", before, change)
+    # 6 rushing points plus the 100 and 150 yard bonuses.
+    assert delta == pytest.approx(6 + 2 + 2)
+    after = OffenseStatline(RushYds=155, RushTD=1)
+    assert delta == pytest.approx(
+        offense_points(after) - offense_points(OffenseStatline(**before))
+    )
+
+
+def test_stat_correction_removes_bonus():
+    assert points_delta("offense", {"PassYds": 305}, {"PassYds": -10}) == (
+        pytest.approx(-10 / 25 - 2)
+    )
+
+
+def test_points_allowed_tier_changes():
+    assert points_delta("defense", {"PtsAllow": 0}, {"PtsAllow": 3}) == -3
+    assert points_delta("defense", {"PtsAllow": 20}, {"PtsAllow": 7}) == -1
+    assert points_delta("defense", {"PtsAllow": 10}, {"PtsAllow": 2}) == 0
+    assert points_delta("defense", {}, {"Sack": 2}) == 2
+
+
+def test_unknown_and_zero_changes_are_ignored():
+    assert points_delta("offense", {}, {"Targets": 5, "Rec": 0}) == 0
+
+
+def test_random_deltas_match_full_rescoring():
+    rng = random.Random(7)
+    board = LiveScoreboard()
+    for _ in range(500):
+        pid = rng.choice(["qb", "def"])
+        if pid == "qb":
+            change = {
+                rng.choice(["PassYds", "RushYds", "PassTD", "Comp", "Incomp"]): (
+                    rng.randint(-5, 40)
+                )
+            }
+            board.apply(pid, change)
+        else:
+            board.apply(
+                pid, {rng.choice(["PtsAllow", "Sack"]): rng.randint(0, 7)}, "defense"
+            )
+    assert board.points["qb"] == pytest.approx(
+        offense_points(OffenseStatline(**board.stats["qb"]))
+    )
+    assert board.points["def"] == pytest.approx(
+        defense_points(DefenseStatline(**board.stats["def"]))
+    )
+
+
+def test_scoreboard_uses_league_rules():
+    rules = compile_yahoo_scoring(
+        {
+            "stat_modifiers": {
+                "stats": [
+                    {
+                        "stat": {
+                            "stat_id": 9,
+                            "value": "0.1",
+                            "bonuses": [{"bonus": {"target": "100", "points": "5"}}],
+                        }
+                    }
+                ]
+            }
+        }
+    )
+    board = LiveScoreboard(rules)
+    deltas = board.apply_many(
+        [("rb", {"RushYds": 90}, "offense"), ("rb", {"RushYds": 15}, "offense")]
+    )
+    assert deltas == {"rb": pytest.approx(10.5 + 5)}
+    assert board.points["rb"] == pytest.approx(
+        rules.score_records(["offense"], [board.stats["rb"]])[0]
+    )
+    assert board.rules is not DEFAULT_RULES
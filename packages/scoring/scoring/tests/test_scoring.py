@@ -1,3 +1,8 @@
+import json
+
+import perfbench
+import pytest
+
 from scoring import (
     OffenseStatline,
     KickerStatline,
@@ -8,6 +13,7 @@ from scoring import (
     defense_points,
     idp_points,
 )
+from scoring_benchmark import BASELINE_PATH, check_golden, compare, run
 
 
 def test_offense_qb_bonus_and_penalties():
@@ -151,3 +157,33 @@ def test_idp_dl_safety():
     pts = idp_points(s)
     expected = 1.5 * 3 + 4 * 2 + 2 * 1
     assert pts == expected
+
+
+def test_golden_cases_bit_for_bit():
+    baseline = json.loads(BASELINE_PATH.read_text())
+    failures = check_golden(baseline)
+    assert not failures, "\n".join(failures)
+
+
+@pytest.mark.skipif(not perfbench.enabled(), reason="set RUN_BENCHMARKS=1")
+def test_engines_within_baseline():
+    baseline = json.loads(BASELINE_PATH.read_text())
+    results = run(repeat=3, sizes=[10_000, 100_000], scalar_max=10_000)
+    failures = compare(results, baseline)
+    assert not failures, "\n".join(failures)
+
+
+def test_compare_flags_blowups_and_drift():
+    baseline = json.loads(BASELINE_PATH.read_text())
+    slow = {
+        case: {
+            name: {"seconds": got["seconds"] * 100 + 1.0, "gap": got["gap"]}
+            for name, got in engines.items()
+        }
+        for case, engines in baseline["cases"].items()
+    }
+    assert len(compare(slow, baseline)) == sum(len(e) for e in slow.values())
+    drift = {"offense-10000": {"batch": {"seconds": 0.0, "gap": 1e-12}}}
+    assert compare(drift, baseline) == [
+        "offense-10000/batch: differs from scalar by 1e-12"
+    ]
@@ -7,7 +7,14 @@ from celery.schedules import crontab  # type: ignore[import-untyped]
 BROKER = os.getenv("REDIS_URL", "rediss://redis:6379/0")
 BACKEND = BROKER
 celery = Celery("edge", broker=BROKER, backend=BACKEND)
-celery.conf.task_routes = {"tasks.*": {"queue": "default"}}
+# Projection runs shard players across a process pool of their own, which
+# prefork (daemonic) worker processes cannot start. They get a queue served
+# by a solo-pool worker instead:
+#   celery -A tasks worker -Q projections --pool=solo
+celery.conf.task_routes = {
+    "tasks.project_week": {"queue": "projections"},
+    "tasks.*": {"queue": "default"},
+}
 
 
 def _crontab_from_env(env_name: str, default: str) -> crontab:
@@ -30,15 +37,17 @@ celery.conf.beat_schedule = {
     "nightly-sync": {
         "task": "tasks.project_week",
         "schedule": _crontab_from_env("NIGHTLY_SYNC_CRON", "0 3 * * *"),
-        "args": (1,),
     },
     "tuesday-waivers": {
         "task": "tasks.waiver_shortlist",
         "schedule": _crontab_from_env("WAIVER_SHORTLIST_CRON", "0 9 * * TUE"),
         "args": (528886, 1, 1),
     },
+    # Only players whose projection inputs changed are re-projected, so this
+    # is cheap enough to run every few minutes. Without args the task
+    # resolves the current week when it runs.
     "gameday-refresh": {
-        "task": "tasks.ping",
+        "task": "tasks.project_week",
         "schedule": timedelta(minutes=int(os.getenv("GAMEDAY_REFRESH_MINUTES", "10"))),
     },
 }
@@ -1,18 +1,28 @@
 import csv
+import gzip
+import hashlib
+import json
 import os
 import sys
-from datetime import datetime
+import tempfile
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import date, datetime, timedelta
 from pathlib import Path
 import importlib
 from types import ModuleType
-from typing import Any, Dict
+from urllib.parse import urlparse
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple
 
+import numpy as np
 import requests
 import uvicorn
 from fastapi import FastAPI
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func, tuple_
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session, selectinload, sessionmaker
 
 from celery_app import celery  # type: ignore
 
@@ -21,6 +31,7 @@ sys.path.append(str(Path(__file__).resolve().parents[2] / "apps/api"))
 sys.path.append(str(Path(__file__).resolve().parents[2] / "packages/projections"))
 sys.path.append(str(Path(__file__).resolve().parents[2] / "packages"))
 sys.path.append(str(Path(__file__).resolve().parents[2] / "packages/scoring"))
+sys.path.append(str(Path(__file__).resolve().parents[2] / "packages/optimizer"))
 
 
 models: ModuleType | None
@@ -33,11 +44,30 @@ League: Any = getattr(models, "League", None) if models else None
 Player: Any = getattr(models, "Player", None) if models else None
 Projection: Any = getattr(models, "Projection", None) if models else None
 Weather: Any = getattr(models, "Weather", None) if models else None
+Baseline: Any = getattr(models, "Baseline", None) if models else None
 Injury: Any = getattr(models, "Injury", None) if models else None
 PlayerLink: Any = getattr(models, "PlayerLink", None) if models else None
+Team: Any = getattr(models, "Team", None) if models else None
+RosterSlot: Any = getattr(models, "RosterSlot", None) if models else None
+ProjectionHorizon: Any = getattr(models, "ProjectionHorizon", None) if models else None
 from app.waiver_service import compute_waiver_shortlist  # type: ignore  # noqa: E402
-from projections import project_offense  # type: ignore  # noqa: E402
-
+from optimizer import (  # type: ignore  # noqa: E402
+    LineupState,
+    SlotChange,
+    compile_roster,
+    optimize_league,
+    player_positions,
+)
+from projections import (  # type: ignore  # noqa: E402
+    LAST_WEEK,
+    WeeklyCounts,
+    aggregate_player_stats,
+    aggregate_plays,
+    compute_baselines,
+    project_horizons_sharded,
+    project_pool_sharded,
+)
+from scoring import league_rules, scoring_kind  # type: ignore  # noqa: E402
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 try:
@@ -49,6 +79,30 @@ SessionLocal: sessionmaker[Session] | None = (
 )
 
 DATA_PATH = Path(os.getenv("DATA_PATH", "/data"))
+# Monte Carlo games per player in scheduled projection runs; 0 disables
+# simulation and falls back to the point projection's naive variance.
+PROJECTION_SAMPLES = int(os.getenv("PROJECTION_SAMPLES", "10000"))
+# Processes projection shards run on; defaults to every core. Runs inside a
+# daemonic (prefork) task process fall back to in-process shards.
+PROJECTION_WORKERS = int(os.getenv("PROJECTION_WORKERS", "0")) or os.cpu_count()
+# Lineups are optimized from our own projections; other sources (e.g. Yahoo)
+# are stored for comparison only.
+PROJECTION_SOURCE = "internal"
+# Downloads are streamed to disk in chunks of this many bytes.
+FETCH_CHUNK_BYTES = 1 << 20
+FETCH_TIMEOUT_SECONDS = int(os.getenv("FETCH_TIMEOUT_SECONDS", "60"))
+# Concurrent downloads in a bulk nflverse fetch.
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", "4"))
+
+_NFLVERSE_RELEASES = "https://github.com/nflverse/nflverse-data/releases/download"
+# nflverse files fetched in bulk, by name; ``{season}`` is filled in per run.
+NFLVERSE_RESOURCES: Dict[str, str] = {
+    "rosters": f"{_NFLVERSE_RELEASES}/rosters/roster_{{season}}.csv",
+    "injuries": f"{_NFLVERSE_RELEASES}/injuries/injuries_{{season}}.csv",
+    "schedules": "https://github.com/nflverse/nfldata/raw/master/data/games.csv",
+    "pbp": f"{_NFLVERSE_RELEASES}/pbp/play_by_play_{{season}}.csv.gz",
+    "player_stats": f"{_NFLVERSE_RELEASES}/player_stats/player_stats_{{season}}.csv",
+}
 
 
 @celery.task
@@ -56,33 +110,203 @@ def ping() -> str:
     return "pong"
 
 
-def fetch_and_cache(url: str, dest: Path) -> Path:
-    """Fetch a file supporting ETag caching."""
+def _manifest_path(dest: Path) -> Path:
+    return dest.with_suffix(dest.suffix + ".manifest.json")
 
-    etag_file = dest.with_suffix(dest.suffix + ".etag")
-    headers: Dict[str, str] = {}
-    if etag_file.exists():
-        headers["If-None-Match"] = etag_file.read_text()
 
-    resp = requests.get(url, headers=headers)
-    if resp.status_code == 304 and dest.exists():
-        return dest
-    resp.raise_for_status()
+def _read_manifest(dest: Path) -> Dict[str, Any]:
+    """The cache manifest of ``dest``, or ``{}`` if it does not match the file."""
+
+    try:
+        manifest = json.loads(_manifest_path(dest).read_text())
+    except (OSError, ValueError):
+        return {}
+    # A cached file whose size disagrees with its manifest is refetched in full.
+    if not dest.exists() or dest.stat().st_size != manifest.get("size"):
+        return {}
+    return manifest
+
+
+def _replace_atomic(dest: Path, chunks: Iterable[bytes]) -> Tuple[int, str]:
+    """Write ``chunks`` to a temp file beside ``dest`` and rename it over ``dest``.
+
+    Returns the size and sha256 of what was written. ``dest`` is left
+    untouched if writing fails part way.
+    """
 
     dest.parent.mkdir(parents=True, exist_ok=True)
-    dest.write_bytes(resp.content)
-    etag = resp.headers.get("ETag")
-    if etag:
-        etag_file.write_text(etag)
+    fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".part")
+    digest, size = hashlib.sha256(), 0
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, dest)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return size, digest.hexdigest()
+
+
+def _gunzip(chunks: Iterable[bytes], keep_compressed: bool = False) -> Iterator[bytes]:
+    """Decompress a gzip stream chunk by chunk.
+
+    With ``keep_compressed`` the original chunks are passed through and only
+    checked. A corrupt or truncated stream raises ``ValueError``.
+    """
+
+    inflate = zlib.decompressobj(wbits=31)
+    try:
+        for chunk in chunks:
+            data = inflate.decompress(chunk)
+            yield chunk if keep_compressed else data
+        tail = inflate.flush()
+    except (zlib.error, EOFError) as exc:
+        raise ValueError(f"corrupt gzip stream: {exc}") from exc
+    if not keep_compressed:
+        yield tail
+    if not inflate.eof:
+        raise ValueError("truncated gzip stream")
+
+
+def fetch_and_cache(
+    url: str, dest: Path, session: requests.Session | None = None
+) -> Path:
+    """Fetch a file supporting ETag caching (see :func:`_fetch_if_changed`)."""
+
+    _fetch_if_changed(url, dest, session)
     return dest
 
 
+def _fetch_if_changed(
+    url: str, dest: Path, session: requests.Session | None = None
+) -> bool:
+    """Fetch ``url`` into ``dest`` unless the cached copy is current.
+
+    Returns whether ``dest`` was rewritten. Requests go through ``session``
+    when given, so a batch of downloads shares its kept-alive connections.
+
+    The body is streamed in ``FETCH_CHUNK_BYTES`` chunks to a temp file that
+    replaces ``dest`` only once complete, so memory stays flat and a failed
+    download keeps the previous copy. The validators, size and sha256 of the
+    cached copy are kept in ``<dest>.manifest.json``. A ``.gz`` URL cached
+    under a name without ``.gz`` is decompressed on the way, and one kept
+    compressed is checked on the way, so a corrupt or truncated body raises
+    ``ValueError`` and keeps the previous copy; a gzip ``Content-Encoding``
+    is always decoded.
+    """
+
+    manifest = _read_manifest(dest)
+    headers: Dict[str, str] = {}
+    if manifest.get("etag"):
+        headers["If-None-Match"] = manifest["etag"]
+    if manifest.get("last_modified"):
+        headers["If-Modified-Since"] = manifest["last_modified"]
+
+    get = session.get if session is not None else requests.get
+    resp = get(url, headers=headers, stream=True, timeout=FETCH_TIMEOUT_SECONDS)
+    try:
+        if resp.status_code == 304 and manifest:
+            return False
+        resp.raise_for_status()
+        chunks = resp.iter_content(FETCH_CHUNK_BYTES)
+        if urlparse(url).path.endswith(".gz"):
+            chunks = _gunzip(chunks, keep_compressed=dest.suffix == ".gz")
+        size, sha256 = _replace_atomic(dest, chunks)
+    finally:
+        resp.close()
+
+    manifest = {
+        "url": url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "size": size,
+        "sha256": sha256,
+    }
+    _replace_atomic(_manifest_path(dest), [json.dumps(manifest).encode()])
+    # Caches from before manifests kept the ETag in a sidecar of its own.
+    dest.with_suffix(dest.suffix + ".etag").unlink(missing_ok=True)
+    return True
+
+
+def _cache_name(url: str) -> str:
+    return Path(urlparse(url).path).name
+
+
 @celery.task
 def fetch_nflverse(url: str) -> str:
     """Download nflverse resource to the shared data path."""
 
-    dest = DATA_PATH / Path(url).name
-    return str(fetch_and_cache(url, dest))
+    return str(fetch_and_cache(url, DATA_PATH / _cache_name(url)))
+
+
+def fetch_resources(
+    resources: Mapping[str, str],
+    dest_dir: Path,
+    max_workers: int = FETCH_WORKERS,
+    session: requests.Session | None = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch several ``name: url`` resources concurrently into ``dest_dir``.
+
+    At most ``max_workers`` downloads run at once over one keep-alive
+    session, each cached as in :func:`fetch_and_cache`. The report maps each
+    name to its ``path`` and whether it ``changed``; a failed download
+    carries an ``error`` instead and leaves the other resources unaffected.
+    """
+
+    own_session = session is None
+    if session is None:
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(max_workers, 1))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def fetch(url: str) -> Dict[str, Any]:
+        dest = dest_dir / _cache_name(url)
+        try:
+            changed = _fetch_if_changed(url, dest, session)
+        except (
+            requests.RequestException,
+            OSError,
+            ValueError,
+            zlib.error,
+            EOFError,
+        ) as exc:
+            return {"url": url, "changed": False, "error": str(exc)}
+        return {"url": url, "path": str(dest), "changed": changed}
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as pool:
+            reports = pool.map(fetch, resources.values())
+            return dict(zip(resources, reports))
+    finally:
+        if own_session:
+            session.close()
+
+
+@celery.task
+def fetch_nflverse_resources(
+    season: int, names: List[str] | None = None
+) -> Dict[str, Dict[str, Any]]:
+    """Download the season's nflverse resources to the shared data path.
+
+    ``names`` selects from :data:`NFLVERSE_RESOURCES` (default all). Ingests
+    should only be run for resources reported as ``changed``.
+    """
+
+    selected = (
+        NFLVERSE_RESOURCES
+        if names is None
+        else {name: NFLVERSE_RESOURCES[name] for name in names}
+    )
+    return fetch_resources(
+        {name: url.format(season=season) for name, url in selected.items()},
+        DATA_PATH,
+    )
 
 
 def ingest_injuries_from_csv(path: Path, session: Session) -> int:
@@ -125,6 +349,166 @@ def ingest_injuries(csv_path: str) -> int:
         session.close()
 
 
+# nflverse columns read by the baseline builder, per file kind
+BASELINE_SOURCES: Dict[str, Tuple[Any, Tuple[str, ...]]] = {
+    "pbp": (
+        aggregate_plays,
+        (
+            "week",
+            "posteam",
+            "passer_player_id",
+            "rusher_player_id",
+            "receiver_player_id",
+            "pass_attempt",
+            "sack",
+            "complete_pass",
+            "passing_yards",
+            "receiving_yards",
+            "pass_touchdown",
+            "interception",
+            "rush_attempt",
+            "rushing_yards",
+            "rush_touchdown",
+            "pass_oe",
+        ),
+    ),
+    "player_stats": (
+        aggregate_player_stats,
+        (
+            "week",
+            "player_id",
+            "attempts",
+            "completions",
+            "passing_yards",
+            "passing_tds",
+            "interceptions",
+            "carries",
+            "rushing_yards",
+            "rushing_tds",
+            "targets",
+            "receptions",
+            "receiving_yards",
+            "receiving_tds",
+        ),
+    ),
+}
+
+
+def _read_weeks(
+    path: Path, names: Tuple[str, ...], season: int, from_week: int
+) -> Dict[str, List[str]]:
+    """Stream ``names`` columns of a (gzipped) CSV.
+
+    Only rows of ``season`` from ``from_week`` on are kept; missing columns
+    read as empty strings. Rows are screened on whichever of their season
+    and week fields comes first before the full row is parsed: nflverse
+    play-by-play rows run to ~370 columns, and every run skips whole seasons
+    of earlier weeks.
+    """
+
+    columns: Dict[str, List[str]] = {name: [] for name in names}
+    opener: Any = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", newline="") as f:
+        reader = csv.reader(f)
+        index = {name: i for i, name in enumerate(next(reader, []))}
+        missing = [key for key in ("season", "week") if key not in index]
+        if missing:
+            raise ValueError(
+                f"{path.name} has no {' or '.join(missing)} column; expected an "
+                "nflverse play-by-play or player_stats CSV"
+            )
+        season_i, week_i = index["season"], index["week"]
+        picks = [(columns[name], index.get(name)) for name in names]
+        wanted = str(season)
+
+        def keep(key: int, value: str) -> bool:
+            if key == season_i:
+                return value == wanted
+            return value.isdigit() and int(value) >= from_week
+
+        first = min(season_i, week_i)
+        pending: List[str] = []
+        for line in f:
+            if pending or line.count('"') % 2:
+                # A quoted field spans lines: gather the whole record.
+                pending.append(line)
+                if "".join(pending).count('"') % 2:
+                    continue
+                line, pending = "".join(pending), []
+            else:
+                # Splitting stops at the first key column; a quote before it
+                # may hide a comma, so leave such rows to the csv parser.
+                head = line.split(",", first + 1)
+                if len(head) <= first + 1 or (
+                    '"' not in line[: len(line) - len(head[-1])]
+                    and not keep(first, head[first])
+                ):
+                    continue
+            row = next(csv.reader([line]))
+            if len(row) <= max(season_i, week_i):
+                continue
+            if not (keep(season_i, row[season_i]) and keep(week_i, row[week_i])):
+                continue
+            for values, i in picks:
+                values.append(row[i] if i is not None else "")
+    return columns
+
+
+def build_baselines(
+    session: Session,
+    path: Path,
+    season: int,
+    kind: str = "pbp",
+    store: Path | None = None,
+) -> Dict[str, Any]:
+    """Update ``Baseline`` rows from an nflverse ``pbp`` or ``player_stats`` file.
+
+    Per player-week counters are kept in ``store`` (an ``.npz`` under
+    ``DATA_PATH`` by default). Each run re-reads only the latest stored week,
+    which may have been partial, and anything newer; earlier weeks come from
+    the store. Players are matched on ``PlayerLink.gsis_id`` and their metrics
+    bulk-upserted. A file without ``season`` and ``week`` columns raises
+    ``ValueError``.
+    """
+
+    if Baseline is None or PlayerLink is None:
+        return {"weeks": [], "baselines": 0}
+    aggregate, names = BASELINE_SOURCES[kind]
+    store = store or DATA_PATH / f"baseline_counts_{kind}_{season}.npz"
+    stored = WeeklyCounts.load(store)
+    from_week = max(stored.last_week, 1)
+    fresh = aggregate(_read_weeks(path, names, season, from_week))
+    counts = stored.before(from_week).merge(fresh)
+    counts.save(store)
+
+    metrics = compute_baselines(counts)
+    links = dict(session.query(PlayerLink.gsis_id, PlayerLink.player_id))
+    rows = [
+        {"player_id": links[gsis_id], "metric": metric, "value": value}
+        for gsis_id, values in metrics.items()
+        if gsis_id in links
+        for metric, value in values.items()
+    ]
+    _bulk_upsert(session, Baseline.__table__, ("player_id", "metric"), rows)
+    session.commit()
+    return {
+        "weeks": sorted(set(fresh.weeks.tolist())),
+        "players": len({r["player_id"] for r in rows}),
+        "baselines": len(rows),
+    }
+
+
+@celery.task
+def update_baselines(path: str, season: int, kind: str = "pbp") -> Dict[str, Any]:
+    if SessionLocal is None:
+        return {"weeks": [], "baselines": 0}
+    session: Session = SessionLocal()
+    try:
+        return build_baselines(session, Path(path), season, kind)
+    finally:
+        session.close()
+
+
 def compute_waf(forecast: Dict[str, Any]) -> float:
     """Compute a simple Weather Adjustment Factor from NWS forecast."""
 
@@ -169,38 +553,367 @@ def update_weather(game_id: str, lat: float, lon: float) -> float:
     return waf
 
 
-def generate_projections(session: Session, week: int) -> int:
-    players = session.query(Player).all()
-    count = 0
-    for player in players:
-        baselines = {b.metric: b.value for b in player.baselines}
-        proe = baselines.get("proe", 0)
-        weather = (
-            session.query(Weather).filter_by(game_id=f"{week}-{player.id}").first()
-        )
-        waf = weather.waf if weather else 1.0
-        categories, points, variance = project_offense(baselines, proe, waf)
-        session.merge(
-            Projection(
-                player_id=player.id,
-                week=week,
-                projected_points=points,
-                variance=variance,
-                data=categories,
+def _upsert_statement(
+    table: Any, keys: Tuple[str, ...], dialect: str, constraint: str | None = None
+) -> Any:
+    """Bulk upsert on the unique ``keys`` of ``table`` for ``dialect``.
+
+    Conflicting rows get every non-key column overwritten. Postgres targets
+    ``constraint`` by name when given, else the key columns. Returns ``None``
+    when the dialect has no native upsert.
+    """
+
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        stmt = pg_insert(table)
+        updates: Dict[str, Any] = {
+            c.name: stmt.excluded[c.name]
+            for c in table.columns
+            if c.name not in keys and c.name not in ("id", "created_at", "updated_at")
+        }
+        if "updated_at" in table.c:
+            updates["updated_at"] = func.now()
+        if constraint:
+            return stmt.on_conflict_do_update(constraint=constraint, set_=updates)
+        return stmt.on_conflict_do_update(index_elements=list(keys), set_=updates)
+    if dialect == "sqlite":
+        return table.insert().prefix_with("OR REPLACE")
+    return None
+
+
+def _bulk_upsert(
+    session: Session,
+    table: Any,
+    keys: Tuple[str, ...],
+    rows: List[Dict[str, Any]],
+    constraint: str | None = None,
+) -> None:
+    if not rows:
+        return
+    stmt = _upsert_statement(table, keys, session.get_bind().dialect.name, constraint)
+    if stmt is None:
+        # No portable upsert: clear the conflicting keys, then insert
+        session.execute(
+            table.delete().where(
+                tuple_(*(table.c[k] for k in keys)).in_(
+                    [tuple(r[k] for k in keys) for r in rows]
+                )
             )
         )
-        count += 1
+        stmt = table.insert()
+    session.execute(stmt, rows)
+
+
+def _upsert_projections(session: Session, rows: List[Dict[str, Any]]) -> None:
+    _bulk_upsert(
+        session,
+        Projection.__table__,
+        ("player_id", "week", "source"),
+        rows,
+        "uq_projections_player_week_source",
+    )
+
+
+def _fingerprint(*parts: Any) -> str:
+    payload = json.dumps(parts, default=str).encode()
+    return hashlib.sha1(payload).hexdigest()[:16]
+
+
+def _inputs_hash(
+    baselines: Dict[str, float],
+    waf: float,
+    status: str | None,
+    source: str,
+    n_samples: int = 0,
+    kind: str = "offense",
+) -> str:
+    return _fingerprint(sorted(baselines.items()), waf, status, source, n_samples, kind)
+
+
+def _load_baselines(
+    session: Session, player_ids: List[int]
+) -> Dict[int, Dict[str, float]]:
+    """Every player's baselines, keyed by metric, in one query."""
+
+    baselines: Dict[int, Dict[str, float]] = {pid: {} for pid in player_ids}
+    for pid, metric, value in session.query(
+        Baseline.player_id, Baseline.metric, Baseline.value
+    ):
+        if pid in baselines:
+            baselines[pid][metric] = value
+    return baselines
+
+
+def refresh_projections(
+    session: Session,
+    week: int,
+    source: str = "internal",
+    force: bool = False,
+    n_samples: int = 0,
+    max_workers: int | None = None,
+) -> Dict[str, int]:
+    """Re-project players whose inputs changed since their last projection.
+
+    Inputs are the player's baselines, position group, the week's weather
+    WAF, their latest injury status and the projection source; their
+    fingerprint is stored on the projection row. Each position group is
+    projected with its own estimator. ``force`` re-projects everyone.
+    Returns counts of ``updated`` and ``skipped`` players. Every input is
+    loaded with a fixed number of queries and every row written with one
+    bulk upsert.
+
+    With ``n_samples`` each offensive player's week is also simulated,
+    seeded by the week and their id: the variance comes from the simulated points and
+    ``data`` gains their ``p10``/``p50``/``p90`` and quantile ``sketch``.
+    Shards of players run on up to ``max_workers`` processes.
+    """
+
+    positions = dict(
+        session.query(Player.id, Player.position_primary).order_by(Player.id)
+    )
+    player_ids = list(positions)
+    if not player_ids:
+        return {"updated": 0, "skipped": 0}
+    baselines = _load_baselines(session, player_ids)
+    # Weather rows are keyed "{week}-{player_id}"
+    waf_by_game = dict(
+        session.query(Weather.game_id, Weather.waf).filter(
+            Weather.game_id.like(f"{week}-%")
+        )
+    )
+    # Later reports overwrite earlier ones, leaving each player's latest status
+    status = dict(
+        session.query(Injury.player_id, Injury.status).order_by(
+            Injury.report_time, Injury.id
+        )
+    )
+    previous = dict(
+        session.query(Projection.player_id, Projection.inputs_hash).filter(
+            Projection.week == week, Projection.source == source
+        )
+    )
+
+    dirty: List[Tuple[int, float, str]] = []
+    for pid in player_ids:
+        waf = waf_by_game.get(f"{week}-{pid}", 1.0)
+        digest = _inputs_hash(
+            baselines[pid],
+            waf,
+            status.get(pid),
+            source,
+            n_samples,
+            scoring_kind(positions[pid]),
+        )
+        if force or previous.get(pid) != digest:
+            dirty.append((pid, waf, digest))
+    if dirty:
+        pool = [baselines[pid] for pid, _, _ in dirty]
+        proe = np.array([b.get("proe", 0) for b in pool], dtype=float)
+        wafs = np.array([waf for _, waf, _ in dirty])
+        records, points, variance = project_pool_sharded(
+            [positions[pid] for pid, _, _ in dirty],
+            pool,
+            proe,
+            wafs,
+            n_samples=n_samples,
+            seed=week,
+            max_workers=max_workers,
+            keys=[pid for pid, _, _ in dirty],
+        )
+        _upsert_projections(
+            session,
+            [
+                {
+                    "player_id": pid,
+                    "week": week,
+                    "source": source,
+                    "projected_points": pts,
+                    "variance": var,
+                    "data": data,
+                    "inputs_hash": digest,
+                }
+                for (pid, _, digest), data, pts, var in zip(
+                    dirty, records, points.tolist(), variance.tolist()
+                )
+            ],
+        )
+        session.commit()
+    return {"updated": len(dirty), "skipped": len(player_ids) - len(dirty)}
+
+
+def generate_projections(
+    session: Session, week: int, source: str = "internal", force: bool = False
+) -> int:
+    """Project players for ``week``; returns how many rows were (re)written."""
+
+    return refresh_projections(session, week, source, force)["updated"]
+
+
+def refresh_horizons(
+    session: Session,
+    week: int,
+    source: str = "internal",
+    last_week: int = LAST_WEEK,
+    max_workers: int | None = None,
+    force: bool = False,
+) -> int:
+    """Store 1-week to rest-of-season horizons from ``week`` for dirty players.
+
+    All weeks of each position group are projected in one batch; weeks
+    without a weather row use a neutral WAF and bye weeks come from
+    ``Player.bye_week``. Weekly variance reuses the dispersion
+    (variance / points) of the player's stored projection for ``week``, so
+    a simulated projection carries over; players without one keep the
+    estimator's variance. As in :func:`refresh_projections`, only players
+    whose inputs changed are projected unless ``force``. Shards of players
+    run on up to ``max_workers`` processes. Returns the number of horizon
+    rows written.
+    """
+
+    if week > last_week:
+        return 0
+    players = (
+        session.query(Player.id, Player.position_primary, Player.bye_week)
+        .order_by(Player.id)
+        .all()
+    )
+    if not players:
+        return 0
+    player_ids = [pid for pid, _, _ in players]
+    column = {pid: i for i, pid in enumerate(player_ids)}
+    baselines = _load_baselines(session, player_ids)
+    waf = np.ones((len(player_ids), last_week - week + 1))
+    # Weather rows are keyed "{week}-{player_id}"
+    for game_id, value in session.query(Weather.game_id, Weather.waf):
+        game_week, _, pid = str(game_id).partition("-")
+        if not (game_week.isdigit() and pid.isdigit()) or value is None:
+            continue
+        if week <= int(game_week) <= last_week and int(pid) in column:
+            waf[column[int(pid)], int(game_week) - week] = value
+    dispersion = {
+        pid: round(var / pts, 6)
+        for pid, pts, var in session.query(
+            Projection.player_id, Projection.projected_points, Projection.variance
+        ).filter(Projection.week == week, Projection.source == source)
+        if pts and pts > 0 and var is not None
+    }
+    previous = dict(
+        session.query(ProjectionHorizon.player_id, ProjectionHorizon.inputs_hash)
+        .filter(
+            ProjectionHorizon.week == week,
+            ProjectionHorizon.source == source,
+            ProjectionHorizon.horizon == 1,
+        )
+        .all()
+    )
+
+    dirty: List[Tuple[int, str]] = []
+    for (pid, position, bye), wafs in zip(players, waf.tolist()):
+        digest = _fingerprint(
+            sorted(baselines[pid].items()),
+            scoring_kind(position),
+            bye,
+            wafs,
+            dispersion.get(pid),
+            source,
+        )
+        if force or previous.get(pid) != digest:
+            dirty.append((column[pid], digest))
+    if not dirty:
+        return 0
+    rows_idx = [i for i, _ in dirty]
+    pool = [baselines[player_ids[i]] for i in rows_idx]
+    horizons = project_horizons_sharded(
+        [players[i][1] for i in rows_idx],
+        pool,
+        [b.get("proe", 0) for b in pool],
+        waf[rows_idx],
+        [players[i][2] for i in rows_idx],
+        week,
+        last_week,
+        max_workers=max_workers,
+    )
+    ratio = np.array([dispersion.get(player_ids[i], np.nan) for i in rows_idx])
+    weekly_variance = np.where(
+        np.isnan(ratio)[:, None], horizons.variance, ratio[:, None] * horizons.points
+    )
+    points = np.cumsum(horizons.points, axis=1).tolist()
+    variance = np.cumsum(weekly_variance, axis=1).tolist()
+    games = np.cumsum(horizons.playing, axis=1).tolist()
+    weekly = np.round(horizons.points, 2).tolist()
+    rows = [
+        {
+            "player_id": player_ids[i],
+            "week": week,
+            "horizon": h + 1,
+            "source": source,
+            "projected_points": points[j][h],
+            "variance": variance[j][h],
+            "data": {"weekly": weekly[j][: h + 1], "games": games[j][h]},
+            "inputs_hash": digest,
+        }
+        for j, (i, digest) in enumerate(dirty)
+        for h in range(horizons.weeks)
+    ]
+    _bulk_upsert(
+        session,
+        ProjectionHorizon.__table__,
+        ("player_id", "week", "horizon", "source"),
+        rows,
+        "uq_projection_horizons_player_week_horizon_source",
+    )
     session.commit()
-    return count
+    return len(rows)
+
+
+def season_start(season: int) -> date:
+    """Tuesday opening week 1 of ``season``, the day after Labor Day."""
+
+    september = date(season, 9, 1)
+    labor_day = september + timedelta(days=-september.weekday() % 7)
+    return labor_day + timedelta(days=1)
+
+
+def current_week(today: date | None = None) -> int:
+    """NFL week in progress on ``today``, clamped to weeks 1..``LAST_WEEK``.
+
+    Weeks run Tuesday to Monday from ``NFL_SEASON_START`` (ISO date) or, by
+    default, :func:`season_start`; January and February belong to the
+    previous season.
+    """
+
+    today = today or date.today()
+    override = os.getenv("NFL_SEASON_START")
+    if override:
+        start = date.fromisoformat(override)
+    else:
+        start = season_start(today.year if today.month > 2 else today.year - 1)
+    return min(max((today - start).days // 7 + 1, 1), LAST_WEEK)
 
 
 @celery.task
-def project_week(week: int) -> int:
+def project_week(week: int | None = None, force: bool = False) -> int:
+    """Refresh projections and horizons for ``week`` (default: the current week).
+
+    Returns the number of projection rows written, as before dirty tracking;
+    players whose inputs did not change are skipped unless ``force``.
+    """
+
     if SessionLocal is None:
         return 0
+    week = week or current_week()
     session: Session = SessionLocal()
     try:
-        return generate_projections(session, week)
+        report = refresh_projections(
+            session,
+            week,
+            force=force,
+            n_samples=PROJECTION_SAMPLES,
+            max_workers=PROJECTION_WORKERS,
+        )
+        refresh_horizons(session, week, force=force, max_workers=PROJECTION_WORKERS)
+        return report["updated"]
     finally:
         session.close()
 
@@ -228,6 +941,185 @@ def waiver_shortlist(league_id: int, week: int, horizon: int = 1) -> Dict[int, A
         session.close()
 
 
+def _league_points(league: Any, rows: List[Any]) -> Dict[int, float]:
+    """Projected points by player id under ``league``'s scoring rules.
+
+    ``rows`` are ``(player_id, projected_points, data, position)``; stored
+    statlines are rescored in one batch, the rest keep their points.
+    """
+
+    points = {pid: pts for pid, pts, _, _ in rows}
+    if league.scoring_settings:
+        rules = league_rules(league.id, league.scoring_settings)
+        scored = [row for row in rows if row[2]]
+        if scored:
+            totals = rules.score_records(
+                [scoring_kind(pos) for _, _, _, pos in scored],
+                [data for _, _, data, _ in scored],
+            )
+            points.update(zip([pid for pid, _, _, _ in scored], totals.tolist()))
+    return points
+
+
+def optimize_league_sync(
+    session: Session, league_id: int, week: int, max_workers: int | None = None
+) -> Dict[int, Any]:
+    """Optimize every team's lineup with rosters and projections loaded once."""
+
+    league = (
+        session.query(League)
+        .options(
+            selectinload(League.teams)
+            .selectinload(Team.roster_slots)
+            .selectinload(RosterSlot.player)
+        )
+        .filter_by(id=league_id)
+        .first()
+    )
+    if not league:
+        return {}
+    rows = (
+        session.query(
+            Projection.player_id,
+            Projection.projected_points,
+            Projection.data,
+            Player.position_primary,
+        )
+        .join(Player, Player.id == Projection.player_id)
+        .join(RosterSlot, RosterSlot.player_id == Projection.player_id)
+        .join(Team, Team.id == RosterSlot.team_id)
+        .filter(Team.league_id == league_id, RosterSlot.week == week)
+        .filter(Projection.week == week, Projection.source == PROJECTION_SOURCE)
+        .all()
+    )
+    points = _league_points(league, rows)
+    results = optimize_league(league, week, points, max_workers=max_workers)
+    return {
+        team_id: {"lineup": lineup, "projected_points": total}
+        for team_id, (lineup, total) in results.items()
+    }
+
+
+@celery.task
+def optimize_league_lineups(league_id: int, week: int) -> Dict[int, Any]:
+    if SessionLocal is None:
+        return {}
+    session: Session = SessionLocal()
+    try:
+        return optimize_league_sync(session, league_id, week)
+    finally:
+        session.close()
+
+
+# Solved lineups per (team_id, week) kept by this worker process so that a
+# changed projection only repairs the affected slots. Each state is stored
+# with a fingerprint of the roster and rules it was solved for; the least
+# recently used states are dropped beyond ``LINEUP_STATE_LIMIT``.
+LINEUP_STATE_LIMIT = int(os.getenv("LINEUP_STATE_LIMIT", "256"))
+LINEUP_STATES: OrderedDict[Tuple[int, int], Tuple[str, Any]] = OrderedDict()
+
+
+def reoptimize_team_sync(
+    session: Session, team_id: int, week: int, changed_ids: List[int]
+) -> Dict[str, Any]:
+    """Repair a team's optimal lineup after projections of ``changed_ids`` move.
+
+    Points are scored under the league's rules, as in
+    :func:`optimize_league_sync`. The first call for a (team, week), and any
+    call after the roster, roster positions or scoring settings changed,
+    solves from scratch and reports every slot as changed.
+    """
+
+    team = session.query(Team).filter_by(id=team_id).first()
+    if not team:
+        return {}
+    league = team.league
+    roster = [
+        (pid, player_positions(position, meta))
+        for pid, position, meta in session.query(
+            Player.id, Player.position_primary, Player.meta
+        )
+        .join(RosterSlot, RosterSlot.player_id == Player.id)
+        .filter(RosterSlot.team_id == team_id, RosterSlot.week == week)
+        .order_by(Player.id)
+    ]
+    fingerprint = _fingerprint(
+        [list(row) for row in roster],
+        league.roster_positions,
+        league.scoring_settings,
+    )
+    roster_ids = [pid for pid, _ in roster]
+    on_roster = set(roster_ids)
+
+    def points_for(ids: List[int]) -> Dict[int, float]:
+        rows = (
+            session.query(
+                Projection.player_id,
+                Projection.projected_points,
+                Projection.data,
+                Player.position_primary,
+            )
+            .join(Player, Player.id == Projection.player_id)
+            .filter(
+                Projection.week == week,
+                Projection.source == PROJECTION_SOURCE,
+                Projection.player_id.in_(ids),
+            )
+            .all()
+        )
+        return _league_points(league, rows)
+
+    key = (team_id, week)
+    cached = LINEUP_STATES.get(key)
+    if cached is not None and cached[0] == fingerprint:
+        LINEUP_STATES.move_to_end(key)
+        state = cached[1]
+        changed = points_for([pid for pid in changed_ids if pid in on_roster])
+        changes = state.update({str(pid): pts for pid, pts in changed.items()})
+    else:
+        points = points_for(roster_ids)
+        players = [
+            {
+                "id": pid,
+                "positions": positions,
+                "points": points.get(pid) or 0.0,
+            }
+            for pid, positions in roster
+        ]
+        slots = compile_roster(league.roster_positions).slots
+        try:
+            state = LineupState(players, slots)
+        except ValueError:
+            LINEUP_STATES.pop(key, None)
+            return {}
+        LINEUP_STATES[key] = (fingerprint, state)
+        LINEUP_STATES.move_to_end(key)
+        while len(LINEUP_STATES) > LINEUP_STATE_LIMIT:
+            LINEUP_STATES.popitem(last=False)
+        ids, _ = state.lineup
+        changes = [
+            SlotChange(i, slot, None, pid)
+            for i, (slot, pid) in enumerate(zip(slots, ids))
+        ]
+    ids, total = state.lineup
+    return {
+        "lineup": ids,
+        "projected_points": total,
+        "changes": [asdict(c) for c in changes],
+    }
+
+
+@celery.task
+def reoptimize_team(team_id: int, week: int, changed_ids: List[int]) -> Dict[str, Any]:
+    if SessionLocal is None:
+        return {}
+    session: Session = SessionLocal()
+    try:
+        return reoptimize_team_sync(session, team_id, week, changed_ids)
+    finally:
+        session.close()
+
+
 # Create a simple FastAPI app for health checks
 app = FastAPI()
 
@@ -0,0 +1,101 @@
+import gzip
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import pytest
+
+from tasks import _read_weeks, _upsert_statement, build_baselines
+
+try:
+    from app.models import Base, Baseline, Player, PlayerLink  # type: ignore[import-not-found]
+except Exception:
+
+    pytest.skip("app models not available", allow_module_level=True)
+
+HEADER = (
+    "play_id,season,week,posteam,passer_player_id,rusher_player_id,"
+    "receiver_player_id,pass_attempt,sack,complete_pass,passing_yards,"
+    "receiving_yards,pass_touchdown,interception,rush_attempt,rushing_yards,"
+    "rush_touchdown,pass_oe\n"
+)
+WEEK1 = [
+    "1,2024,1,KC,QB1,NA,WR1,1,0,1,20,20,1,0,0,NA,0,15\n",
+    "2,2024,1,KC,QB1,NA,WR1,1,0,0,NA,NA,0,0,0,NA,0,-5\n",
+    "3,2024,1,KC,NA,RB1,NA,0,0,0,NA,NA,0,0,1,6,0,NA\n",
+    "4,2023,1,KC,QB1,NA,WR1,1,0,1,80,80,1,0,0,NA,0,NA\n",
+]
+WEEK2 = ["5,2024,2,KC,QB1,NA,WR1,1,0,1,10,10,0,0,0,NA,0,5\n"]
+
+
+def setup_db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def write_pbp(path, rows):
+    with gzip.open(path, "wt") as f:
+        f.write(HEADER + "".join(rows))
+
+
+def test_build_baselines_appends_new_weeks(tmp_path):
+    session = setup_db()
+    for pid, gsis in ((1, "QB1"), (2, "WR1"), (3, "RB1")):
+        session.add(Player(id=pid, name=gsis))
+        session.add(PlayerLink(player_id=pid, gsis_id=gsis))
+    session.commit()
+    pbp = tmp_path / "play_by_play_2024.csv.gz"
+    store = tmp_path / "counts.npz"
+
+    write_pbp(pbp, WEEK1)
+    report = build_baselines(session, pbp, 2024, store=store)
+    assert report["weeks"] == [1] and report["players"] == 3
+
+    def metrics(pid):
+        return {
+            b.metric: b.value for b in session.query(Baseline).filter_by(player_id=pid)
+        }
+
+    # The 2023 play is ignored.
+    assert metrics(1)["pass_attempts"] == 2
+    assert metrics(2)["targets"] == 2 and metrics(2)["proe"] == pytest.approx(0.05)
+    assert metrics(3)["rush_attempts"] == 1 and "comp_rate" not in metrics(3)
+
+    # Week 1 may have been partial, so it is re-read along with week 2.
+    write_pbp(pbp, WEEK1 + WEEK2)
+    assert build_baselines(session, pbp, 2024, store=store)["weeks"] == [1, 2]
+    assert metrics(1)["pass_attempts"] > 1 and metrics(1)["pass_attempts"] < 2
+    assert session.query(Baseline).filter_by(player_id=1, metric="proe").count() == 1
+    # Only the latest week is read again.
+    assert build_baselines(session, pbp, 2024, store=store)["weeks"] == [2]
+
+
+def test_baseline_upsert_targets_key_columns_on_postgres():
+    from sqlalchemy.dialects import postgresql
+
+    stmt = _upsert_statement(Baseline.__table__, ("player_id", "metric"), "postgresql")
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (player_id, metric) DO UPDATE SET value = excluded.value" in sql
+    assert "updated_at" not in sql
+
+
+def test_read_weeks_screens_rows_and_keeps_quoted_fields(tmp_path):
+    path = tmp_path / "stats.csv"
+    path.write_text(
+        "week,desc,season,passer_player_id\n"
+        '1,"pass short, left",2024,QB1\n'
+        '3,"two\nlines, quoted",2024,QB2\n'
+        "3,plain,2023,QB3\n"
+        '"4",plain,2024,QB4\n'
+        "5,plain,2024,QB5\n"
+    )
+    out = _read_weeks(path, ("passer_player_id", "rusher_player_id"), 2024, 2)
+    assert out["passer_player_id"] == ["QB2", "QB4", "QB5"]
+    assert out["rusher_player_id"] == ["", "", ""]
+
+
+def test_read_weeks_requires_season_and_week(tmp_path):
+    path = tmp_path / "other.csv"
+    path.write_text("player_id,week\nQB1,1\n")
+    with pytest.raises(ValueError, match="no season column"):
+        _read_weeks(path, ("player_id",), 2024, 1)
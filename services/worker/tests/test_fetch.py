@@ -1,27 +1,40 @@
+import gzip
+import json
+
+import pytest
 import requests  # type: ignore[import-untyped]
 
-from tasks import fetch_and_cache
+from tasks import fetch_and_cache, fetch_resources
 
 
-def test_fetch_with_etag(tmp_path, monkeypatch):
-    calls = []
+class Resp:
+    def __init__(self, status_code, content=b"", headers=None, fail_after=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = dict(headers or {})
+        self.fail_after = fail_after
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i, start in enumerate(range(0, len(self.content), 2)):
+            if i == self.fail_after:
+                raise requests.ConnectionError("connection reset")
+            yield self.content[start : start + 2]
 
-    class Resp:
-        def __init__(self, status_code, content=b"", etag=None):
-            self.status_code = status_code
-            self.content = content
-            self.headers = {}
-            if etag:
-                self.headers["ETag"] = etag
+    def close(self):
+        pass
 
-        def raise_for_status(self):
-            pass
 
-    def fake_get(url, headers):
+def test_fetch_with_etag(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_get(url, headers, **kwargs):
         calls.append(headers.get("If-None-Match"))
         if headers.get("If-None-Match") == "etag123":
             return Resp(304)
-        return Resp(200, b"data", etag="etag123")
+        return Resp(200, b"data", {"ETag": "etag123"})
 
     monkeypatch.setattr(requests, "get", fake_get)
 
@@ -33,3 +46,120 @@ def test_fetch_with_etag(tmp_path, monkeypatch):
     assert dest.read_bytes() == b"data"
 
     assert calls == [None, "etag123"]
+
+
+def test_fetch_streams_atomically_with_manifest(tmp_path, monkeypatch):
+    responses = [
+        Resp(200, b"season", {"Last-Modified": "Mon, 01 Sep 2025 00:00:00 GMT"}),
+        Resp(200, b"partial body", fail_after=2),
+    ]
+    calls = []
+
+    def fake_get(url, headers, stream, timeout):
+        assert stream
+        calls.append(headers)
+        return responses.pop(0)
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    dest = tmp_path / "file.csv"
+    fetch_and_cache("http://example.com/file.csv", dest)
+    manifest = json.loads((tmp_path / "file.csv.manifest.json").read_text())
+    assert manifest["size"] == 6 and len(manifest["sha256"]) == 64
+
+    with pytest.raises(requests.ConnectionError):
+        fetch_and_cache("http://example.com/file.csv", dest)
+    assert calls[1] == {"If-Modified-Since": "Mon, 01 Sep 2025 00:00:00 GMT"}
+    # The failed download neither touched the cache nor left a temp file.
+    assert dest.read_bytes() == b"season"
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "file.csv",
+        "file.csv.manifest.json",
+    ]
+
+    # A cache that no longer matches its manifest is fetched unconditionally.
+    dest.write_bytes(b"trunc")
+    responses.append(Resp(200, b"season"))
+    fetch_and_cache("http://example.com/file.csv", dest)
+    assert calls[2] == {}
+
+
+def test_fetch_decompresses_gzip_urls(tmp_path, monkeypatch):
+    body = b"week,player_id\n" * 1000
+    monkeypatch.setattr(
+        requests, "get", lambda url, **kwargs: Resp(200, gzip.compress(body))
+    )
+    dest = fetch_and_cache("http://example.com/pbp.csv.gz", tmp_path / "pbp.csv")
+    assert dest.read_bytes() == body
+
+    kept = fetch_and_cache("http://example.com/pbp.csv.gz", tmp_path / "pbp.csv.gz")
+    assert gzip.decompress(kept.read_bytes()) == body
+
+
+def test_fetch_resources_reports_changed_per_resource(tmp_path):
+    bodies = {"rosters.csv": b"roster", "injuries.csv": b"injury"}
+
+    class Session:
+        def __init__(self):
+            self.calls = []
+
+        def get(self, url, headers, stream, timeout):
+            name = url.split("?")[0].rsplit("/", 1)[-1]
+            self.calls.append((name, headers.get("If-None-Match")))
+            if name == "missing.csv":
+                raise requests.ConnectionError("unreachable")
+            if headers.get("If-None-Match") == name:
+                return Resp(304)
+            return Resp(200, bodies[name], {"ETag": name})
+
+    resources = {
+        "rosters": "http://example.com/rosters.csv",
+        "injuries": "http://example.com/injuries.csv?season=2025",
+        "schedules": "http://example.com/missing.csv",
+    }
+    session = Session()
+    first = fetch_resources(resources, tmp_path, max_workers=2, session=session)
+    assert first["rosters"] == {
+        "url": resources["rosters"],
+        "path": str(tmp_path / "rosters.csv"),
+        "changed": True,
+    }
+    assert (tmp_path / "injuries.csv").read_bytes() == b"injury"
+    assert first["schedules"]["changed"] is False
+    assert "unreachable" in first["schedules"]["error"]
+
+    bodies["injuries.csv"] = b"injury update"
+    (tmp_path / "injuries.csv.manifest.json").unlink()
+    second = fetch_resources(resources, tmp_path, max_workers=2, session=session)
+    assert {name: r["changed"] for name, r in second.items()} == {
+        "rosters": False,
+        "injuries": True,
+        "schedules": False,
+    }
+    assert ("rosters.csv", "rosters.csv") in session.calls
+
+
+def test_fetch_resources_rejects_corrupt_gzip_and_keeps_cache(tmp_path):
+    good = gzip.compress(b"play_id,week\n1,1\n" * 200)
+    corrupt = good[:20] + bytes(len(good) - 20)
+    bodies = {"pbp.csv.gz": good, "stats.csv.gz": good[:-40], "ok.csv": b"ok"}
+
+    class Session:
+        def get(self, url, headers, stream, timeout):
+            return Resp(200, bodies[url.rsplit("/", 1)[-1]])
+
+    resources = {
+        "pbp": "http://example.com/pbp.csv.gz",
+        "stats": "http://example.com/stats.csv.gz",
+        "ok": "http://example.com/ok.csv",
+    }
+    first = fetch_resources(resources, tmp_path, session=Session())
+    assert first["pbp"]["changed"] and first["ok"]["changed"]
+    assert "truncated gzip" in first["stats"]["error"]
+
+    bodies["pbp.csv.gz"] = corrupt
+    second = fetch_resources(resources, tmp_path, session=Session())
+    assert "corrupt gzip" in second["pbp"]["error"]
+    assert second["ok"]["changed"]
+    # The good copy stays and no partial download is left behind.
+    assert (tmp_path / "pbp.csv.gz").read_bytes() == good
+    assert not list(tmp_path.glob("*.part"))
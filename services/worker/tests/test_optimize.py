@@ -0,0 +1,219 @@
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+import pytest
+
+import tasks
+from tasks import LINEUP_STATES, optimize_league_sync, reoptimize_team_sync
+
+try:
+
+    from app.models import Base, League, Team, Player, RosterSlot, Projection  # type: ignore[import-not-found]
+except Exception:
+
+    pytest.skip("app models not available", allow_module_level=True)
+
+
+def setup_db():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    return sessionmaker(bind=engine)()
+
+
+def test_optimize_league_sync_uses_week_projections():
+    session = setup_db()
+    league = League(id=1, yahoo_id=1, name="L", roster_positions=["QB", "RB"])
+    teams = [Team(id=1, league=league, name="A"), Team(id=2, league=league, name="B")]
+    session.add_all([league, *teams])
+    players = [
+        Player(id=1, name="QB1", position="QB"),
+        Player(id=2, name="QB2", position="QB"),
+        Player(id=3, name="RB1", position="RB"),
+        Player(id=4, name="QB3", position="QB"),
+        Player(id=5, name="RB2", position="RB"),
+    ]
+    session.add_all(players)
+    session.add_all(
+        [
+            RosterSlot(team_id=1, week=1, slot="QB", player_id=1),
+            RosterSlot(team_id=1, week=1, slot="BN1", player_id=2),
+            RosterSlot(team_id=1, week=1, slot="RB", player_id=3),
+            RosterSlot(team_id=2, week=1, slot="QB", player_id=4),
+            RosterSlot(team_id=2, week=1, slot="RB", player_id=5),
+        ]
+    )
+    session.add_all(
+        [
+            Projection(player_id=1, week=1, projected_points=10, data={}),
+            Projection(player_id=2, week=1, projected_points=15, data={}),
+            Projection(player_id=2, week=2, projected_points=1, data={}),
+            Projection(player_id=3, week=1, projected_points=8, data={}),
+            Projection(player_id=4, week=1, projected_points=12, data={}),
+            Projection(player_id=5, week=1, projected_points=9, data={}),
+        ]
+    )
+    session.commit()
+
+    result = optimize_league_sync(session, league_id=1, week=1, max_workers=1)
+    assert result[1] == {"lineup": ["2", "3"], "projected_points": 23}
+    assert result[2] == {"lineup": ["4", "5"], "projected_points": 21}
+
+
+def test_optimize_league_sync_reads_internal_projections_and_eligibility():
+    session = setup_db()
+    league = League(id=1, yahoo_id=1, name="L", roster_positions=["QB", "WR"])
+    session.add_all([league, Team(id=1, league=league, name="A")])
+    session.add_all(
+        [
+            Player(id=1, name="QB1", position="QB"),
+            Player(id=2, name="QB2", position="QB"),
+            Player(
+                id=3,
+                name="Hybrid",
+                position="RB",
+                meta={"eligible_positions": ["RB", "WR"]},
+            ),
+            RosterSlot(team_id=1, week=1, slot="QB", player_id=1),
+            RosterSlot(team_id=1, week=1, slot="BN1", player_id=2),
+            RosterSlot(team_id=1, week=1, slot="BN2", player_id=3),
+            Projection(player_id=1, week=1, projected_points=10, data={}),
+            Projection(
+                player_id=1, week=1, source="yahoo", projected_points=50, data={}
+            ),
+            Projection(player_id=2, week=1, projected_points=15, data={}),
+            Projection(player_id=3, week=1, projected_points=7, data={}),
+        ]
+    )
+    session.commit()
+
+    # The Yahoo row for QB1 is ignored; the RB is WR-eligible on Yahoo.
+    result = optimize_league_sync(session, league_id=1, week=1, max_workers=1)
+    assert result[1] == {"lineup": ["2", "3"], "projected_points": 22}
+    assert reoptimize_team_sync(session, 1, 1, [])["projected_points"] == 22
+
+
+def test_reoptimize_team_sync_reports_changed_slots():
+    session = setup_db()
+    league = League(id=1, yahoo_id=1, name="L", roster_positions=["QB", "RB", "W/R/T"])
+    session.add_all([league, Team(id=1, league=league, name="A")])
+    session.add_all(
+        [
+            Player(id=1, name="QB", position="QB"),
+            Player(id=2, name="RB1", position="RB"),
+            Player(id=3, name="WR1", position="WR"),
+            Player(id=4, name="RB2", position="RB"),
+        ]
+    )
+    for slot, pid in [("QB", 1), ("RB", 2), ("W/R/T", 3), ("BN1", 4)]:
+        session.add(RosterSlot(team_id=1, week=1, slot=slot, player_id=pid))
+    for pid, pts in [(1, 20), (2, 12), (3, 10), (4, 6)]:
+        session.add(Projection(player_id=pid, week=1, projected_points=pts, data={}))
+    session.commit()
+    LINEUP_STATES.clear()
+
+    first = reoptimize_team_sync(session, 1, 1, [])
+    assert first["lineup"] == ["1", "2", "3"]
+    assert len(first["changes"]) == 3
+
+    proj = session.query(Projection).filter_by(player_id=3, week=1).one()
+    proj.projected_points = 0
+    session.commit()
+    second = reoptimize_team_sync(session, 1, 1, [3])
+    assert second["lineup"] == ["1", "2", "4"]
+    assert second["projected_points"] == 38
+    assert second["changes"] == [
+        {"index": 2, "slot": "W/R/T", "before": "3", "after": "4"}
+    ]
+
+
+def test_optimize_league_sync_rescores_with_league_settings():
+    session = setup_db()
+    settings = {
+        "stat_modifiers": {
+            "stats": [
+                {"stat": {"stat_id": 5, "value": "4"}},
+                {"stat": {"stat_id": 10, "value": "6"}},
+            ]
+        }
+    }
+    league = League(
+        id=1, yahoo_id=1, name="L", roster_positions=["QB"], scoring_settings=settings
+    )
+    session.add_all([league, Team(id=1, league=league, name="A")])
+    session.add_all(
+        [
+            Player(id=1, name="Passer", position="QB"),
+            Player(id=2, name="Runner", position="QB"),
+        ]
+    )
+    session.add_all(
+        [
+            RosterSlot(team_id=1, week=1, slot="QB", player_id=1),
+            RosterSlot(team_id=1, week=1, slot="BN", player_id=2),
+            # Default scoring ranks the passer higher; 4 point passing TDs do not.
+            Projection(player_id=1, week=1, projected_points=18, data={"PassTD": 2}),
+            Projection(player_id=2, week=1, projected_points=12, data={"RushTD": 2}),
+        ]
+    )
+    session.commit()
+
+    result = optimize_league_sync(session, league_id=1, week=1, max_workers=1)
+    assert result[1] == {"lineup": ["2"], "projected_points": 12.0}
+
+
+def test_reoptimize_team_sync_rebuilds_on_roster_change_and_scores_rules(
+    monkeypatch,
+):
+    session = setup_db()
+    settings = {
+        "stat_modifiers": {
+            "stats": [
+                {"stat": {"stat_id": 5, "value": "4"}},
+                {"stat": {"stat_id": 10, "value": "6"}},
+            ]
+        }
+    }
+    league = League(
+        id=1,
+        yahoo_id=1,
+        name="L",
+        roster_positions=["QB"],
+        scoring_settings=settings,
+    )
+    session.add_all([league, Team(id=1, league=league, name="A")])
+    session.add_all(
+        [
+            Player(id=1, name="Passer", position="QB"),
+            Player(id=2, name="Runner", position="QB"),
+            Player(id=3, name="Pickup", position="QB"),
+            RosterSlot(team_id=1, week=1, slot="QB", player_id=1),
+            RosterSlot(team_id=1, week=1, slot="BN", player_id=2),
+            Projection(player_id=1, week=1, projected_points=18, data={"PassTD": 2}),
+            Projection(player_id=2, week=1, projected_points=12, data={"RushTD": 2}),
+            # Another source's projection must not enter the pool.
+            Projection(
+                player_id=1, week=1, source="yahoo", projected_points=40, data={}
+            ),
+            Projection(player_id=3, week=1, projected_points=30, data={}),
+        ]
+    )
+    session.commit()
+    LINEUP_STATES.clear()
+
+    # 4 point passing TDs rank the runner first, as in the full optimizer.
+    assert reoptimize_team_sync(session, 1, 1, [])["lineup"] == ["2"]
+    assert optimize_league_sync(session, 1, 1, max_workers=1)[1]["lineup"] == ["2"]
+
+    # Dropping the runner for a pickup invalidates the cached state.
+    session.query(RosterSlot).filter_by(player_id=2).update({"player_id": 3})
+    session.commit()
+    result = reoptimize_team_sync(session, 1, 1, [])
+    assert result["lineup"] == ["3"] and result["projected_points"] == 30
+    assert result["changes"] == [
+        {"index": 0, "slot": "QB", "before": None, "after": "3"}
+    ]
+
+    monkeypatch.setattr(tasks, "LINEUP_STATE_LIMIT", 1)
+    session.add(RosterSlot(team_id=1, week=2, slot="QB", player_id=3))
+    session.commit()
+    assert reoptimize_team_sync(session, 1, 2, [])["lineup"] == ["3"]
+    assert list(LINEUP_STATES) == [(1, 2)]
@@ -1,12 +1,36 @@
-from sqlalchemy import create_engine
+import os
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import sessionmaker
 import pytest
+from datetime import date, datetime
 
-from tasks import generate_projections
+import tasks
+from tasks import (
+    _upsert_projections,
+    _upsert_statement,
+    current_week,
+    generate_projections,
+    refresh_horizons,
+    refresh_projections,
+)
 
 try:
 
-    from app.models import Base, Baseline, Player, Projection, Weather  # type: ignore[import-not-found]
+    from app.models import (  # type: ignore[import-not-found]
+        Base,
+        Baseline,
+        Injury,
+        League,
+        Player,
+        Projection,
+        ProjectionHorizon,
+        RosterSlot,
+        Team,
+        Weather,
+    )
+    from app.waiver_service import compute_waiver_shortlist  # type: ignore[import-not-found]
 except Exception:
 
     pytest.skip("app models not available", allow_module_level=True)
@@ -43,3 +67,286 @@ def test_generate_projections_inserts_rows():
     assert proj.projected_points > 0
     assert proj.variance and proj.variance > 0
     assert proj.data["PassYds"] > 0
+
+
+def test_generate_projections_upserts_with_fixed_query_count():
+    session = setup_db()
+    for pid in range(1, 41):
+        session.add(Player(id=pid, name=f"P{pid}", position="WR"))
+        session.add(Baseline(player_id=pid, metric="targets", value=pid / 4))
+    session.add(Weather(game_id="1-3", waf=0.5))
+    session.add(Weather(game_id="2-4", waf=0.5))
+    session.commit()
+
+    statements = []
+    engine = session.get_bind()
+
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert generate_projections(session, week=1) == 40
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 5
+    assert any("INSERT OR REPLACE" in s for s in statements)
+
+    by_player = {p.player_id: p for p in session.query(Projection).filter_by(week=1)}
+    assert len(by_player) == 40
+    # Week 1 weather only applies to player 3.
+    assert by_player[3].data["Rec"] < by_player[2].data["Rec"]
+
+    session.query(Baseline).filter_by(player_id=5).update({"value": 20})
+    session.commit()
+    before = by_player[5].projected_points
+    assert generate_projections(session, week=1) == 1
+    session.expire_all()
+    rows = session.query(Projection).filter_by(week=1, player_id=5).all()
+    assert len(rows) == 1 and rows[0].projected_points > before
+    assert session.query(Projection).count() == 40
+
+
+def _projection_row(pid, points):
+    return {
+        "player_id": pid,
+        "week": 1,
+        "source": "internal",
+        "projected_points": points,
+        "variance": 1.0,
+        "data": {},
+        "inputs_hash": str(points),
+    }
+
+
+def _check_projection_upsert(session):
+    session.add_all([Player(id=1, name="A", position="WR"), Player(id=2, name="B")])
+    session.commit()
+    _upsert_projections(session, [_projection_row(1, 5.0), _projection_row(2, 6.0)])
+    _upsert_projections(session, [_projection_row(1, 7.0)])
+    session.commit()
+    rows = dict(session.query(Projection.player_id, Projection.projected_points))
+    assert rows == {1: 7.0, 2: 6.0}
+
+
+def test_projection_upsert_replaces_rows_on_sqlite():
+    _check_projection_upsert(setup_db())
+
+
+def test_projection_upsert_falls_back_without_native_upsert(monkeypatch):
+    session = setup_db()
+    monkeypatch.setattr(session.get_bind().dialect, "name", "mysql")
+    _check_projection_upsert(session)
+
+
+@pytest.mark.skipif(
+    not os.getenv("TEST_POSTGRES_URL"), reason="set TEST_POSTGRES_URL to run"
+)
+def test_projection_upsert_replaces_rows_on_postgres():
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    try:
+        _check_projection_upsert(sessionmaker(bind=engine)())
+    finally:
+        Base.metadata.drop_all(engine)
+
+
+def test_projection_upsert_uses_on_conflict_for_postgres():
+    stmt = _upsert_statement(
+        Projection.__table__,
+        ("player_id", "week", "source"),
+        "postgresql",
+        "uq_projections_player_week_source",
+    )
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT ON CONSTRAINT uq_projections_player_week_source" in sql
+    assert "DO UPDATE SET projected_points = excluded.projected_points" in sql
+    assert _upsert_statement(Projection.__table__, ("player_id",), "mysql") is None
+
+
+def test_refresh_projections_skips_unchanged_inputs():
+    session = setup_db()
+    for pid in (1, 2, 3):
+        session.add(Player(id=pid, name=f"P{pid}", position="RB"))
+        session.add(Baseline(player_id=pid, metric="rush_attempts", value=10 + pid))
+    session.commit()
+
+    assert refresh_projections(session, week=2) == {"updated": 3, "skipped": 0}
+    assert refresh_projections(session, week=2) == {"updated": 0, "skipped": 3}
+
+    # Weather, injury status and source each make a player dirty.
+    session.add(Weather(game_id="2-1", waf=0.7))
+    session.add(
+        Injury(player_id=2, status="Questionable", report_time=datetime(2024, 9, 1))
+    )
+    session.commit()
+    assert refresh_projections(session, week=2) == {"updated": 2, "skipped": 1}
+    session.add(Injury(player_id=2, status="Out", report_time=datetime(2024, 9, 2)))
+    session.commit()
+    assert refresh_projections(session, week=2) == {"updated": 1, "skipped": 2}
+    assert refresh_projections(session, week=2, source="alt")["updated"] == 3
+    assert refresh_projections(session, week=2, force=True)["updated"] == 3
+    assert session.query(Projection).count() == 6
+
+
+def test_refresh_projections_stores_simulated_quantiles():
+    session = setup_db()
+    session.add(Player(id=1, name="Runner", position="RB"))
+    session.add(Baseline(player_id=1, metric="rush_attempts", value=18))
+    session.add(Baseline(player_id=1, metric="targets", value=4))
+    session.commit()
+
+    assert refresh_projections(session, week=3)["updated"] == 1
+    naive = session.query(Projection).one()
+    assert "sketch" not in naive.data
+
+    # Turning simulation on changes the fingerprint, so the row is redone.
+    assert refresh_projections(session, week=3, n_samples=2000)["updated"] == 1
+    assert refresh_projections(session, week=3, n_samples=2000)["updated"] == 0
+    session.expire_all()
+    proj = session.query(Projection).one()
+    assert proj.data["p10"] < proj.data["p50"] < proj.data["p90"]
+    assert len(proj.data["sketch"]) == 21
+    assert proj.variance != pytest.approx(proj.projected_points * 0.1)
+
+
+def test_refresh_horizons_stores_every_horizon_and_feeds_waivers():
+    session = setup_db()
+    session.add_all(
+        [
+            League(id=1, yahoo_id=1, name="L"),
+            Team(id=1, league_id=1, name="T"),
+            Player(id=1, name="Starter", position="WR", bye_week=16),
+            Player(id=2, name="Bye soon", position="WR", bye_week=15),
+            Player(id=3, name="Steady", position="WR"),
+            RosterSlot(team_id=1, player_id=1, week=14),
+        ]
+    )
+    for pid, targets in ((1, 6), (2, 7), (3, 6.5)):
+        session.add(Baseline(player_id=pid, metric="targets", value=targets))
+    session.add(Weather(game_id="14-3", waf=0.5))
+    session.commit()
+
+    assert refresh_horizons(session, week=14) == 3 * 4
+    assert refresh_horizons(session, week=14) == 0
+    assert refresh_horizons(session, week=14, force=True) == 3 * 4
+    assert session.query(ProjectionHorizon).count() == 12
+    ros = {
+        h.player_id: h
+        for h in session.query(ProjectionHorizon).filter_by(week=14, horizon=4)
+    }
+    assert ros[1].data["games"] == 3 and ros[3].data["games"] == 4
+    assert ros[2].data["weekly"][1] == 0
+    assert ros[3].data["weekly"][0] < ros[3].data["weekly"][1]
+
+    one = {
+        h.player_id: h.projected_points
+        for h in session.query(ProjectionHorizon).filter_by(week=14, horizon=1)
+    }
+    assert one[2] > one[1]
+    session.add_all(
+        Projection(player_id=pid, week=14, projected_points=pts, data={})
+        for pid, pts in one.items()
+    )
+    session.commit()
+    # Next week player 2 is the best pickup; over two weeks their bye sinks
+    # them below player 3, and a horizon past the season is rest of season.
+    assert compute_waiver_shortlist(session, 1, 14)[0]["player_id"] == 2
+    two = compute_waiver_shortlist(session, 1, 14, horizon=2)
+    assert [w["player_id"] for w in two] == [3, 2]
+    assert two[0]["projected_points"] == pytest.approx(
+        session.query(ProjectionHorizon)
+        .filter_by(player_id=3, week=14, horizon=2)
+        .one()
+        .projected_points
+    )
+    assert compute_waiver_shortlist(session, 1, 14, horizon=9)[0]["player_id"] == 3
+
+
+def test_refresh_horizons_rewrites_dirty_players_with_projection_variance():
+    session = setup_db()
+    for pid in (1, 2):
+        session.add(Player(id=pid, name=f"P{pid}", position="RB"))
+        session.add(Baseline(player_id=pid, metric="rush_attempts", value=15))
+    session.commit()
+    assert refresh_horizons(session, week=16) == 2 * 2
+
+    # Weather later in the horizon dirties only that player.
+    session.add(Weather(game_id="17-2", waf=0.6))
+    session.commit()
+    assert refresh_horizons(session, week=16) == 2
+    assert refresh_horizons(session, week=16) == 0
+
+    # A simulated projection's dispersion carries over to every horizon week.
+    assert refresh_projections(session, week=16, n_samples=2000)["updated"] == 2
+    assert refresh_horizons(session, week=16) == 2 * 2
+    proj = session.query(Projection).filter_by(player_id=1).one()
+    ros = (
+        session.query(ProjectionHorizon)
+        .filter_by(player_id=1, week=16, horizon=2)
+        .one()
+    )
+    ratio = proj.variance / proj.projected_points
+    assert ratio != pytest.approx(0.1)
+    assert ros.variance == pytest.approx(ratio * ros.projected_points)
+
+
+def test_refresh_projections_uses_position_estimators():
+    session = setup_db()
+    session.add_all(
+        [
+            Player(id=1, name="Kicker", position="K"),
+            Player(id=2, name="Defense", position="DEF"),
+            Player(id=3, name="Linebacker", position="LB"),
+            Player(id=4, name="Receiver", position="WR"),
+        ]
+    )
+    session.add(Baseline(player_id=3, metric="solo_tackles", value=6))
+    session.add(Baseline(player_id=4, metric="targets", value=7))
+    session.commit()
+
+    assert refresh_projections(session, week=1, n_samples=500)["updated"] == 4
+    proj = {p.player_id: p for p in session.query(Projection)}
+    assert proj[1].data["PAT"] > 0 and "PassYds" not in proj[1].data
+    assert "PtsAllow" in proj[2].data and proj[2].projected_points > 0
+    assert proj[3].data["TackleSolo"] == 6 and proj[3].projected_points == 9
+    # Only offense is simulated.
+    assert "sketch" in proj[4].data and "sketch" not in proj[3].data
+
+    # A position change moves the player to another estimator.
+    session.query(Player).filter_by(id=3).update({"position_primary": "RB"})
+    session.commit()
+    assert refresh_projections(session, week=1, n_samples=500)["updated"] == 1
+    session.expire_all()
+    assert session.query(Projection).filter_by(player_id=3).one().projected_points == 0
+
+
+def test_current_week_counts_tuesdays_from_labor_day(monkeypatch):
+    monkeypatch.delenv("NFL_SEASON_START", raising=False)
+    # Labor Day 2025 is Monday 1 September; the opener is Thursday 4 September.
+    assert current_week(date(2025, 8, 20)) == 1
+    assert current_week(date(2025, 9, 4)) == 1
+    assert current_week(date(2025, 9, 8)) == 1
+    assert current_week(date(2025, 9, 9)) == 2
+    assert current_week(date(2026, 1, 20)) == tasks.LAST_WEEK
+    monkeypatch.setenv("NFL_SEASON_START", "2025-09-02")
+    assert current_week(date(2025, 10, 1)) == 5
+
+
+def test_project_week_defaults_to_current_week(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    session = Session()
+    session.add(Player(id=1, name="Runner", position="RB"))
+    session.add(Baseline(player_id=1, metric="rush_attempts", value=15))
+    session.commit()
+    monkeypatch.setattr(tasks, "SessionLocal", Session)
+    monkeypatch.setattr(tasks, "PROJECTION_SAMPLES", 200)
+    monkeypatch.setattr(tasks, "current_week", lambda: 6)
+
+    assert tasks.project_week() == 1
+    assert tasks.project_week() == 0
+    assert session.query(Projection.week).scalar() == 6
@@ -22,3 +22,14 @@ def test_schedule_env(monkeypatch):
     refresh = beat["gameday-refresh"]["schedule"]
     assert isinstance(refresh, timedelta)
     assert refresh.seconds == 5 * 60
+    # Projection runs look up the current week when they fire.
+    assert "args" not in beat["gameday-refresh"]
+    assert "args" not in beat["nightly-sync"]
+
+
+def test_projection_runs_route_to_their_own_queue():
+    import celery_app
+
+    router = celery_app.celery.amqp.router
+    assert router.route({}, "tasks.project_week")["queue"].name == "projections"
+    assert router.route({}, "tasks.update_baselines")["queue"].name == "default"